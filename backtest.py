@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+
+from profiling import profiler
+from price_store import PriceStore, frame_to_panels
+
+# Registry of rule name -> {"columns": [...], "func": callable}; func(panels) returns a boolean
+# dates x symbols panel that is True on the bar where the signal fires.
+RULES = {}
+
+
+def register_rule(name, columns):
+    def decorator(func):
+        RULES[name] = {"columns": list(columns), "func": func}
+        return func
+
+    return decorator
+
+
+def _previous(panel):
+    # Panel shifted down one bar (NaN on the first row)
+    return np.vstack([np.full((1, panel.shape[1]), np.nan), panel[:-1]])
+
+
+def _crosses_above(fast, slow):
+    with np.errstate(invalid='ignore'):
+        return (fast > slow) & (_previous(fast) <= _previous(slow))
+
+
+@register_rule('macd_bullish_cross', ['MACD_Line', 'MACD_Signal'])
+def _macd_bullish_cross(panels):
+    return _crosses_above(panels['MACD_Line'], panels['MACD_Signal'])
+
+
+@register_rule('macd_bearish_cross', ['MACD_Line', 'MACD_Signal'])
+def _macd_bearish_cross(panels):
+    return _crosses_above(panels['MACD_Signal'], panels['MACD_Line'])
+
+
+@register_rule('golden_cross', ['50_Day_MA', '250_Day_MA'])
+def _golden_cross(panels):
+    return _crosses_above(panels['50_Day_MA'], panels['250_Day_MA'])
+
+
+@register_rule('death_cross', ['50_Day_MA', '250_Day_MA'])
+def _death_cross(panels):
+    return _crosses_above(panels['250_Day_MA'], panels['50_Day_MA'])
+
+
+@register_rule('breakout_52_week_high', ['52_Week_High'])
+def _breakout_52_week_high(panels):
+    # Close above the 52-week high as it stood the day before
+    with np.errstate(invalid='ignore'):
+        return panels['Close'] > _previous(panels['52_Week_High'])
+
+
+def forward_returns(close, horizon):
+    # Percent return from each bar's close to the close `horizon` bars later
+    if horizon < 1:
+        raise ValueError(f"Invalid horizon: {horizon}. Horizons are a number of bars, at least 1.")
+    future = np.full_like(close, np.nan)
+    if horizon < len(close):
+        future[:-horizon] = close[horizon:]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (future / close - 1) * 100
+
+
+class Backtester:
+    """
+    Vectorized event study and equity curves for signal rules over the dates x symbols panel.
+
+    For each rule and horizon: number of signals, mean/std of forward returns, hit rate (share of
+    positive forward returns) and the unconditional mean over all bars as a baseline. The equity curve
+    holds every symbol for `holding_period` bars after its signal, equal-weighted, entering at the
+    signal bar's close. All statistics are kept as sums so partitions of a PriceStore merge exactly.
+    """
+
+    def __init__(self, rules=None, horizons=(1, 5, 21, 63), holding_period=21):
+        rules = list(RULES) if rules is None else list(rules)
+        unknown = [rule for rule in rules if rule not in RULES]
+        if unknown:
+            raise ValueError(f"Unknown rule(s): {', '.join(unknown)}. Choose from: {', '.join(RULES)}")
+        self.rules = rules
+        invalid = [h for h in horizons if h < 1]
+        if invalid:
+            raise ValueError(f"Invalid horizon(s): {', '.join(map(str, invalid))}. Horizons must be at least 1 bar.")
+        self.horizons = list(horizons)
+        self.holding_period = holding_period
+
+    def columns(self):
+        needed = ['Close']
+        for rule in self.rules:
+            needed.extend(RULES[rule]["columns"])
+        return list(dict.fromkeys(needed))
+
+    def _empty_totals(self):
+        keys = ['Universe'] + self.rules
+        return {
+            "stats": {(key, h): np.zeros(4) for key in keys for h in self.horizons},
+            "equity_sum": {key: pd.Series(dtype=float) for key in keys},
+            "equity_count": {key: pd.Series(dtype=float) for key in keys},
+        }
+
+    def _accumulate(self, totals, stock_prices_df):
+        dates, _, panels = frame_to_panels(stock_prices_df, self.columns())
+        close = panels['Close']
+        with np.errstate(invalid='ignore', divide='ignore'):
+            daily_return = close / _previous(close) - 1
+        has_return = ~np.isnan(daily_return)
+        forwards = {h: forward_returns(close, h) for h in self.horizons}
+
+        signals = {'Universe': ~np.isnan(close)}
+        with profiler.span("backtest signals"):
+            for rule in self.rules:
+                signals[rule] = RULES[rule]["func"](panels)
+
+        for key, signal in signals.items():
+            for h, forward in forwards.items():
+                values = forward[signal & ~np.isnan(forward)]
+                totals["stats"][(key, h)] += [len(values), values.sum(), (values ** 2).sum(), (values > 0).sum()]
+
+            # Holding after a signal: any signal within the previous `holding_period` bars
+            if key == 'Universe':
+                holding = has_return
+            else:
+                fired = np.cumsum(signal, axis=0)
+                lagged = np.vstack([np.zeros((1, fired.shape[1])), fired[:-1]])
+                window_start = np.vstack([np.zeros((self.holding_period + 1, fired.shape[1])),
+                                          fired[:-self.holding_period - 1]])[:len(fired)]
+                holding = ((lagged - window_start) > 0) & has_return
+            day_sum = pd.Series(np.where(holding, daily_return, 0.0).sum(axis=1), index=dates)
+            day_count = pd.Series(holding.sum(axis=1).astype(float), index=dates)
+            totals["equity_sum"][key] = totals["equity_sum"][key].add(day_sum, fill_value=0)
+            totals["equity_count"][key] = totals["equity_count"][key].add(day_count, fill_value=0)
+
+    def _finish(self, totals):
+        rows = []
+        for rule in self.rules:
+            for h in self.horizons:
+                count, total, squares, hits = totals["stats"][(rule, h)]
+                base_count, base_total, _, base_hits = totals["stats"][('Universe', h)]
+                mean = total / count if count else np.nan
+                variance = squares / count - mean ** 2 if count else np.nan
+                baseline = base_total / base_count if base_count else np.nan
+                rows.append({
+                    'Rule': rule,
+                    'Horizon_Days': h,
+                    'Signals': int(count),
+                    'Mean_Return_%': mean,
+                    'Std_Return_%': np.sqrt(max(variance, 0)) if count else np.nan,
+                    'Hit_Rate': hits / count if count else np.nan,
+                    'Baseline_Mean_Return_%': baseline,
+                    'Baseline_Hit_Rate': base_hits / base_count if base_count else np.nan,
+                    'Excess_Return_%': mean - baseline,
+                })
+        summary = pd.DataFrame(rows)
+
+        curves = {}
+        for key in ['Universe'] + self.rules:
+            count = totals["equity_count"][key].sort_index()
+            mean_return = (totals["equity_sum"][key].sort_index() / count.where(count > 0)).fillna(0.0)
+            curves[key] = (1 + mean_return).cumprod()
+        equity = pd.DataFrame(curves)
+        equity.index.name = 'Date'
+        return summary, equity
+
+    def run(self, stock_prices_df):
+        """
+        Backtests the rules on an in-memory long price/indicator frame.
+
+        Returns:
+            tuple: (summary DataFrame, equity curves DataFrame indexed by Date, one column per rule)
+        """
+        totals = self._empty_totals()
+        with profiler.span("backtest"):
+            self._accumulate(totals, stock_prices_df)
+        return self._finish(totals)
+
+    def run_store(self, store=None):
+        # Out-of-core: one partition in memory at a time, only the columns the rules need
+        store = store or PriceStore()
+        totals = self._empty_totals()
+        with profiler.span("backtest (price store)"):
+            for df in store.iter_partitions(columns=self.columns()):
+                self._accumulate(totals, df)
+        return self._finish(totals)
+
+
+# Example usage
+if __name__ == "__main__":
+    summary, equity = Backtester().run_store(PriceStore())
+    print(summary.to_string(index=False))
+    equity.to_csv("backtest_equity_curves.csv")
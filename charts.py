@@ -0,0 +1,213 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib.dates as mdates
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from profiling import profiler
+from price_store import PriceStore
+
+CHART_COLUMNS = ['Close', '50_Day_MA', '250_Day_MA', '52_Week_Low', '52_Week_High',
+                 'MACD_Line', 'MACD_Signal', 'MACD_Histogram']
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling: picks `threshold` points of (x, y) that keep the visual
+    shape of the line (peaks and troughs survive, unlike plain striding).
+
+    Returns:
+        array: Indices of the kept points (first and last always included).
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Bucket boundaries for the n - 2 inner points
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(int)
+    # Average point of every bucket, used as the third vertex for the bucket before it
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_x, next_y = avg_x[bucket + 1], avg_y[bucket + 1]
+        # Twice the triangle area (a, candidate, next bucket average) for every candidate in the bucket
+        areas = np.abs((x[a] - next_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (next_y - y[a]))
+        a = start + int(np.argmax(areas))
+        selected[bucket + 1] = a
+    return selected
+
+
+class ChartRenderer:
+    """
+    Draws price + 50/250-day MA + 52-week band and MACD panels on one off-screen Agg figure.
+
+    The figure, axes and artists are created once; each chart only swaps the data of the existing lines,
+    band polygon and histogram segments and saves the canvas, which is far cheaper than building a new
+    figure per ticker.
+    """
+
+    def __init__(self, width=12, height=7, dpi=100, max_points=1000):
+        self.dpi = dpi
+        self.max_points = max_points
+        self.figure = Figure(figsize=(width, height), dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.figure.subplots_adjust(left=0.06, right=0.98, top=0.94, bottom=0.06)
+        grid = self.figure.add_gridspec(2, 1, height_ratios=[3, 1], hspace=0.05)
+        self.price_axes = self.figure.add_subplot(grid[0])
+        self.macd_axes = self.figure.add_subplot(grid[1], sharex=self.price_axes)
+
+        self.band = self.price_axes.fill_between([0, 1], [0, 0], [0, 0], color='tab:gray', alpha=0.15,
+                                                 label='52 week range')
+        self.close_line, = self.price_axes.plot([], [], color='black', linewidth=1.0, label='Close')
+        self.ma_50_line, = self.price_axes.plot([], [], color='tab:blue', linewidth=0.9, label='50 day MA')
+        self.ma_250_line, = self.price_axes.plot([], [], color='tab:orange', linewidth=0.9, label='250 day MA')
+        self.price_axes.legend(loc='upper left', fontsize=8)
+        self.price_axes.grid(alpha=0.3)
+        self.price_axes.tick_params(labelbottom=False)
+        self.title = self.price_axes.set_title('')
+
+        self.histogram = self.macd_axes.vlines([], [], [], color='tab:gray', linewidth=1.0)
+        self.macd_line, = self.macd_axes.plot([], [], color='tab:blue', linewidth=0.9, label='MACD')
+        self.signal_line, = self.macd_axes.plot([], [], color='tab:red', linewidth=0.9, label='Signal')
+        self.macd_axes.axhline(0, color='black', linewidth=0.5)
+        self.macd_axes.legend(loc='upper left', fontsize=8)
+        self.macd_axes.grid(alpha=0.3)
+
+        locator = mdates.AutoDateLocator()
+        self.macd_axes.xaxis.set_major_locator(locator)
+        self.macd_axes.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+
+    def render(self, symbol, df, filename):
+        # df: one symbol's rows with Date and the CHART_COLUMNS that were computed
+        df = df.dropna(subset=['Close']).sort_values('Date')
+        if df.empty:
+            return False
+        x = mdates.date2num(pd.to_datetime(df['Date']).to_numpy())
+        keep = lttb(x, df['Close'].to_numpy(dtype=float), self.max_points)
+        x = x[keep]
+
+        def column(name):
+            if name not in df.columns:
+                return np.full(len(keep), np.nan)
+            return df[name].to_numpy(dtype=float)[keep]
+
+        self.close_line.set_data(x, column('Close'))
+        self.ma_50_line.set_data(x, column('50_Day_MA'))
+        self.ma_250_line.set_data(x, column('250_Day_MA'))
+        low, high = column('52_Week_Low'), column('52_Week_High')
+        band = ~(np.isnan(low) | np.isnan(high))
+        if band.any():
+            self.band.set_verts([np.concatenate([np.column_stack([x[band], high[band]]),
+                                                 np.column_stack([x[band], low[band]])[::-1]])])
+        else:
+            self.band.set_verts([])
+
+        histogram = np.nan_to_num(column('MACD_Histogram'))
+        self.histogram.set_segments(np.stack([np.column_stack([x, np.zeros(len(x))]),
+                                              np.column_stack([x, histogram])], axis=1))
+        self.macd_line.set_data(x, column('MACD_Line'))
+        self.signal_line.set_data(x, column('MACD_Signal'))
+        self.title.set_text(f"{symbol}  (last close {df['Close'].iloc[-1]:.2f} on "
+                            f"{pd.Timestamp(df['Date'].iloc[-1]):%Y-%m-%d})")
+
+        for axes, values in ((self.price_axes, [column('Close'), column('50_Day_MA'), column('250_Day_MA'),
+                                                low, high]),
+                             (self.macd_axes, [histogram, column('MACD_Line'), column('MACD_Signal')])):
+            values = np.concatenate(values)
+            values = values[~np.isnan(values)]
+            if len(values):
+                bottom, top = values.min(), values.max()
+                margin = (top - bottom) * 0.05 or abs(top) * 0.05 or 1.0
+                axes.set_ylim(bottom - margin, top + margin)
+        self.price_axes.set_xlim(x[0], x[-1] if x[-1] > x[0] else x[0] + 1)
+        self.figure.savefig(filename, dpi=self.dpi)
+        return True
+
+
+# One renderer per process (and figure options), reused for every task the process gets
+_renderers = {}
+
+
+def _render_batch(task):
+    # All symbols of a task live in one partition, so this is one partition read per task
+    store_directory, symbols, output_dir, options = task
+    key = tuple(sorted(options.items()))
+    if key not in _renderers:
+        _renderers[key] = ChartRenderer(**options)
+    renderer = _renderers[key]
+    prices = PriceStore(store_directory).load(symbols=symbols, columns=CHART_COLUMNS)
+    rendered = []
+    for symbol, df in prices.groupby('Symbol', sort=False):
+        filename = os.path.join(output_dir, f"{symbol}.png")
+        if renderer.render(symbol, df, filename):
+            rendered.append(filename)
+    return rendered
+
+
+def render_charts(symbols=None, store=None, output_dir="charts", processes=None, batch_size=25,
+                  max_points=1000, width=12, height=7, dpi=100):
+    """
+    Renders one PNG per symbol (default: every symbol in the price store) into `output_dir`.
+
+    Symbols are grouped by price store partition and every task reads one partition once. A partition
+    is only split (into at most one task per worker, of no fewer than about `batch_size` symbols) when there are
+    idle workers to share it, so it is read at most once per worker; rendered serially, every partition
+    is read exactly once. Each worker keeps reusing one figure. Workers are forked, which keeps them from
+    re-running main.py's menu; where fork is not available (Windows) charts are rendered in this process.
+
+    Returns:
+        list: Filenames of the rendered charts.
+    """
+    store = store or PriceStore()
+    manifest = store.manifest()
+    symbols = list(manifest) if symbols is None else [s for s in symbols if s in manifest]
+    if not symbols:
+        return []
+    os.makedirs(output_dir, exist_ok=True)
+    options = {'width': width, 'height': height, 'dpi': dpi, 'max_points': max_points}
+
+    by_partition = {}
+    for symbol in symbols:
+        by_partition.setdefault(manifest[symbol], []).append(symbol)
+    processes = processes or os.cpu_count() or 1
+    parallel = processes > 1 and 'fork' in multiprocessing.get_all_start_methods()
+    tasks = []
+    for group in by_partition.values():
+        pieces = min(-(-len(group) // batch_size), max(1, processes // len(by_partition))) if parallel else 1
+        size = -(-len(group) // pieces)
+        tasks.extend((store.directory, group[i:i + size], output_dir, options) for i in range(0, len(group), size))
+
+    start = time.perf_counter()
+    rendered = []
+    with profiler.span("render charts"):
+        if parallel and len(tasks) > 1:
+            context = multiprocessing.get_context('fork')
+            with ProcessPoolExecutor(max_workers=min(processes, len(tasks)), mp_context=context) as executor:
+                for future in as_completed([executor.submit(_render_batch, task) for task in tasks]):
+                    rendered.extend(future.result())
+        else:
+            for task in tasks:
+                rendered.extend(_render_batch(task))
+    profiler.count("charts_rendered", len(rendered))
+    print(f"{len(rendered)} charts saved to '{output_dir}' in {time.perf_counter() - start:.1f}s")
+    return rendered
+
+
+# Example usage
+if __name__ == "__main__":
+    render_charts(["AAPL", "MSFT", "NVDA"])
@@ -0,0 +1,224 @@
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from profiling import profiler
+from price_store import PriceStore, frame_to_panels
+
+
+def load_returns(store=None, symbols=None, stock_prices_df=None):
+    """
+    Daily percent returns (as fractions) from the Close column of the price store or a long price frame.
+
+    Returns:
+        tuple: (dates array, list of symbols, 2-D dates x symbols array with NaN where there is no data)
+    """
+    if stock_prices_df is None:
+        stock_prices_df = (store or PriceStore()).load(symbols=symbols, columns=['Close'])
+    dates, symbols, panels = frame_to_panels(stock_prices_df, ['Close'], symbols=symbols)
+    close = panels['Close']
+    returns = np.full_like(close, np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        returns[1:] = close[1:] / close[:-1] - 1
+    return dates, symbols, returns
+
+
+def pairwise_covariance(returns, min_periods=20, block_size=256):
+    """
+    Sample covariance and correlation over pairwise-complete observations, built from blocked matrix
+    products so only block_size x block_size temporaries are held next to the results.
+
+    Returns:
+        tuple of 2-D arrays: (covariance, correlation, pairwise observation counts)
+    """
+    present = (~np.isnan(returns)).astype(float)
+    values = np.where(present > 0, returns, 0.0)
+    squares = values ** 2
+    n = returns.shape[1]
+    covariance = np.full((n, n), np.nan)
+    correlation = np.full((n, n), np.nan)
+    counts = np.zeros((n, n))
+
+    with profiler.span("correlation blocks"), np.errstate(invalid='ignore', divide='ignore'):
+        for i in range(0, n, block_size):
+            bi = slice(i, min(i + block_size, n))
+            for j in range(i, n, block_size):
+                bj = slice(j, min(j + block_size, n))
+                count = present[:, bi].T @ present[:, bj]
+                sum_x = values[:, bi].T @ present[:, bj]
+                sum_y = present[:, bi].T @ values[:, bj]
+                sum_xy = values[:, bi].T @ values[:, bj]
+                sum_xx = squares[:, bi].T @ present[:, bj]
+                sum_yy = present[:, bi].T @ squares[:, bj]
+
+                cov = (sum_xy - sum_x * sum_y / count) / (count - 1)
+                var_x = (sum_xx - sum_x ** 2 / count) / (count - 1)
+                var_y = (sum_yy - sum_y ** 2 / count) / (count - 1)
+                corr = np.clip(cov / np.sqrt(var_x * var_y), -1.0, 1.0)
+                too_few = count < max(min_periods, 2)
+                cov[too_few] = np.nan
+                corr[too_few] = np.nan
+
+                covariance[bi, bj], correlation[bi, bj], counts[bi, bj] = cov, corr, count
+                covariance[bj, bi], correlation[bj, bi], counts[bj, bi] = cov.T, corr.T, count.T
+    return covariance, correlation, counts
+
+
+def rolling_matrices(returns, window, end=None, min_periods=None, block_size=256):
+    # Covariance/correlation over the `window` rows ending at row `end` (default: the latest row)
+    end = len(returns) if end is None else end + 1
+    block = returns[max(end - window, 0):end]
+    min_periods = min_periods if min_periods is not None else max(window // 2, 2)
+    covariance, correlation, _ = pairwise_covariance(block, min_periods=min_periods, block_size=block_size)
+    return covariance, correlation
+
+
+class RollingCorrelation:
+    """
+    Incrementally updated rolling covariance/correlation over the last `window` bars.
+
+    Each bar is a rank-one update of the running sums (add the new row, drop the one leaving the window),
+    O(n^2) per bar instead of recomputing the whole O(window * n^2) product.
+    """
+
+    def __init__(self, symbols, window=60, min_periods=None):
+        self.symbols = list(symbols)
+        self.window = window
+        self.min_periods = min_periods if min_periods is not None else max(window // 2, 2)
+        n = len(self.symbols)
+        self.rows = deque()
+        self.count = np.zeros((n, n))
+        self.sum_x = np.zeros((n, n))
+        self.sum_xy = np.zeros((n, n))
+        self.sum_xx = np.zeros((n, n))
+
+    @classmethod
+    def from_history(cls, symbols, returns, window=60, min_periods=None):
+        rolling = cls(symbols, window, min_periods)
+        for row in returns[-window:]:
+            rolling.update(row)
+        return rolling
+
+    def _apply(self, row, sign):
+        present = (~np.isnan(row)).astype(float)
+        values = np.where(present > 0, row, 0.0)
+        self.count += sign * np.outer(present, present)
+        self.sum_x += sign * np.outer(values, present)
+        self.sum_xy += sign * np.outer(values, values)
+        self.sum_xx += sign * np.outer(values ** 2, present)
+
+    def update(self, row):
+        row = np.asarray(row, dtype=float)
+        self.rows.append(row)
+        self._apply(row, 1)
+        if len(self.rows) > self.window:
+            self._apply(self.rows.popleft(), -1)
+
+    def covariance(self):
+        count = self.count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = (self.sum_xy - self.sum_x * self.sum_x.T / count) / (count - 1)
+        cov[count < self.min_periods] = np.nan
+        return cov
+
+    def correlation(self):
+        count = self.count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = (self.sum_xy - self.sum_x * self.sum_x.T / count) / (count - 1)
+            var_x = (self.sum_xx - self.sum_x ** 2 / count) / (count - 1)
+            corr = np.clip(cov / np.sqrt(var_x * var_x.T), -1.0, 1.0)
+        corr[count < self.min_periods] = np.nan
+        return corr
+
+
+class CorrelationIndex:
+    """
+    Top-k "most correlated to X" lookup, built once from a correlation matrix.
+
+    Queries for indexed symbols are dictionary lookups. A symbol outside the index is answered with a
+    single matrix-vector pass over the return history instead of a full matrix.
+    """
+
+    def __init__(self, symbols, neighbours, scores):
+        self.symbols = list(symbols)
+        self.position = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.neighbours = neighbours
+        self.scores = scores
+
+    @classmethod
+    def build(cls, correlation, symbols, k=20):
+        n = len(symbols)
+        k = min(k, max(n - 1, 0))
+        ranked = np.where(np.isnan(correlation), -np.inf, correlation)
+        np.fill_diagonal(ranked, -np.inf)
+        if k == 0:
+            return cls(symbols, np.zeros((n, 0), dtype=np.int64), np.zeros((n, 0)))
+        top = np.argpartition(-ranked, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(ranked, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        neighbours = np.take_along_axis(top, order, axis=1)
+        scores = np.take_along_axis(top_scores, order, axis=1)
+        scores[np.isinf(scores)] = np.nan
+        return cls(symbols, neighbours, scores)
+
+    def most_correlated(self, symbol, k=10):
+        i = self.position[symbol]
+        keep = ~np.isnan(self.scores[i, :k])
+        return pd.DataFrame({'Symbol': [self.symbols[j] for j in self.neighbours[i, :k][keep]],
+                             'Correlation': self.scores[i, :k][keep]})
+
+    def save(self, filename="correlation_top_k.csv"):
+        n, k = self.neighbours.shape
+        df = pd.DataFrame({
+            'Symbol': np.repeat(np.asarray(self.symbols, dtype=object), k),
+            'Rank': np.tile(np.arange(1, k + 1), n),
+            'Other': np.asarray(self.symbols, dtype=object)[self.neighbours.ravel()] if k else [],
+            'Correlation': self.scores.ravel(),
+        })
+        df.dropna(subset=['Correlation']).to_csv(filename, index=False)
+        print(f"Correlation index saved to '{filename}'")
+
+    @classmethod
+    def load(cls, filename="correlation_top_k.csv"):
+        df = pd.read_csv(filename)
+        symbols = list(pd.unique(pd.concat([df['Symbol'], df['Other']])))
+        position = {symbol: i for i, symbol in enumerate(symbols)}
+        k = int(df['Rank'].max()) if len(df) else 0
+        neighbours = np.zeros((len(symbols), k), dtype=np.int64)
+        scores = np.full((len(symbols), k), np.nan)
+        rows = df['Symbol'].map(position).to_numpy()
+        ranks = df['Rank'].to_numpy() - 1
+        neighbours[rows, ranks] = df['Other'].map(position).to_numpy()
+        scores[rows, ranks] = df['Correlation'].to_numpy()
+        return cls(symbols, neighbours, scores)
+
+
+def correlated_with(returns, symbols, target, window=252, k=10, min_periods=None):
+    # Correlation of one symbol against every other one over the last `window` rows: O(window * n)
+    block = returns[-window:]
+    min_periods = min_periods if min_periods is not None else max(window // 2, 2)
+    x = block[:, symbols.index(target)]
+    present = ~np.isnan(block) & ~np.isnan(x)[:, None]
+    count = present.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        xs = np.where(present, x[:, None], 0.0)
+        ys = np.where(present, block, 0.0)
+        x_dev = xs - xs.sum(axis=0) / count
+        y_dev = ys - ys.sum(axis=0) / count
+        x_dev[~present] = 0.0
+        y_dev[~present] = 0.0
+        corr = (x_dev * y_dev).sum(axis=0) / np.sqrt((x_dev ** 2).sum(axis=0) * (y_dev ** 2).sum(axis=0))
+    corr[count < min_periods] = np.nan
+    result = pd.DataFrame({'Symbol': symbols, 'Correlation': corr})
+    result = result[result['Symbol'] != target].dropna()
+    return result.sort_values(by='Correlation', ascending=False).head(k).reset_index(drop=True)
+
+
+# Example usage
+if __name__ == "__main__":
+    dates, symbols, returns = load_returns()
+    covariance, correlation = rolling_matrices(returns, window=252)
+    index = CorrelationIndex.build(correlation, symbols, k=20)
+    index.save()
+    print(index.most_correlated(symbols[0]))
@@ -0,0 +1,333 @@
+import os
+import queue
+import sqlite3
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+import pandas as pd
+
+from profiling import profiler
+
+# Output tables: natural key (primary key) and secondary indexes
+TABLES = {
+    'stock_prices': {'key': ['Symbol', 'Date'], 'indexes': [['Date']]},
+    'latest_stock_prices': {'key': ['Symbol'], 'indexes': [['Date']]},
+    'top_10_stocks': {'key': ['Date', 'List', 'Symbol'], 'indexes': [['Symbol']]},
+    'earnings': {'key': ['symbol', 'earnings_date'], 'indexes': [['earnings_date'], ['week_of']]},
+    'ipos': {'key': ['proposedTickerSymbol', 'companyName', 'Status'], 'indexes': [['pricedDate']]},
+    'news': {'key': ['Article_Id'], 'indexes': [['Published At'], ['Publisher', 'Published At']]},
+}
+
+
+class SQLiteConnectionPool:
+    # Fixed-size pool of SQLite connections that can be shared by threads
+    def __init__(self, filename, size=4):
+        self.connections = queue.Queue(maxsize=size)
+        for _ in range(size):
+            connection = sqlite3.connect(filename, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            # 64 MB page cache keeps the key/date indexes in memory during bulk upserts
+            connection.execute("PRAGMA cache_size=-65536")
+            self.connections.put(connection)
+
+    @contextmanager
+    def connection(self):
+        connection = self.connections.get()
+        try:
+            yield connection
+        finally:
+            self.connections.put(connection)
+
+    def close(self):
+        while not self.connections.empty():
+            self.connections.get().close()
+
+
+class DatabaseSink(ABC):
+    """
+    Writes the script outputs (stock prices, latest snapshot, top-10 lists, earnings, IPOs, news) into
+    database tables instead of only rewriting CSVs, so history accumulates across runs.
+
+    Rows are upserted on each table's natural key (TABLES) with bulk executemany batches. Columns are
+    created from the DataFrame on first write and added when new columns appear.
+    """
+
+    quote_char = '"'
+    batch_size = 5000
+    table_options = ""
+
+    def quote(self, name):
+        return f"{self.quote_char}{name}{self.quote_char}"
+
+    @abstractmethod
+    def connection(self):
+        # Context manager yielding a pooled DB-API connection
+        pass
+
+    @abstractmethod
+    def column_type(self, dtype, is_key):
+        pass
+
+    @abstractmethod
+    def existing_columns(self, connection, table):
+        pass
+
+    @abstractmethod
+    def upsert_sql(self, table, columns, key):
+        pass
+
+    def create_index_sql(self, table, name, columns):
+        return f"CREATE INDEX IF NOT EXISTS {self.quote(name)} ON {self.quote(table)} " \
+               f"({', '.join(self.quote(c) for c in columns)})"
+
+    @staticmethod
+    def prepare(df):
+        # Datetimes become ISO strings (dates only when there is no time part, as in the CSVs) and
+        # NaN/NaT become NULL
+        df = df.copy()
+        for column in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[column]):
+                values = df[column]
+                dates_only = (values.dropna() == values.dropna().dt.normalize()).all()
+                df[column] = values.dt.strftime('%Y-%m-%d' if dates_only else '%Y-%m-%d %H:%M:%S')
+        df = df.astype(object).where(pd.notna(df), None)
+        return df
+
+    def ensure_table(self, connection, table, df):
+        spec = TABLES.get(table, {'key': [], 'indexes': []})
+        key = [c for c in spec['key'] if c in df.columns]
+        existing = self.existing_columns(connection, table)
+        cursor = connection.cursor()
+        if not existing:
+            definitions = [f"{self.quote(c)} {self.column_type(df[c].dtype, c in key)}" for c in df.columns]
+            if key:
+                definitions.append(f"PRIMARY KEY ({', '.join(self.quote(c) for c in key)})")
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS {self.quote(table)} ({', '.join(definitions)})"
+                           f"{self.table_options if key else ''}")
+            for columns in spec['indexes']:
+                if all(c in df.columns for c in columns):
+                    name = f"idx_{table}_{'_'.join(columns)}".replace(' ', '_')
+                    self.create_index(cursor, table, name, columns, df)
+        else:
+            for column in df.columns:
+                if column not in existing:
+                    cursor.execute(f"ALTER TABLE {self.quote(table)} ADD COLUMN {self.quote(column)} "
+                                   f"{self.column_type(df[column].dtype, False)}")
+        cursor.close()
+        return key
+
+    def create_index(self, cursor, table, name, columns, df):
+        cursor.execute(self.create_index_sql(table, name, columns))
+
+    def write(self, table, df):
+        """
+        Upserts a DataFrame into `table`.
+
+        Returns:
+            int: Number of rows written.
+        """
+        if df is None or df.empty:
+            return 0
+        df = df.loc[:, ~df.columns.duplicated()]
+        with profiler.span(f"db write {table}"), self.connection() as connection:
+            key = self.ensure_table(connection, table, df)
+            if key:
+                # Rows without a natural key cannot be upserted
+                df = df.dropna(subset=key).drop_duplicates(subset=key, keep='last')
+            self.bulk_insert(connection, table, self.prepare(df), key)
+            connection.commit()
+        profiler.count(f"db_rows_{table}", len(df))
+        return len(df)
+
+    def bulk_insert(self, connection, table, df, key):
+        sql = self.upsert_sql(table, list(df.columns), key)
+        rows = df.itertuples(index=False, name=None)
+        cursor = connection.cursor()
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                cursor.executemany(sql, batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+        cursor.close()
+
+    def read(self, sql, params=None):
+        with self.connection() as connection:
+            return pd.read_sql_query(sql, connection, params=params)
+
+
+class SQLiteSink(DatabaseSink):
+    # Keyed tables are clustered on their natural key
+    table_options = " WITHOUT ROWID"
+
+    def __init__(self, filename="stocks.db", pool_size=4):
+        self.filename = filename
+        self.pool = SQLiteConnectionPool(filename, pool_size)
+
+    @contextmanager
+    def connection(self):
+        with self.pool.connection() as connection:
+            yield connection
+
+    def column_type(self, dtype, is_key):
+        if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+            return "INTEGER"
+        if pd.api.types.is_float_dtype(dtype):
+            return "REAL"
+        return "TEXT"
+
+    def existing_columns(self, connection, table):
+        return [row[1] for row in connection.execute(f"PRAGMA table_info({self.quote(table)})")]
+
+    def upsert_sql(self, table, columns, key):
+        column_list = ", ".join(self.quote(c) for c in columns)
+        sql = f"INSERT INTO {self.quote(table)} ({column_list}) VALUES ({', '.join('?' * len(columns))})"
+        updates = [c for c in columns if c not in key]
+        if key and updates:
+            sql += f" ON CONFLICT ({', '.join(self.quote(c) for c in key)}) DO UPDATE SET " + \
+                   ", ".join(f"{self.quote(c)} = excluded.{self.quote(c)}" for c in updates)
+        elif key:
+            sql = sql.replace("INSERT INTO", "INSERT OR IGNORE INTO", 1)
+        return sql
+
+    def close(self):
+        self.pool.close()
+
+
+class MySQLSink(DatabaseSink):
+    """
+    MySQL backend (needs mysql-connector-python). Uses a mysql.connector connection pool, executemany
+    with ON DUPLICATE KEY UPDATE, and LOAD DATA LOCAL INFILE for large frames when the server allows it.
+    """
+
+    quote_char = '`'
+    load_data_threshold = 50000
+
+    def __init__(self, host=None, user=None, password=None, database=None, port=None, pool_size=4):
+        try:
+            from mysql.connector import pooling
+        except ImportError:
+            raise ImportError("MySQL support needs the mysql-connector-python package") from None
+        self.pool = pooling.MySQLConnectionPool(
+            pool_name="stocks",
+            pool_size=pool_size,
+            host=host or os.environ.get("MYSQL_HOST", "localhost"),
+            port=int(port or os.environ.get("MYSQL_PORT", 3306)),
+            user=user or os.environ.get("MYSQL_USER"),
+            password=password or os.environ.get("MYSQL_PASSWORD"),
+            database=database or os.environ.get("MYSQL_DATABASE", "stocks"),
+            allow_local_infile=True,
+        )
+
+    @contextmanager
+    def connection(self):
+        connection = self.pool.get_connection()
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def column_type(self, dtype, is_key):
+        if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+            return "BIGINT"
+        if pd.api.types.is_float_dtype(dtype):
+            return "DOUBLE"
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return "DATETIME"
+        # Key columns must be VARCHAR to be indexable
+        return "VARCHAR(255)" if is_key else "TEXT"
+
+    def existing_columns(self, connection, table):
+        cursor = connection.cursor()
+        cursor.execute("SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS "
+                       "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", (table,))
+        columns = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+        return columns
+
+    def create_index(self, cursor, table, name, columns, df):
+        # MySQL has no CREATE INDEX IF NOT EXISTS; TEXT columns (and only those) need a prefix length
+        parts = ", ".join(f"{self.quote(c)}(191)" if self.column_type(df[c].dtype, False) == "TEXT"
+                          else self.quote(c) for c in columns)
+        try:
+            cursor.execute(f"CREATE INDEX {self.quote(name)} ON {self.quote(table)} ({parts})")
+        except Exception as e:
+            print(f"Could not create index {name}: {e}")
+
+    def upsert_sql(self, table, columns, key):
+        column_list = ", ".join(self.quote(c) for c in columns)
+        sql = f"INSERT INTO {self.quote(table)} ({column_list}) VALUES ({', '.join(['%s'] * len(columns))})"
+        updates = [c for c in columns if c not in key]
+        if updates:
+            sql += " ON DUPLICATE KEY UPDATE " + \
+                   ", ".join(f"{self.quote(c)} = VALUES({self.quote(c)})" for c in updates)
+        return sql
+
+    def bulk_insert(self, connection, table, df, key):
+        if len(df) >= self.load_data_threshold:
+            try:
+                self.load_data(connection, table, df)
+                return
+            except Exception as e:
+                print(f"LOAD DATA failed for {table}, falling back to batched inserts: {e}")
+        super().bulk_insert(connection, table, df, key)
+
+    def load_data(self, connection, table, df):
+        # REPLACE gives upsert semantics on the primary key
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, newline="", encoding="utf-8") as file:
+            df.to_csv(file, index=False, header=False, na_rep="\\N")
+            filename = file.name
+        try:
+            cursor = connection.cursor()
+            cursor.execute(
+                f"LOAD DATA LOCAL INFILE %s REPLACE INTO TABLE {self.quote(table)} "
+                f"FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' LINES TERMINATED BY '\\n' "
+                f"({', '.join(self.quote(c) for c in df.columns)})",
+                (filename,),
+            )
+            cursor.close()
+        finally:
+            os.remove(filename)
+
+    def close(self):
+        pass
+
+
+_sink = None
+
+
+def get_sink():
+    """
+    Returns the configured sink, or None when database output is off.
+
+    STOCKS_DB selects it: unset/empty = off, "sqlite" or "1" = SQLite in stocks.db, "sqlite:<file>" = SQLite
+    in <file>, "mysql" = MySQL configured by MYSQL_HOST/MYSQL_PORT/MYSQL_USER/MYSQL_PASSWORD/MYSQL_DATABASE.
+    """
+    global _sink
+    if _sink is None:
+        setting = os.environ.get("STOCKS_DB", "").strip()
+        if not setting:
+            return None
+        if setting.lower() == "mysql":
+            _sink = MySQLSink()
+        elif setting.lower().startswith("sqlite:"):
+            _sink = SQLiteSink(setting.split(":", 1)[1])
+        else:
+            _sink = SQLiteSink()
+    return _sink
+
+
+def write_output(table, df):
+    # Called next to every CSV write; a no-op unless STOCKS_DB is set
+    sink = get_sink()
+    if sink is None:
+        return 0
+    try:
+        return sink.write(table, df)
+    except Exception as e:
+        print(f"Could not write {table} to the database: {e}")
+        return 0
@@ -0,0 +1,152 @@
+import os
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+from profiling import profiler
+from price_store import PriceStore, frame_to_panels
+
+
+class EarningsWarehouse:
+    """
+    Local history of scraped earnings calendar rows, accumulated across runs.
+
+    Rows are deduplicated on (symbol, earnings_date), the latest scrape winning, and stored in monthly
+    partitions (<directory>/earnings_YYYY-MM.csv). A small index file maps symbol/date/week to partitions
+    so lookups by symbol or by week only read the partitions they need.
+    """
+
+    KEY = ['symbol', 'earnings_date']
+
+    def __init__(self, directory="earnings_warehouse"):
+        self.directory = directory
+        self.index_file = os.path.join(directory, "index.csv")
+
+    def _partition_file(self, month):
+        return os.path.join(self.directory, f"earnings_{month}.csv")
+
+    def load_index(self):
+        try:
+            return pd.read_csv(self.index_file)
+        except FileNotFoundError:
+            return pd.DataFrame(columns=['symbol', 'earnings_date', 'week_of', 'month'])
+
+    def add(self, earnings_rows):
+        # earnings_rows: list of dicts or DataFrame as produced by NasdaqEarningsScraper
+        new = pd.DataFrame(earnings_rows)
+        if new.empty:
+            return 0
+        new['symbol'] = new['symbol'].astype(str).str.strip().str.upper()
+        new['earnings_date'] = pd.to_datetime(new['earnings_date']).dt.strftime('%Y-%m-%d')
+        dates = pd.to_datetime(new['earnings_date'])
+        new['week_of'] = (dates - pd.to_timedelta(dates.dt.weekday, unit='D')).dt.strftime('%Y-%m-%d')
+        new['month'] = dates.dt.strftime('%Y-%m')
+        new = new.drop_duplicates(subset=self.KEY, keep='last')
+
+        os.makedirs(self.directory, exist_ok=True)
+        with profiler.span("earnings warehouse add"):
+            for month, rows in new.groupby('month'):
+                filename = self._partition_file(month)
+                if os.path.isfile(filename):
+                    rows = pd.concat([pd.read_csv(filename), rows], ignore_index=True) \
+                             .drop_duplicates(subset=self.KEY, keep='last')
+                rows.sort_values(self.KEY).to_csv(filename, index=False)
+
+            index = pd.concat([self.load_index(), new[['symbol', 'earnings_date', 'week_of', 'month']]],
+                              ignore_index=True).drop_duplicates(subset=self.KEY, keep='last')
+            index.sort_values(self.KEY).to_csv(self.index_file, index=False)
+        print(f"Earnings warehouse updated with {len(new)} rows ({len(index)} in total)")
+        return len(new)
+
+    def _read_months(self, months):
+        frames = [pd.read_csv(self._partition_file(m)) for m in sorted(set(months))
+                  if os.path.isfile(self._partition_file(m))]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=self.KEY)
+
+    def lookup(self, symbol=None, week_of=None):
+        """
+        Rows for a symbol and/or the week starting on `week_of` (any date in the week works).
+        """
+        index = self.load_index()
+        if symbol is not None:
+            index = index[index['symbol'] == symbol.strip().upper()]
+        if week_of is not None:
+            day = pd.Timestamp(week_of)
+            monday = (day - timedelta(days=day.weekday())).strftime('%Y-%m-%d')
+            index = index[index['week_of'] == monday]
+        rows = self._read_months(index['month'])
+        if rows.empty:
+            return rows
+        keys = index.set_index(self.KEY).index
+        return rows[rows.set_index(self.KEY).index.isin(keys)].reset_index(drop=True)
+
+    def load(self):
+        return self._read_months(self.load_index()['month'])
+
+
+def earnings_reactions(events, stock_prices_df, pre_days=5, post_days=5):
+    """
+    Price and volume reaction around every earnings event, in one vectorized pass over the price panels.
+
+    The reaction day is the first trading day on/after the earnings date, or the next one for after-hours
+    reports (Nasdaq 'time' == 'time-after-hours').
+
+    Returns:
+        DataFrame: one row per event with Pre_Move_% (the `pre_days` run-up into the report), Gap_%,
+        Reaction_% (close-to-close on the reaction day), Post_Drift_% (the `post_days` after) and
+        Volume_Spike (reaction-day volume / prior 50-day volume MA).
+    """
+    events = events.copy()
+    events['symbol'] = events['symbol'].astype(str).str.upper()
+    with profiler.span("earnings reactions"):
+        dates, symbols, panels = frame_to_panels(stock_prices_df, ['Open', 'Close', 'Volume', '50_Day_Volume_MA'])
+        dates = pd.to_datetime(dates).to_numpy()
+        column_of = {symbol: i for i, symbol in enumerate(symbols)}
+        n_dates = len(dates)
+
+        cols = events['symbol'].map(column_of).fillna(-1).astype(int).to_numpy()
+        rows = np.searchsorted(dates, pd.to_datetime(events['earnings_date']).to_numpy(), side='left')
+        if 'time' in events.columns:
+            rows = rows + (events['time'].fillna('').str.contains('after', case=False)).to_numpy().astype(int)
+        valid = (cols >= 0) & (rows >= 1) & (rows < n_dates)
+
+        def take(panel, offset):
+            at = rows + offset
+            ok = valid & (at >= 0) & (at < n_dates)
+            out = np.full(len(rows), np.nan)
+            out[ok] = panel[at[ok], cols[ok]]
+            return out
+
+        close, open_, volume = panels['Close'], panels['Open'], panels['Volume']
+        previous_close = take(close, -1)
+        reaction_dates = np.full(len(rows), np.datetime64('NaT'), dtype='datetime64[ns]')
+        reaction_dates[valid] = dates[rows[valid]]
+        events['Reaction_Date'] = reaction_dates
+        with np.errstate(invalid='ignore', divide='ignore'):
+            events['Pre_Move_%'] = (previous_close / take(close, -1 - pre_days) - 1) * 100
+            events['Gap_%'] = (take(open_, 0) / previous_close - 1) * 100
+            events['Reaction_%'] = (take(close, 0) / previous_close - 1) * 100
+            events['Post_Drift_%'] = (take(close, post_days) / take(close, 0) - 1) * 100
+            events['Volume_Spike'] = take(volume, 0) / take(panels['50_Day_Volume_MA'], -1)
+    return events
+
+
+def reactions_from_store(warehouse=None, store=None, symbols=None):
+    # Joins the whole warehouse (or some symbols) against the price store, reading only the needed columns
+    warehouse = warehouse or EarningsWarehouse()
+    store = store or PriceStore()
+    events = warehouse.load()
+    if symbols is not None:
+        events = events[events['symbol'].isin([s.upper() for s in symbols])]
+    if events.empty:
+        return events
+    prices = store.load(symbols=list(events['symbol'].unique()),
+                        columns=['Open', 'Close', 'Volume', '50_Day_Volume_MA'])
+    return earnings_reactions(events, prices)
+
+
+# Example usage
+if __name__ == "__main__":
+    reactions = reactions_from_store()
+    print(reactions[['symbol', 'earnings_date', 'Pre_Move_%', 'Reaction_%', 'Post_Drift_%', 'Volume_Spike']])
@@ -2,6 +2,10 @@ import yfinance as yf
 from datetime import datetime
 import csv
 from tickers import Tickers
+from profiling import profiler
+from news_store import NewsStore, NearDuplicateIndex, simhash, article_text, article_key
+from db_sink import write_output
+import pandas as pd
 
 
 class GetNews:
@@ -34,7 +38,8 @@ class GetNews:
         for symbol in self.ticker_symbols:
             ticker = yf.Ticker(symbol)
             try:
-                news_items = ticker.news
+                with profiler.span("yf.Ticker.news"):
+                    news_items = ticker.news
             except Exception as e:
                 print(f"⚠️ Failed to fetch news for {symbol}: {e}")
                 continue
@@ -55,19 +60,34 @@ class GetNews:
                 article["datetime_obj"] = publish_datetime
                 article["tickers"] = article.get("tickers", []) or [symbol]
                 self.articles.append(article)
+                profiler.count("news_articles_fetched")
 
+    @profiler.timed("news deduplicate")
     def deduplicate_articles(self):
-        seen = set()
+        # Exact repeats (same uid/link) and near-duplicates (same story, slightly different wording, by
+        # SimHash distance) are merged; the first copy is kept and collects the tickers of the others.
+        # Articles without any words in title/summary are only matched by uid.
+        seen = NearDuplicateIndex()
+        seen_uids = {}
         unique_articles = []
         for article in self.articles:
             content = article.get("content", {})
-            title = content.get("title", "").strip()
-            summary = content.get("summary", "").strip()
-
-            key = (title.lower(), summary.lower())
-            if key not in seen:
-                seen.add(key)
+            title = (content.get("title") or "").strip()
+            summary = (content.get("summary") or "").strip()
+
+            uid = NewsStore.normalize(article)["uid"]
+            fingerprint = simhash(article_text(title, summary))
+            kept = seen_uids.get(uid)
+            if kept is None and fingerprint is not None:
+                kept = seen.find(fingerprint)
+            if kept is None:
+                seen_uids[uid] = len(unique_articles)
+                if fingerprint is not None:
+                    seen.add(fingerprint, len(unique_articles))
                 unique_articles.append(article)
+            else:
+                first = unique_articles[kept]
+                first["tickers"] = list(dict.fromkeys(first.get("tickers", []) + article.get("tickers", [])))
         self.articles = unique_articles
 
     def sort_articles(self):
@@ -88,10 +108,13 @@ class GetNews:
             print(f"   ✏️ Summary: {summary[:200]}{'...' if len(summary) > 200 else ''}")
             print("-" * 80)
 
+    @profiler.timed("news save_to_csv")
     def save_to_csv(self, filename="news_articles.csv"):
+        columns = ["Title", "Summary", "Publisher", "Published At", "Tickers", "Link"]
+        rows = []
         with open(filename, mode="w", newline="", encoding="utf-8") as file:
             writer = csv.writer(file)
-            writer.writerow(["Title", "Summary", "Publisher", "Published At", "Tickers", "Link"])
+            writer.writerow(columns)
 
             for article in self.articles:
                 try:
@@ -107,18 +130,32 @@ class GetNews:
                     publish_datetime = article["datetime_obj"].strftime('%Y-%m-%d %H:%M:%S')
                     tickers = ", ".join(sorted(set(article.get("tickers", []))))
 
-                    writer.writerow([title, summary, publisher, publish_datetime, tickers, link])
+                    row = [title, summary, publisher, publish_datetime, tickers, link]
+                    writer.writerow(row)
+                    rows.append(row + [article_key(article)])
 
                 except Exception as e:
                     print(f"⚠️ Skipping article due to error: {e}")
                     print(f"Raw article content:\n{article}")
 
+        write_output('news', pd.DataFrame(rows, columns=columns + ["Article_Id"]))
+
+    def save_to_store(self, filename="news_store.db"):
+        store = NewsStore(filename)
+        try:
+            stats = store.ingest(self.articles)
+        finally:
+            store.close()
+        print(f"News store '{filename}': {stats['inserted']} new articles, {stats['duplicates']} duplicates "
+              f"({stats['articles_per_second']:,.0f} articles/s)")
+
     def run(self, filename="news_articles.csv"):
         self.fetch_news()
         self.deduplicate_articles()
         self.sort_articles()
         self.print_preview()
         self.save_to_csv(filename)
+        self.save_to_store()
 
 if __name__ == "__main__":
     news = GetNews(['TSLA'])
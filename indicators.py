@@ -0,0 +1,304 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import t as t_distribution
+
+from profiling import profiler
+from rolling_extremes import rolling_extreme, bars_since
+
+# Registry of indicator name -> {"columns": [...], "depends": [...], "func": callable}.
+# Registration order is the column order of the output frame.
+INDICATORS = {}
+
+# The indicator set getting_the_data has always produced, in its column order
+DEFAULT_INDICATORS = [
+    'ema', 'macd', 'price_ma', 'volume_ma', 'volume_change', 'range_3m', 'range_1m', 'range_5y',
+    'pct_from_3m', 'range_52w', 'pct_from_52w', 'hit_52w', 'percent_change', 'regression_5d',
+]
+
+
+def register_indicator(name, columns, depends=()):
+    """
+    Registers an indicator computed on the wide dates x symbols panels.
+
+    The decorated function receives the dict of panels (price fields plus every column computed
+    so far) and returns a dict mapping each of `columns` to a 2-D NumPy array of the same shape.
+    """
+    def decorator(func):
+        INDICATORS[name] = {"columns": list(columns), "depends": list(depends), "func": func}
+        return func
+
+    return decorator
+
+
+# ----- Kernels: each works on a whole dates x symbols panel at once -----
+
+def ewm_mean(values, alpha):
+    # Same recursion as pandas' ewm(adjust=False).mean(), vectorized across the symbol axis
+    out = np.empty_like(values, dtype=float)
+    if len(values) == 0:
+        return out
+    weighted = values[0].astype(float)
+    old_wt = np.ones(values.shape[1])
+    out[0] = weighted
+    for i in range(1, len(values)):
+        cur = values[i]
+        is_observation = ~np.isnan(cur)
+        started = ~np.isnan(weighted)
+        old_wt = np.where(started, old_wt * (1 - alpha), old_wt)
+        update = started & is_observation
+        with np.errstate(invalid='ignore'):
+            blended = (old_wt * weighted + alpha * cur) / (old_wt + alpha)
+        weighted = np.where(update & (weighted != cur), blended, weighted)
+        old_wt = np.where(update, 1.0, old_wt)
+        weighted = np.where(~started & is_observation, cur, weighted)
+        out[i] = weighted
+    return out
+
+
+def rolling_mean(values, window):
+    return pd.DataFrame(values).rolling(window=window).mean().to_numpy()
+
+
+def rolling_std(values, window):
+    return pd.DataFrame(values).rolling(window=window).std().to_numpy()
+
+
+def pct_change(values):
+    return pd.DataFrame(values).pct_change().to_numpy() * 100
+
+
+def percent_diff(values, reference):
+    return (values - reference) / reference * 100
+
+
+def rolling_regression(values, window=5):
+    """
+    Rolling least-squares fit of values against 0..window-1, matching scipy.stats.linregress.
+
+    Returns:
+        tuple of 2-D arrays: slope, r squared and two-sided p-value (NaN for the first window-1 rows).
+    """
+    n_rows, n_cols = values.shape
+    slope = np.full((n_rows, n_cols), np.nan)
+    r_squared = np.full((n_rows, n_cols), np.nan)
+    p_value = np.full((n_rows, n_cols), np.nan)
+    if n_rows < window:
+        return slope, r_squared, p_value
+
+    # windows has shape (n_rows - window + 1, n_cols, window)
+    windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=0)
+    x = np.arange(window, dtype=float)
+    x_dev = x - x.mean()
+    ssxm = (x_dev ** 2).mean()
+    y_dev = windows - windows.mean(axis=2, keepdims=True)
+    ssxym = (y_dev * x_dev).mean(axis=2)
+    ssym = (y_dev ** 2).mean(axis=2)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # A flat window counts as uncorrelated (r 0, so R squared 0 and p-value 1), which is what the
+        # per-ticker linregress calls reported; newer SciPy releases return NaN there instead
+        r = np.clip(ssxym / np.sqrt(ssxm * ssym), -1.0, 1.0)
+        r = np.where(ssxm * ssym == 0.0, 0.0, r)
+        df = window - 2
+        tiny = 1.0e-20
+        t_stat = r * np.sqrt(df / ((1.0 - r + tiny) * (1.0 + r + tiny)))
+        p = 2 * t_distribution.sf(np.abs(t_stat), df)
+
+    slope[window - 1:] = ssxym / ssxm
+    r_squared[window - 1:] = r ** 2
+    p_value[window - 1:] = p
+    return slope, r_squared, p_value
+
+
+# ----- Indicator definitions -----
+
+@register_indicator('ema', ['EMA_12', 'EMA_26'])
+def _ema(panels):
+    close = panels['Close']
+    return {'EMA_12': ewm_mean(close, 2 / 13), 'EMA_26': ewm_mean(close, 2 / 27)}
+
+
+@register_indicator('macd', ['MACD_Line', 'MACD_Signal', 'MACD_Histogram'], depends=['ema'])
+def _macd(panels):
+    line = panels['EMA_12'] - panels['EMA_26']
+    signal = ewm_mean(line, 2 / 10)
+    return {'MACD_Line': line, 'MACD_Signal': signal, 'MACD_Histogram': line - signal}
+
+
+@register_indicator('price_ma', ['5_Day_MA', '50_Day_MA', '250_Day_MA'])
+def _price_ma(panels):
+    close = panels['Close']
+    return {f'{w}_Day_MA': rolling_mean(close, w) for w in (5, 50, 250)}
+
+
+@register_indicator('volume_ma', ['5_Day_Volume_MA', '50_Day_Volume_MA', '250_Day_Volume_MA'])
+def _volume_ma(panels):
+    volume = panels['Volume']
+    return {f'{w}_Day_Volume_MA': rolling_mean(volume, w) for w in (5, 50, 250)}
+
+
+@register_indicator('volume_change', ['Daily_Volume_%_Change'])
+def _volume_change(panels):
+    return {'Daily_Volume_%_Change': pct_change(panels['Volume'])}
+
+
+def _low_high_range(panels, window, low_column, high_column):
+    # Bar positions of the extremes are kept under private keys for the "days since" indicators
+    low, low_index = rolling_extreme(panels['Low'], window, 'min')
+    high, high_index = rolling_extreme(panels['High'], window, 'max')
+    panels[f'_{low_column}_Index'] = low_index
+    panels[f'_{high_column}_Index'] = high_index
+    return {low_column: low, high_column: high}
+
+
+@register_indicator('range_3m', ['3_Month_Low', '3_Month_High'])
+def _range_3m(panels):
+    return _low_high_range(panels, 63, '3_Month_Low', '3_Month_High')
+
+
+@register_indicator('range_1m', ['1_Month_Low', '1_Month_High'])
+def _range_1m(panels):
+    return _low_high_range(panels, 21, '1_Month_Low', '1_Month_High')
+
+
+@register_indicator('range_5y', ['5_Years_Low', '5_Years_High'])
+def _range_5y(panels):
+    return _low_high_range(panels, 1250, '5_Years_Low', '5_Years_High')
+
+
+@register_indicator('pct_from_3m', ['Percent_Diff_3M_Low', 'Percent_Diff_3M_High'], depends=['range_3m'])
+def _pct_from_3m(panels):
+    close = panels['Close']
+    return {'Percent_Diff_3M_Low': percent_diff(close, panels['3_Month_Low']),
+            'Percent_Diff_3M_High': percent_diff(close, panels['3_Month_High'])}
+
+
+@register_indicator('range_52w', ['52_Week_Low', '52_Week_High'])
+def _range_52w(panels):
+    return _low_high_range(panels, 252, '52_Week_Low', '52_Week_High')
+
+
+@register_indicator('pct_from_52w', ['Percent_Diff_From_52_Week_Low', 'Percent_Diff_From_52_Week_High'],
+                    depends=['range_52w'])
+def _pct_from_52w(panels):
+    close = panels['Close']
+    return {'Percent_Diff_From_52_Week_Low': percent_diff(close, panels['52_Week_Low']),
+            'Percent_Diff_From_52_Week_High': percent_diff(close, panels['52_Week_High'])}
+
+
+@register_indicator('hit_52w', ['Hit_52_Week_Low', 'Hit_52_Week_High'], depends=['range_52w'])
+def _hit_52w(panels):
+    return {'Hit_52_Week_Low': (panels['Low'] == panels['52_Week_Low']).astype(int),
+            'Hit_52_Week_High': (panels['High'] == panels['52_Week_High']).astype(int)}
+
+
+@register_indicator('percent_change', ['Percent_Change'])
+def _percent_change(panels):
+    return {'Percent_Change': pct_change(panels['Close'])}
+
+
+@register_indicator('regression_5d', ['5_Day_Slope', '5_Day_R_Squared', '5_Day_P_Value'])
+def _regression_5d(panels):
+    slope, r_squared, p_value = rolling_regression(panels['Close'], 5)
+    return {'5_Day_Slope': slope, '5_Day_R_Squared': r_squared, '5_Day_P_Value': p_value}
+
+
+# Extra indicators, not part of DEFAULT_INDICATORS
+@register_indicator('days_since_52w', ['Days_Since_52_Week_Low', 'Days_Since_52_Week_High'], depends=['range_52w'])
+def _days_since_52w(panels):
+    return {'Days_Since_52_Week_Low': bars_since(panels['_52_Week_Low_Index']),
+            'Days_Since_52_Week_High': bars_since(panels['_52_Week_High_Index'])}
+
+
+@register_indicator('rsi_14', ['RSI_14'])
+def _rsi_14(panels):
+    delta = np.diff(panels['Close'], axis=0, prepend=np.nan)
+    gain = ewm_mean(np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0)), 1 / 14)
+    loss = ewm_mean(np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0)), 1 / 14)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rsi = 100 - 100 / (1 + gain / loss)
+    return {'RSI_14': rsi}
+
+
+@register_indicator('atr_14', ['ATR_14'])
+def _atr_14(panels):
+    high, low, close = panels['High'], panels['Low'], panels['Close']
+    previous_close = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+    return {'ATR_14': ewm_mean(true_range, 1 / 14)}
+
+
+@register_indicator('bollinger_20', ['Bollinger_Middle', 'Bollinger_Upper', 'Bollinger_Lower'])
+def _bollinger_20(panels):
+    middle = rolling_mean(panels['Close'], 20)
+    std = rolling_std(panels['Close'], 20)
+    return {'Bollinger_Middle': middle, 'Bollinger_Upper': middle + 2 * std, 'Bollinger_Lower': middle - 2 * std}
+
+
+# ----- Engine -----
+
+def resolve_indicators(names=None):
+    # Expands the requested names with their dependencies, keeping registry order
+    requested = list(DEFAULT_INDICATORS if names is None else names)
+    unknown = [name for name in requested if name not in INDICATORS]
+    if unknown:
+        raise ValueError(f"Unknown indicator(s): {', '.join(unknown)}. Choose from: {', '.join(INDICATORS)}")
+
+    needed = set()
+    stack = requested[:]
+    while stack:
+        name = stack.pop()
+        if name not in needed:
+            needed.add(name)
+            stack.extend(INDICATORS[name]["depends"])
+    return [name for name in INDICATORS if name in needed]
+
+
+def build_panels(data, tickers):
+    """
+    Turns a yf.download(..., group_by='ticker') frame into wide dates x symbols panels.
+
+    Returns:
+        tuple: (dates index, list of symbols, list of price fields, dict field -> 2-D float array)
+    """
+    available = set(data.columns.get_level_values(0))
+    symbols = [ticker for ticker in tickers if ticker in available]
+    fields = list(dict.fromkeys(data.columns.get_level_values(1)))
+    panels = {}
+    for field in fields:
+        panels[field] = data.xs(field, axis=1, level=1).reindex(columns=symbols).to_numpy(dtype=float)
+    return data.index, symbols, fields, panels
+
+
+def compute_indicators(panels, names=None):
+    """
+    Computes the requested indicators (default: DEFAULT_INDICATORS) in place on the panels dict.
+
+    Returns:
+        list of str: The computed column names in output order.
+    """
+    columns = []
+    for name in resolve_indicators(names):
+        indicator = INDICATORS[name]
+        with profiler.span(f"indicator {name}"):
+            panels.update(indicator["func"](panels))
+        columns.extend(indicator["columns"])
+    return columns
+
+
+def panels_to_frame(dates, symbols, fields, panels, columns, date_column='Date'):
+    # Long (symbol-major) frame: one block of rows per symbol, in the order of `symbols`
+    n_dates = len(dates)
+    frame = {date_column: np.tile(np.asarray(dates), len(symbols))}
+    for field in fields:
+        frame[field] = panels[field].T.ravel()
+    frame['Symbol'] = np.repeat(np.asarray(symbols, dtype=object), n_dates)
+    for column in columns:
+        frame[column] = panels[column].T.ravel()
+    return pd.DataFrame(frame)
+
+
+def compute_indicator_frame(data, tickers, names=None):
+    dates, symbols, fields, panels = build_panels(data, tickers)
+    columns = compute_indicators(panels, names)
+    return panels_to_frame(dates, symbols, fields, panels, columns, date_column=data.index.name or 'Date')
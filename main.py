@@ -4,22 +4,35 @@ from bs4 import BeautifulSoup
 import requests
 import yfinance as yf
 import pandas as pd
-import mysql.connector
 from datetime import datetime, timedelta
-from scipy.stats import linregress
-import matplotlib.pyplot as plt
 import os
-import matplotlib.dates as mdates
+import time
 import numpy as np
 from nasdaq_ipo_scraper import NasdaqIPOScraper
 from nasdaq_earnings_scraper import NasdaqEarningsScraper
 from get_news import GetNews
+from news_store import NewsStore
+from earnings_warehouse import EarningsWarehouse, reactions_from_store
 from tickers import Tickers
+from profiling import profiler
+from indicators import compute_indicator_frame
+from screener import Screener, PRESET_SCREENS, DEFAULT_COLUMNS
+from sector_rollups import compute_rollups, save_rollups
+from price_store import PriceStore
+from backtest import Backtester, RULES
+from correlation import load_returns, rolling_matrices, CorrelationIndex, correlated_with
+from streaming_quotes import StreamingSession, YahooQuotePoller, ReplayFeed, record_feed
+from db_sink import write_output
+from portfolio import Portfolio
+from watchlist import get_watchlist
+from charts import render_charts
 
 
 class GetStockData:
-    def __init__(self, type: str):
+    def __init__(self, type: str, indicators=None):
         self.tickers_list = Tickers().get_tickers_list(type)
+        # Subset of indicators.INDICATORS to compute; None means the full default set
+        self.indicators = indicators
         self.load_company_info()
         self.getting_the_data()
 
@@ -40,8 +53,10 @@ class GetStockData:
             }
         else:
             # Fetch data from yfinance
-            company = yf.Ticker(ticker)
-            info = company.info
+            profiler.count("company_info_fetches")
+            with profiler.span("yf.Ticker.info (company info)"):
+                company = yf.Ticker(ticker)
+                info = company.info
             company_data = {
                 "Ticker": ticker,
                 "Short Name": info.get("shortName"),
@@ -50,98 +65,48 @@ class GetStockData:
             }
             # Append to DataFrame and save to CSV
             self.company_info_df = pd.concat([self.company_info_df, pd.DataFrame([company_data])], ignore_index=True)
-            self.company_info_df.to_csv("company_info.csv", index=False)
+            with profiler.span("to_csv company_info.csv"):
+                self.company_info_df.to_csv("company_info.csv", index=False)
             return company_data
 
     def getting_the_data(self):
         today = datetime.today()
         five_years_ago = today - timedelta(days=5 * 365)
-        data = yf.download(self.tickers_list, start=five_years_ago, end=today, group_by='ticker')
-        all_data = []
-
-        for ticker in self.tickers_list:
-            ticker_data = data[ticker].reset_index()
-            ticker_data['Symbol'] = ticker
-
-            ticker_data['EMA_12'] = ticker_data['Close'].ewm(span=12, adjust=False).mean()
-            ticker_data['EMA_26'] = ticker_data['Close'].ewm(span=26, adjust=False).mean()
-            ticker_data['MACD_Line'] = ticker_data['EMA_12'] - ticker_data['EMA_26']
-            ticker_data['MACD_Signal'] = ticker_data['MACD_Line'].ewm(span=9, adjust=False).mean()
-            ticker_data['MACD_Histogram'] = ticker_data['MACD_Line'] - ticker_data['MACD_Signal']
-
-            # Rolling Moving Averages for Stock Price
-            ticker_data['5_Day_MA'] = ticker_data['Close'].rolling(window=5).mean()
-            ticker_data['50_Day_MA'] = ticker_data['Close'].rolling(window=50).mean()
-            ticker_data['250_Day_MA'] = ticker_data['Close'].rolling(window=250).mean()
-
-            # Rolling Moving Averages for Volume
-            ticker_data['5_Day_Volume_MA'] = ticker_data['Volume'].rolling(window=5).mean()
-            ticker_data['50_Day_Volume_MA'] = ticker_data['Volume'].rolling(window=50).mean()
-            ticker_data['250_Day_Volume_MA'] = ticker_data['Volume'].rolling(window=250).mean()
-
-            # Daily Percent Change for Volume
-            ticker_data['Daily_Volume_%_Change'] = ticker_data['Volume'].pct_change() * 100
-
-            # Rolling Min/Max for 3-Month and 52-Week Periods
-            ticker_data['3_Month_Low'] = ticker_data['Low'].rolling(window=63, min_periods=1).min()
-            ticker_data['3_Month_High'] = ticker_data['High'].rolling(window=63, min_periods=1).max()
-            ticker_data['1_Month_Low'] = ticker_data['Low'].rolling(window=21, min_periods=1).min()
-            ticker_data['1_Month_High'] = ticker_data['High'].rolling(window=21, min_periods=1).max()
-            ticker_data['5_Years_Low'] = ticker_data['Low'].rolling(window=1250, min_periods=1).min()
-            ticker_data['5_Years_High'] = ticker_data['High'].rolling(window=1250, min_periods=1).max()
-            ticker_data['Percent_Diff_3M_Low'] = (ticker_data['Close'] - ticker_data['3_Month_Low']) / ticker_data[
-                '3_Month_Low'] * 100
-            ticker_data['Percent_Diff_3M_High'] = (ticker_data['Close'] - ticker_data['3_Month_High']) / ticker_data[
-                '3_Month_High'] * 100
-            ticker_data['52_Week_Low'] = ticker_data['Low'].rolling(window=252, min_periods=1).min()
-            ticker_data['52_Week_High'] = ticker_data['High'].rolling(window=252, min_periods=1).max()
-            ticker_data['Percent_Diff_From_52_Week_Low'] = (ticker_data['Close'] - ticker_data['52_Week_Low']) / \
-                                                           ticker_data['52_Week_Low'] * 100
-            ticker_data['Percent_Diff_From_52_Week_High'] = (ticker_data['Close'] - ticker_data['52_Week_High']) / \
-                                                            ticker_data['52_Week_High'] * 100
-            # Binary fields for 52 Week Low/High
-            ticker_data['Hit_52_Week_Low'] = (ticker_data['Low'] == ticker_data['52_Week_Low']).astype(int)
-            ticker_data['Hit_52_Week_High'] = (ticker_data['High'] == ticker_data['52_Week_High']).astype(int)
-
-            # Daily Percentage Change in Closing Price
-            ticker_data['Percent_Change'] = ticker_data['Close'].pct_change() * 100
-
-            # Linear Regression on a 5-day rolling basis
-            slopes = []
-            r_squareds = []
-            p_values = []
-
-            for i in range(len(ticker_data)):
-                if i >= 4:  # Start calculating after at least 5 days of data
-                    y = ticker_data['Close'].iloc[i - 4:i + 1].values
-                    x = range(len(y))
-                    regression_result = linregress(x, y)
-                    slopes.append(regression_result.slope)
-                    r_squareds.append(regression_result.rvalue ** 2)
-                    p_values.append(regression_result.pvalue)
-                else:
-                    slopes.append(None)
-                    r_squareds.append(None)
-                    p_values.append(None)
-
-            ticker_data['5_Day_Slope'] = slopes
-            ticker_data['5_Day_R_Squared'] = r_squareds
-            ticker_data['5_Day_P_Value'] = p_values
-
-            all_data.append(ticker_data)
-
-        # Combine all ticker data into one DataFrame
-        self.stock_prices_df = pd.concat(all_data, ignore_index=True)
+        with profiler.span("yf.download (5 years)"):
+            data = yf.download(self.tickers_list, start=five_years_ago, end=today, group_by='ticker')
+        profiler.count("tickers_requested", len(self.tickers_list))
+
+        # Indicators are computed on wide dates x symbols panels, one pass per indicator
+        with profiler.span("indicators (all tickers)"):
+            self.stock_prices_df = compute_indicator_frame(data, self.tickers_list, self.indicators)
+        profiler.count("price_rows", len(self.stock_prices_df))
 
         # Save DataFrame to CSV
-        self.stock_prices_df.to_csv("stock_prices_data.csv", index=False)
+        with profiler.span("to_csv stock_prices_data.csv"):
+            self.stock_prices_df.to_csv("stock_prices_data.csv", index=False)
         print("Stock prices data saved to 'stock_prices_data.csv'")
+        write_output('stock_prices', self.stock_prices_df)
+
+        # Symbol-partitioned copy for out-of-core jobs (backtests over all_us_tickers)
+        store = PriceStore()
+        store.write(self.stock_prices_df)
 
         # Save only the latest available date's data for each ticker
-        latest_data = self.stock_prices_df.sort_values('Date').groupby('Symbol', as_index=False).last()
-        latest_data.to_csv("latest_stock_prices_data.csv", index=False)
+        with profiler.span("latest snapshot"):
+            latest_data = self.stock_prices_df.sort_values('Date').groupby('Symbol', as_index=False).last()
+            latest_data.to_csv("latest_stock_prices_data.csv", index=False)
         print("Latest stock prices data saved to 'latest_stock_prices_data.csv'")
+        write_output('latest_stock_prices', latest_data)
 
+        # Daily Sector/Industry rollups over the whole history, saved next to the prices
+        required_columns = {'Close', '50_Day_MA', 'Percent_Change', 'Hit_52_Week_High', 'Hit_52_Week_Low',
+                            '50_Day_Volume_MA'}
+        if required_columns.issubset(self.stock_prices_df.columns):
+            with profiler.span("sector/industry rollups"):
+                self.rollups = compute_rollups(self.stock_prices_df, self.company_info_df)
+                save_rollups(self.rollups, store)
+
+    @profiler.timed("get_top_movers")
     def get_top_movers(self, date_str):
         # Filter for the selected date
         date_data = self.stock_prices_df[self.stock_prices_df['Date'] == date_str]
@@ -192,10 +157,13 @@ class GetStockData:
             [top_10_risers, top_10_fallers, top_10_closest_to_52_week_low, top_10_closest_to_52_week_high])
 
         # Save to a single CSV file
-        all_top_10_data.to_csv("top_10_stocks_analysis.csv", index=False)
+        with profiler.span("to_csv top_10_stocks_analysis.csv"):
+            all_top_10_data.to_csv("top_10_stocks_analysis.csv", index=False)
 
         print("Data saved to top_10_stocks_analysis.csv with all lists combined.")
+        write_output('top_10_stocks', all_top_10_data)
 
+    @profiler.timed("add_company_info")
     def add_company_info(self, df):
         # Merge the stock DataFrame with the company info based on Symbol
         merged_df = df.merge(self.company_info_df[['Ticker', 'Short Name', 'Sector', 'Industry']],
@@ -210,6 +178,7 @@ class GetStockData:
                 merged_df.at[index, 'Industry'] = info['Industry']
         return merged_df
 
+    @profiler.timed("get_companies_hit_52_week_extremes")
     def get_companies_hit_52_week_extremes(self):
         # Get the last trading day
         last_trading_day = self.stock_prices_df['Date'].max()
@@ -234,39 +203,35 @@ class GetStockData:
 
 def report_profit_or_loss():
     try:
-        df = pd.read_csv(my_stocks_parameter)
-        required_columns = {"ticker", "price", "quantity"}
-        if not required_columns.issubset(df.columns):
-            print(f"CSV file must contain columns: {required_columns}")
-            return
-
-        for index, row in df.iterrows():
-            ticker = str(row["ticker"]).strip().upper()
-            try:
-                buy_price = float(row["price"])
-                quantity = float(row["quantity"])
-            except (ValueError, TypeError):
-                print(f"Skipping invalid row at index {index}: {row}")
-                continue
+        portfolio = Portfolio.from_csv(my_stocks_parameter)
 
+        # One quote per ticker; lots of the same ticker are aggregated at average cost
+        current_prices = {}
+        for ticker in portfolio.tickers:
             try:
-                stock = yf.Ticker(ticker)
-                current_price = stock.info.get("regularMarketPrice")
+                with profiler.span("yf.Ticker.info (market price)"):
+                    stock = yf.Ticker(ticker)
+                    current_price = stock.info.get("regularMarketPrice")
                 if current_price is None:
                     raise ValueError("No market price available")
+                current_prices[ticker] = current_price
             except Exception as e:
                 print(f"{ticker}: Error fetching current price: {e}")
-                continue
-
-            profit_loss = (current_price - buy_price) * quantity
 
-            print(f"{ticker}: Bought at ${buy_price:.2f}, Current ${current_price:.2f}, "
-                    f"Quantity {quantity}, Profit/Loss: ${profit_loss:.2f}")
+        report = portfolio.mark_to_market(current_prices)
+        for _, row in report.dropna(subset=['Price']).iterrows():
+            print(f"{row['ticker']}: Average cost ${row['Average_Cost']:.2f} ({row['Lots']} lots), "
+                  f"Current ${row['Price']:.2f}, Quantity {row['Quantity']}, Profit/Loss: ${row['Profit_Loss']:.2f}")
+            if row['Target_Price'] == row['Target_Price'] and row['Price'] >= row['Target_Price']:
+                print(f"   🔔 Reached desired selling price ${row['Target_Price']:.2f}")
 
     except FileNotFoundError:
-        print(f"File '{filename}' not found.")
+        print(f"File '{my_stocks_parameter}' not found.")
+    except ValueError as e:
+        print(e)
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
+@profiler.timed("get_last_trading_day")
 def get_last_trading_day():
     reference_stock = "AAPL"  # Use Apple as the reference stock
     data = yf.download(reference_stock, period="5d")  # Download the last 5 days of data
@@ -300,11 +265,21 @@ while True:
                                11: 'Get list of recent IPOs (priced and upcoming)',
                                12: 'Get news for a certain ticker or a list of tickers',
                                13: "Show profit/loss on my stocks",
+                               14: 'Turn profiling (timing report) on/off',
+                               15: 'Screen the latest downloaded data with a filter',
+                               16: 'Backtest signal rules on the downloaded data',
+                               17: 'Show return correlations for a list of tickers',
+                               18: 'Stream intraday quotes and profit/loss for my stocks',
+                               19: 'Search collected news',
+                               20: 'Earnings history and price reactions (from collected earnings calendars)',
+                               21: 'Portfolio history, target price alerts and risk for my stocks',
+                               22: 'Save price/MA/MACD charts for downloaded tickers',
                                0: 'Exit'}
 
     dictionary_for_choosing_tickers = {1: 'sp500_tickers', 2: 'sp400_tickers', 3: 'sp600_tickers', 4: 'sp_1500',
                                        5: 'magnificent_seven', 6: 'bitcoin', 7: 'stocks_interest', 8: 'my_stocks',
-                                       9: 'big_list', 10: 'all_us_tickers'}
+                                       9: 'big_list', 10: 'all_us_tickers',
+                                       11: 'custom combination (e.g., sp_1500 | my_stocks - bitcoin)'}
 
     for k, v in main_actions_dictionary.items():
         print(f" {k} - {v}")
@@ -323,7 +298,14 @@ while True:
             for k, v in dictionary_for_choosing_tickers.items():
                 print(f" {k} - {v};")
             tickers = dictionary_for_choosing_tickers[int(input("Your choice: "))]
-            a = GetStockData(tickers)
+            if tickers.startswith('custom'):
+                tickers = input("Combine lists with | (union), & (intersection) and - (difference): ").strip()
+            try:
+                a = GetStockData(tickers)
+            except ValueError as e:
+                # Unknown list name or malformed combination
+                print(e)
+                continue
 
             # Determine the latest trading day based on available data for a reference stock
             last_trading_day = get_last_trading_day()
@@ -335,14 +317,12 @@ while True:
     elif chosen_number == 2 or chosen_number == 5:
         if chosen_number == 2:
             print("Here are the stocks you are interested in:")
-            df = pd.read_csv(stocks_interest_parameter)
-            for ticker in df['ticker'].dropna():
-                print(ticker.strip())
+            watchlist = get_watchlist(stocks_interest_parameter)
         elif chosen_number == 5:
             print("Here are the stocks you are invested in:")
-            df = pd.read_csv(my_stocks_parameter)
-            for ticker in df['ticker'].dropna():
-                print(ticker.strip())
+            watchlist = get_watchlist(my_stocks_parameter)
+        for ticker in watchlist.tickers():
+            print(ticker)
     elif chosen_number == 3 or chosen_number == 6:
         tickers_to_add = input(f"Provide tickers to add to a list: ")
         filename = ""
@@ -350,17 +330,9 @@ while True:
             filename = stocks_interest_parameter
         if chosen_number == 6:
             filename = my_stocks_parameter
-        try:
-            df = pd.read_csv(filename)
-        except FileNotFoundError:
-            df = pd.DataFrame(columns=["ticker"])
-        # Clean and split the input string
-        new_tickers = [ticker.strip().upper() for ticker in tickers_to_add.split(",") if ticker.strip()]
-        # Combine and remove duplicates
-        all_tickers = pd.Series(df["ticker"].tolist() + new_tickers).drop_duplicates().sort_values()
-        # Save back to CSV
-        all_tickers.to_frame(name="ticker").to_csv(filename, index=False)
-        print("Tickers added and file updated.")
+        # Rows already on the list (e.g. lots in My Stocks) are kept, new tickers are added in sorted order
+        added = get_watchlist(filename).add(tickers_to_add)
+        print(f"Tickers added and file updated: {', '.join(added) if added else 'nothing new'}.")
     elif chosen_number == 4 or chosen_number == 7:
         tickers_to_delete = input(f"Provide tickers to delete from a list: ")
         filename = ""
@@ -368,19 +340,10 @@ while True:
             filename = stocks_interest_parameter
         if chosen_number == 7:
             filename = my_stocks_parameter
-        # Load existing tickers
-        df = pd.read_csv(filename)
-        # Clean and split the input string
-        tickers_to_delete_list = [ticker.strip().upper() for ticker in tickers_to_delete.split(",") if ticker.strip()]
-        # Filter out the tickers to be deleted
-        df_filtered = df[~df["ticker"].isin(tickers_to_delete_list)]
-        # Save back to CSV
-        df_filtered.to_csv(filename, index=False)
-        print("Tickers deleted and file updated.")
+        removed = get_watchlist(filename).remove(tickers_to_delete)
+        print(f"Tickers deleted and file updated: {', '.join(removed) if removed else 'none were on the list'}.")
     elif chosen_number == 8:
-        df = pd.read_csv(my_stocks_parameter)
-        empty_df = pd.DataFrame(columns=df.columns)
-        empty_df.to_csv(my_stocks_parameter, index=False)
+        get_watchlist(my_stocks_parameter).clear()
         print("My Stocks list cleared")
     elif chosen_number == 9:
         output_file = 'nasdaq_earnings_calendar.csv'
@@ -420,5 +383,237 @@ while True:
         news.run()
     elif chosen_number == 13:
         report_profit_or_loss()
+    elif chosen_number == 14:
+        if profiler.enabled:
+            profiler.disable()
+            print("Profiling turned off.")
+        else:
+            export_trace = input("Keep a Chrome trace as well? (y/n): ").strip().lower() == 'y'
+            profiler.reset()
+            profiler.enable(trace=export_trace)
+            print("Profiling turned on. A timing report is printed after each action and saved to "
+                  "'profile_summary.json'.")
+        continue
+    elif chosen_number == 15:
+        try:
+            screener = Screener()
+        except FileNotFoundError:
+            print("No downloaded data found. Run option 1 first.")
+            continue
+        print(f"Preset screens: {', '.join(PRESET_SCREENS)}")
+        chosen_screen = input("Provide a preset name or a filter (e.g., Percent_Diff_From_52_Week_Low < 5 and "
+                              "50_Day_MA > 250_Day_MA): ").strip()
+        group_by = input("Group by (Sector, Industry or leave empty): ").strip() or None
+        top_k = input("How many rows (per group) to show? [10]: ").strip()
+        top_k = int(top_k) if top_k.isdigit() else 10
+        try:
+            if chosen_screen in PRESET_SCREENS:
+                result = screener.run_preset(chosen_screen, top_k=top_k, group_by=group_by)
+            else:
+                sort_by = input("Sort by column (leave empty for none): ").strip() or None
+                ascending = input("Ascending order? (y/n): ").strip().lower() == 'y'
+                result = screener.screen(chosen_screen, sort_by=sort_by, ascending=ascending, top_k=top_k,
+                                         group_by=group_by, columns=DEFAULT_COLUMNS)
+        except Exception as e:
+            print(f"Invalid screen: {e}")
+            continue
+        print(result.to_string(index=False))
+    elif chosen_number == 16:
+        store = PriceStore()
+        if not store.partitions():
+            print("No downloaded data found. Run option 1 first.")
+            continue
+        chosen_rules = input(f"Provide rules (comma separated, empty for all: {', '.join(RULES)}): ").strip()
+        rules = [r.strip() for r in chosen_rules.split(",") if r.strip()] or None
+        try:
+            backtester = Backtester(rules=rules)
+        except ValueError as e:
+            print(e)
+            continue
+        summary, equity = backtester.run_store(store)
+        print(summary.to_string(index=False))
+        equity.to_csv("backtest_equity_curves.csv")
+        print("Equity curves saved to 'backtest_equity_curves.csv'")
+    elif chosen_number == 17:
+        store = PriceStore()
+        if not store.partitions():
+            print("No downloaded data found. Run option 1 first.")
+            continue
+        chosen_option = input("Provide a list of tickers (e.g., TSLA,AAPL) or one of the lists "
+                              "(stocks_interest, my_stocks): ").strip()
+        if chosen_option == 'stocks_interest':
+            watchlist = get_watchlist(stocks_interest_parameter).tickers()
+        elif chosen_option == 'my_stocks':
+            watchlist = get_watchlist(my_stocks_parameter).tickers()
+        else:
+            watchlist = [t.strip().upper() for t in chosen_option.split(",") if t.strip()]
+        window = input("Window in trading days (60 or 252) [252]: ").strip()
+        window = int(window) if window.isdigit() else 252
+
+        manifest = store.manifest()
+        known = [t for t in watchlist if t in manifest]
+        missing = [t for t in watchlist if t not in manifest]
+        if missing:
+            print(f"No downloaded data for: {', '.join(missing)}")
+        if not known:
+            continue
+
+        # Watchlist x watchlist matrix only, from the watchlist's own return columns
+        dates, symbols, returns = load_returns(store, symbols=known)
+        covariance, correlation = rolling_matrices(returns, window)
+        matrix = pd.DataFrame(correlation, index=symbols, columns=symbols)
+        print(f"\nCorrelation of daily returns over the last {window} trading days:")
+        print(matrix.round(2).to_string())
+
+        # "Most correlated to X" comes from the saved top-k index; the full N x N build runs only on request
+        index_file = f"correlation_top_k_{window}.csv"
+        index = None
+        if input("Rebuild the top-k index over all downloaded tickers (slow for big stores)? (y/n): "
+                 ).strip().lower() == 'y':
+            all_dates, all_symbols, all_returns = load_returns(store)
+            index = CorrelationIndex.build(rolling_matrices(all_returns, window)[1], all_symbols, k=20)
+            index.save(index_file)
+        elif os.path.isfile(index_file):
+            index = CorrelationIndex.load(index_file)
+        all_returns = None
+        for ticker in known:
+            print(f"\nMost correlated to {ticker}:")
+            if index is not None and ticker in index.position:
+                print(index.most_correlated(ticker, 5).to_string(index=False))
+            else:
+                # Not indexed: one O(window * n) pass against every stored ticker
+                if all_returns is None:
+                    all_dates, all_symbols, all_returns = load_returns(store)
+                print(correlated_with(all_returns, all_symbols, ticker, window=window, k=5).to_string(index=False))
+    elif chosen_number == 18:
+        try:
+            positions = pd.read_csv(my_stocks_parameter)
+        except FileNotFoundError:
+            positions = pd.DataFrame(columns=["ticker", "price", "quantity"])
+        # Local watchlists only; Tickers() would download the SEC list just to read them
+        watchlist = get_watchlist(my_stocks_parameter).tickers() + get_watchlist(stocks_interest_parameter).tickers()
+        session = StreamingSession(watchlist, positions=positions)
+        replay_file = input("Replay a recorded feed file (leave empty to poll live quotes): ").strip()
+        try:
+            if replay_file:
+                session.run(ReplayFeed(replay_file))
+                session.flush()
+                print(session.snapshot().to_string(index=False))
+            else:
+                print("Polling quotes every minute, press Ctrl+C to stop. Ticks are recorded to 'recorded_ticks.csv'.")
+                poller = YahooQuotePoller(session.symbols, interval=60)
+                while True:
+                    for timestamp, symbol, price, size in record_feed(poller.poll(), "recorded_ticks.csv",
+                                                                      append=True):
+                        session.on_tick(timestamp, symbol, price, size)
+                    print(session.snapshot().to_string(index=False))
+                    time.sleep(poller.interval)
+        except KeyboardInterrupt:
+            print("\nStreaming stopped.")
+            print(session.snapshot().to_string(index=False))
+        except FileNotFoundError:
+            print(f"File '{replay_file}' not found.")
+    elif chosen_number == 19:
+        chosen_tickers = input("Tickers (e.g., NVDA,AMD or leave empty): ").strip()
+        chosen_publisher = input("Publisher (e.g., Reuters or leave empty): ").strip() or None
+        chosen_days = input("Only the last N days (leave empty for all): ").strip()
+        chosen_text = input("Words to search for in title/summary (leave empty for any): ").strip() or None
+        store = NewsStore()
+        try:
+            results = store.query(tickers=[t for t in chosen_tickers.split(",") if t.strip()] or None,
+                                  publisher=chosen_publisher,
+                                  days=int(chosen_days) if chosen_days.isdigit() else None,
+                                  text=chosen_text)
+        except Exception as e:
+            print(f"Invalid search: {e}")
+            results = None
+        finally:
+            store.close()
+        if results is not None:
+            print(f"Found {len(results)} articles:")
+            for _, article in results.iterrows():
+                print(f"[{article['Published At']}] {article['Tickers']} | {article['Publisher']}")
+                print(f"   🗞️ Title: {article['Title']}")
+    elif chosen_number == 20:
+        warehouse = EarningsWarehouse()
+        chosen_option = input("Provide a ticker, a date to see that week, or leave empty for all: ").strip()
+        try:
+            if not chosen_option:
+                events = warehouse.load()
+            elif chosen_option[0].isdigit():
+                events = warehouse.lookup(week_of=chosen_option)
+            else:
+                events = warehouse.lookup(symbol=chosen_option)
+        except ValueError as e:
+            print(f"Invalid input: {e}")
+            continue
+        if events.empty:
+            print("No earnings found. Collect calendars with option 9 first.")
+            continue
+        store = PriceStore()
+        if store.partitions():
+            reactions = reactions_from_store(warehouse, store, symbols=list(events['symbol'].unique()))
+            events = events.merge(reactions[['symbol', 'earnings_date', 'Pre_Move_%', 'Reaction_%', 'Post_Drift_%',
+                                             'Volume_Spike']], on=['symbol', 'earnings_date'], how='left')
+        columns = [c for c in ['symbol', 'name', 'earnings_date', 'time', 'Pre_Move_%', 'Reaction_%', 'Post_Drift_%',
+                               'Volume_Spike'] if c in events.columns]
+        print(events[columns].sort_values('earnings_date').to_string(index=False))
+    elif chosen_number == 21:
+        try:
+            portfolio = Portfolio.from_csv(my_stocks_parameter).load_prices()
+        except FileNotFoundError:
+            print(f"File '{my_stocks_parameter}' not found.")
+            continue
+        except ValueError as e:
+            print(e)
+            continue
+        report = portfolio.mark_to_market()
+        print(f"Positions at the latest stored close ({portfolio.dates[-1]:%Y-%m-%d}):")
+        print(report.round(2).to_string(index=False))
+
+        curve, per_position = portfolio.history()
+        curve.to_csv("portfolio_history.csv")
+        per_position.to_csv("portfolio_position_history.csv")
+        print("Daily portfolio history saved to 'portfolio_history.csv' and 'portfolio_position_history.csv'")
+
+        print("\nRisk (annualized volatility, drawdowns in %):")
+        print(portfolio.risk_metrics().round(2).to_string(index=False))
+
+        alerts = portfolio.target_alerts()
+        if alerts.empty:
+            print("\nNo lot has reached its desired selling price.")
+        else:
+            print("\n🔔 Lots at or above their desired selling price:")
+            print(alerts[['ticker', 'price', 'quantity', 'desired_selling_price', 'Latest_Close',
+                          'Profit_Loss_At_Target', 'First_Reached']].round(2).to_string(index=False))
+    elif chosen_number == 22:
+        store = PriceStore()
+        if not store.partitions():
+            print("No downloaded data found. Run option 1 first.")
+            continue
+        chosen_option = input("Provide a list of tickers (e.g., TSLA,AAPL), one of the lists "
+                              "(stocks_interest, my_stocks) or leave empty for all downloaded tickers: ").strip()
+        if chosen_option == 'stocks_interest':
+            chart_tickers = get_watchlist(stocks_interest_parameter).tickers()
+        elif chosen_option == 'my_stocks':
+            chart_tickers = get_watchlist(my_stocks_parameter).tickers()
+        elif chosen_option:
+            chart_tickers = [t.strip().upper() for t in chosen_option.split(",") if t.strip()]
+        else:
+            chart_tickers = None
+        if chart_tickers is not None:
+            manifest = store.manifest()
+            missing = [t for t in chart_tickers if t not in manifest]
+            if missing:
+                print(f"No downloaded data for: {', '.join(missing)}")
+        render_charts(chart_tickers, store)
     else:
-        print("Invalid option. Please choose from the list.")
\ No newline at end of file
+        print("Invalid option. Please choose from the list.")
+
+    if profiler.enabled:
+        profiler.print_report()
+        if profiler.spans or profiler.counters:
+            profiler.export_json("profile_summary.json")
+        if profiler.trace:
+            profiler.export_chrome_trace("profile_trace.json")
+        profiler.reset()
\ No newline at end of file
@@ -6,6 +6,9 @@ from datetime import datetime, timedelta
 from tickers import Tickers
 import time
 import calendar
+from profiling import profiler
+from earnings_warehouse import EarningsWarehouse
+from db_sink import write_output
 class NasdaqEarningsScraper:
     def __init__(self, date_input=None):
         self.date_input = date_input or "today"
@@ -90,7 +93,9 @@ class NasdaqEarningsScraper:
 
         for date in date_list:
             payload = {"date": date}
-            response = requests.get(url=self.url, headers=self.headers, params=payload, verify=True)
+            with profiler.span("requests.get Nasdaq earnings"):
+                response = requests.get(url=self.url, headers=self.headers, params=payload, verify=True)
+            profiler.count("nasdaq_earnings_requests")
 
             if response.status_code == 200:
                 try:
@@ -110,10 +115,12 @@ class NasdaqEarningsScraper:
 
         return all_data
 
+    @profiler.timed("earnings enrich_data")
     def enrich_data(self, earnings_data):
-        sp500_tickers = self.tickers.get_tickers_list('sp500_tickers')
-        sp400_tickers = self.tickers.get_tickers_list('sp400_tickers')
-        sp600_tickers = self.tickers.get_tickers_list('sp600_tickers')
+        # Bitset universes: membership is a dictionary lookup plus a bit test instead of a list scan
+        sp500_tickers = self.tickers.get_universe('sp500_tickers')
+        sp400_tickers = self.tickers.get_universe('sp400_tickers')
+        sp600_tickers = self.tickers.get_universe('sp600_tickers')
 
         for entry in earnings_data:
             ticker = entry.get('symbol', '')  # Adjust 'symbol' if your API uses a different key
@@ -146,6 +153,9 @@ class NasdaqEarningsScraper:
             df = pd.DataFrame(enriched_data)
             df.to_csv(output_file, index=False)
             print(f"Earnings data saved to {output_file}")
+            # Keep the history across runs as well
+            EarningsWarehouse().add(df)
+            write_output('earnings', df)
         else:
             print("No data to save.")
 
@@ -3,6 +3,8 @@ import requests
 from datetime import datetime
 import yfinance as yf
 import time
+from profiling import profiler
+from db_sink import write_output
 
 
 class NasdaqIPOScraper:
@@ -26,7 +28,8 @@ class NasdaqIPOScraper:
             if not ticker or not isinstance(ticker, str):
                 continue
             try:
-                info = yf.Ticker(ticker).info
+                with profiler.span("yf.Ticker.info (IPO enrich)"):
+                    info = yf.Ticker(ticker).info
                 row['sector'] = info.get('sector')
                 row['industry'] = info.get('industry')
                 row['country'] = info.get('country')
@@ -69,11 +72,13 @@ class NasdaqIPOScraper:
         dfs = []
 
         for period in periods:
-            response = requests.get(
-                self.ipo_url,
-                headers=self.headers,
-                params={'date': str(period)}
-            )
+            with profiler.span("requests.get Nasdaq IPOs"):
+                response = requests.get(
+                    self.ipo_url,
+                    headers=self.headers,
+                    params={'date': str(period)}
+                )
+            profiler.count("nasdaq_ipo_requests")
 
             if response.status_code != 200:
                 print(f"Failed to fetch data for {period}: {response.status_code}")
@@ -121,6 +126,7 @@ class NasdaqIPOScraper:
 
         combined = pd.concat([df_priced, df_upcoming], ignore_index=True)
         combined.to_csv("nasdaq_ipos_combined.csv", index=False)
+        write_output('ipos', combined)
 
         # ----- Formatted Preview -----
         columns_to_show = [
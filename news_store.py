@@ -0,0 +1,262 @@
+import hashlib
+import re
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from profiling import profiler
+
+_WORD = re.compile(r"[\w']+")
+
+
+def simhash(text, bits=64):
+    """
+    SimHash fingerprint of a text over 3-word shingles (single words for very short texts).
+
+    Near-identical texts (a reworded headline, a trimmed summary) end up a few bits apart. Returns None for
+    texts without any words, which must not be matched as near-duplicates of each other.
+    """
+    words = _WORD.findall(text.lower())
+    shingles = [" ".join(words[i:i + 3]) for i in range(len(words) - 2)] or words
+    if not shingles:
+        return None
+    hashes = np.array([int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=bits // 8).digest(), "big")
+                       for s in shingles], dtype=np.uint64)
+    # Per bit: +1 for every shingle hash with the bit set, -1 otherwise
+    set_bits = (hashes[:, None] >> np.arange(bits, dtype=np.uint64)) & np.uint64(1)
+    majority = set_bits.sum(axis=0) * 2 > len(shingles)
+    return sum(1 << bit for bit in np.flatnonzero(majority).tolist())
+
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count("1")
+
+
+class NearDuplicateIndex:
+    """
+    Finds fingerprints within `max_distance` bits of an indexed one.
+
+    The 64-bit fingerprint is cut into max_distance + 1 bands; two fingerprints that close must agree on
+    at least one whole band, so only same-band candidates are compared.
+    """
+
+    def __init__(self, max_distance=3, bits=64):
+        self.max_distance = max_distance
+        self.n_bands = max_distance + 1
+        self.band_bits = bits // self.n_bands
+        self.mask = (1 << self.band_bits) - 1
+        self.buckets = [{} for _ in range(self.n_bands)]
+
+    def _bands(self, fingerprint):
+        return [(fingerprint >> (band * self.band_bits)) & self.mask for band in range(self.n_bands)]
+
+    def find(self, fingerprint):
+        for band, key in enumerate(self._bands(fingerprint)):
+            for candidate, item in self.buckets[band].get(key, ()):
+                if hamming_distance(candidate, fingerprint) <= self.max_distance:
+                    return item
+        return None
+
+    def add(self, fingerprint, item):
+        for band, key in enumerate(self._bands(fingerprint)):
+            self.buckets[band].setdefault(key, []).append((fingerprint, item))
+
+
+def article_text(title, summary):
+    return f"{title or ''} {summary or ''}".strip()
+
+
+def article_key(article):
+    # Fixed-length id of a yfinance article (hash of its uid, which falls back to link, then title + time)
+    return hashlib.sha1(NewsStore.normalize(article)["uid"].encode("utf-8")).hexdigest()
+
+
+def _to_signed(value):
+    # SQLite integers are signed 64-bit
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _to_unsigned(value):
+    return value + (1 << 64) if value < 0 else value
+
+
+class NewsStore:
+    """
+    Persistent local news store (SQLite) with:
+    - an FTS5 full-text index over title and summary,
+    - a ticker -> article posting list ordered by publish time,
+    - a publish-time index (also per publisher),
+    - SimHash near-duplicate detection at ingestion.
+    """
+
+    def __init__(self, filename="news_store.db", max_distance=3):
+        self.filename = filename
+        self.connection = sqlite3.connect(filename)
+        self._create_schema()
+        self.near_duplicates = NearDuplicateIndex(max_distance)
+        self.uids = {}
+        for article_id, uid, fingerprint in self.connection.execute("SELECT id, uid, simhash FROM articles"):
+            if fingerprint is not None:
+                self.near_duplicates.add(_to_unsigned(fingerprint), article_id)
+            self.uids[uid] = article_id
+
+    def _create_schema(self):
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                uid TEXT UNIQUE,
+                title TEXT,
+                summary TEXT,
+                publisher TEXT COLLATE NOCASE,
+                published_at TEXT,
+                link TEXT,
+                simhash INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS idx_articles_published ON articles(published_at);
+            CREATE INDEX IF NOT EXISTS idx_articles_publisher ON articles(publisher, published_at);
+            CREATE TABLE IF NOT EXISTS article_tickers (
+                ticker TEXT,
+                published_at TEXT,
+                article_id INTEGER,
+                PRIMARY KEY (ticker, published_at, article_id)
+            ) WITHOUT ROWID;
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                title, summary, content='articles', content_rowid='id'
+            );
+        """)
+
+    def close(self):
+        self.connection.close()
+
+    @staticmethod
+    def normalize(article):
+        # Accepts the yfinance news dicts collected by GetNews
+        content = article.get("content", {}) or {}
+        published = article.get("datetime_obj")
+        if published is None and content.get("pubDate"):
+            published = datetime.strptime(content["pubDate"], '%Y-%m-%dT%H:%M:%SZ')
+        link = (content.get("clickThroughUrl") or {}).get("url") or (content.get("canonicalUrl") or {}).get("url")
+        title = (content.get("title") or "").strip()
+        summary = (content.get("summary") or "").strip()
+        return {
+            "uid": article.get("id") or content.get("id") or link or f"{title}|{published}",
+            "title": title,
+            "summary": summary,
+            "publisher": (content.get("provider") or {}).get("displayName", "").strip(),
+            "published_at": published.strftime('%Y-%m-%d %H:%M:%S') if published else None,
+            "link": link,
+            "tickers": sorted({t.strip().upper() for t in article.get("tickers", []) if t and t.strip()}),
+        }
+
+    def ingest(self, articles):
+        """
+        Bulk-inserts articles in one transaction. Exact repeats (same id/link) and near-duplicates only add
+        their tickers to the article already stored.
+
+        Returns:
+            dict: inserted, duplicates, seconds and articles_per_second for the batch.
+        """
+        start = time.perf_counter()
+        next_id = (self.connection.execute("SELECT COALESCE(MAX(id), 0) FROM articles").fetchone()[0]) + 1
+        article_rows, ticker_rows, fts_rows = [], [], []
+        published_of = {}
+        duplicates = 0
+
+        with profiler.span("news store ingest"):
+            for article in articles:
+                item = self.normalize(article)
+                if not item["published_at"]:
+                    continue
+                fingerprint = simhash(article_text(item["title"], item["summary"]))
+                # Exact repeats by uid; near-duplicates only for texts that have a fingerprint
+                existing = self.uids.get(item["uid"])
+                if existing is None and fingerprint is not None:
+                    existing = self.near_duplicates.find(fingerprint)
+                if existing is not None:
+                    duplicates += 1
+                    article_id = existing
+                else:
+                    article_id = next_id
+                    next_id += 1
+                    self.uids[item["uid"]] = article_id
+                    if fingerprint is not None:
+                        self.near_duplicates.add(fingerprint, article_id)
+                    published_of[article_id] = item["published_at"]
+                    article_rows.append((article_id, item["uid"], item["title"], item["summary"], item["publisher"],
+                                         item["published_at"], item["link"],
+                                         None if fingerprint is None else _to_signed(fingerprint)))
+                    fts_rows.append((article_id, item["title"], item["summary"]))
+                published_at = published_of.get(article_id)
+                if published_at is None:
+                    published_at = self.connection.execute("SELECT published_at FROM articles WHERE id = ?",
+                                                           (article_id,)).fetchone()[0]
+                    published_of[article_id] = published_at
+                ticker_rows.extend((ticker, published_at, article_id) for ticker in item["tickers"])
+
+            with self.connection:
+                self.connection.executemany("INSERT INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?)", article_rows)
+                self.connection.executemany("INSERT OR IGNORE INTO article_tickers VALUES (?, ?, ?)", ticker_rows)
+                self.connection.executemany("INSERT INTO articles_fts (rowid, title, summary) VALUES (?, ?, ?)",
+                                            fts_rows)
+
+        seconds = time.perf_counter() - start
+        total = len(article_rows) + duplicates
+        profiler.count("news_articles_ingested", len(article_rows))
+        return {"inserted": len(article_rows), "duplicates": duplicates, "seconds": seconds,
+                "articles_per_second": total / seconds if seconds > 0 else float("inf")}
+
+    def query(self, tickers=None, publisher=None, days=None, since=None, until=None, text=None, limit=100):
+        """
+        Searches the store, newest first, e.g.
+        query(tickers=['NVDA'], publisher='Reuters', days=7, text='guidance').
+
+        `text` uses FTS5 syntax (words, "exact phrases", OR, prefix*).
+        """
+        if days is not None:
+            since = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days)
+        since = since.strftime('%Y-%m-%d %H:%M:%S') if isinstance(since, datetime) else since
+        until = until.strftime('%Y-%m-%d %H:%M:%S') if isinstance(until, datetime) else until
+
+        conditions, params = [], []
+        if tickers:
+            tickers = [t.strip().upper() for t in tickers]
+            posting = "SELECT article_id FROM article_tickers WHERE ticker IN (" + ",".join("?" * len(tickers)) + ")"
+            params.extend(tickers)
+            if since:
+                posting += " AND published_at >= ?"
+                params.append(since)
+            conditions.append(f"a.id IN ({posting})")
+        if text:
+            conditions.append("a.id IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)")
+            params.append(text)
+        if publisher:
+            conditions.append("a.publisher = ?")
+            params.append(publisher)
+        if since:
+            conditions.append("a.published_at >= ?")
+            params.append(since)
+        if until:
+            conditions.append("a.published_at <= ?")
+            params.append(until)
+
+        sql = """
+            SELECT a.published_at AS "Published At", a.publisher AS "Publisher", a.title AS "Title",
+                   a.summary AS "Summary", a.link AS "Link",
+                   (SELECT group_concat(ticker, ', ') FROM article_tickers t WHERE t.article_id = a.id) AS "Tickers"
+            FROM articles a
+        """
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY a.published_at DESC LIMIT ?"
+        params.append(limit)
+        with profiler.span("news store query"):
+            return pd.read_sql_query(sql, self.connection, params=params)
+
+
+# Example usage
+if __name__ == "__main__":
+    store = NewsStore()
+    print(store.query(tickers=["NVDA"], publisher="Reuters", days=7, text="guidance"))
@@ -0,0 +1,229 @@
+import numpy as np
+import pandas as pd
+
+from profiling import profiler
+from price_store import PriceStore, frame_to_panels
+
+TRADING_DAYS = 252
+
+
+def load_lots(filename="my_stocks.csv"):
+    """
+    Reads the lots file (ticker, price, quantity, desired_selling_price; one row per purchase) and
+    drops rows whose price or quantity is not numeric.
+    """
+    lots = pd.read_csv(filename)
+    required_columns = {"ticker", "price", "quantity"}
+    if not required_columns.issubset(lots.columns):
+        raise ValueError(f"CSV file must contain columns: {required_columns}")
+    return clean_lots(lots)
+
+
+def clean_lots(lots):
+    lots = lots.dropna(subset=['ticker']).copy()
+    lots['ticker'] = lots['ticker'].astype(str).str.strip().str.upper()
+    lots['price'] = pd.to_numeric(lots['price'], errors='coerce')
+    lots['quantity'] = pd.to_numeric(lots['quantity'], errors='coerce')
+    if 'desired_selling_price' not in lots.columns:
+        lots['desired_selling_price'] = np.nan
+    lots['desired_selling_price'] = pd.to_numeric(lots['desired_selling_price'], errors='coerce')
+    invalid = lots['price'].isna() | lots['quantity'].isna()
+    for index in lots.index[invalid]:
+        print(f"Skipping invalid row at index {index}: {lots.loc[index, 'ticker']}")
+    return lots[~invalid].reset_index(drop=True)
+
+
+def aggregate_lots(lots):
+    """
+    Collapses lots into one position per ticker.
+
+    Returns:
+        DataFrame: ticker, Lots, Quantity, Cost_Basis, Average_Cost and Target_Price (the lowest
+        desired_selling_price set on any lot of the ticker).
+    """
+    lots = lots.assign(cost=lots['price'] * lots['quantity'])
+    positions = lots.groupby('ticker', sort=True).agg(Lots=('quantity', 'size'), Quantity=('quantity', 'sum'),
+                                                      Cost_Basis=('cost', 'sum'),
+                                                      Target_Price=('desired_selling_price', 'min'))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        positions['Average_Cost'] = positions['Cost_Basis'] / positions['Quantity']
+    return positions.reset_index()[['ticker', 'Lots', 'Quantity', 'Cost_Basis', 'Average_Cost', 'Target_Price']]
+
+
+def max_drawdown(values):
+    """
+    Drawdown of every column of a dates x series array from its running peak.
+
+    Returns:
+        tuple: (drawdown array in %, max drawdown per column in %)
+    """
+    peaks = np.fmax.accumulate(values, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        drawdown = (values / peaks - 1) * 100
+    return drawdown, np.nanmin(np.where(np.isnan(drawdown), np.inf, drawdown), axis=0)
+
+
+def chained_returns(close, quantity):
+    """
+    Daily returns of a fixed-quantity portfolio, counting only positions priced on both days, so a ticker
+    whose history starts later does not show up as a jump in value.
+    """
+    previous, current = close[:-1], close[1:]
+    both = ~np.isnan(previous) & ~np.isnan(current)
+    change = np.where(both, current - previous, 0.0) @ quantity
+    base = np.where(both, previous, 0.0) @ quantity
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(base > 0, change / base, np.nan)
+
+
+def returns_index(returns):
+    # Growth of 1 from chained daily returns, starting at 1 on the first date
+    return np.concatenate([[1.0], np.cumprod(1 + np.nan_to_num(returns))])
+
+
+class Portfolio:
+    """
+    Lot-level portfolio analytics: positions with average cost, historical mark-to-market P/L, target
+    price alerts and risk metrics.
+
+    Histories value today's holdings over the whole price history (the lots file has no purchase dates),
+    as one dates x positions product over a forward-filled close panel.
+    """
+
+    def __init__(self, lots):
+        self.lots = clean_lots(lots)
+        self.positions = aggregate_lots(self.lots)
+        self.dates = None
+        self.close = None
+
+    @classmethod
+    def from_csv(cls, filename="my_stocks.csv"):
+        return cls(load_lots(filename))
+
+    @property
+    def tickers(self):
+        return self.positions['ticker'].tolist()
+
+    def load_prices(self, stock_prices_df=None, store=None):
+        # Close history for the held tickers, from a price frame or (by default) the price store
+        if stock_prices_df is None:
+            stock_prices_df = (store or PriceStore()).load(symbols=self.tickers, columns=['Close'])
+        stock_prices_df = stock_prices_df[stock_prices_df['Symbol'].isin(self.tickers)]
+        if stock_prices_df.empty:
+            raise ValueError("No stored price history for any position. Download data for these tickers first.")
+        with profiler.span("portfolio prices"):
+            dates, _, panels = frame_to_panels(stock_prices_df, ['Close'], symbols=self.tickers)
+            close = pd.DataFrame(panels['Close']).ffill().to_numpy()
+        self.dates = pd.to_datetime(dates)
+        self.close = close
+        missing = [t for t, has_data in zip(self.tickers, ~np.isnan(close).all(axis=0)) if not has_data]
+        if missing:
+            print(f"No price history for: {', '.join(missing)}")
+        return self
+
+    def _require_prices(self):
+        if self.close is None:
+            self.load_prices()
+
+    def latest_prices(self):
+        self._require_prices()
+        return self.close[-1]
+
+    def mark_to_market(self, current_prices=None):
+        """
+        Current value and P/L per position, at the latest stored close or at `current_prices`
+        (dict ticker -> price, e.g. live quotes).
+        """
+        if current_prices is None:
+            prices = self.latest_prices()
+        else:
+            prices = self.positions['ticker'].map(current_prices).to_numpy(dtype=float)
+        report = self.positions.copy()
+        report['Price'] = prices
+        report['Market_Value'] = prices * report['Quantity']
+        report['Profit_Loss'] = report['Market_Value'] - report['Cost_Basis']
+        with np.errstate(invalid='ignore', divide='ignore'):
+            report['Return_%'] = report['Profit_Loss'] / report['Cost_Basis'] * 100
+            report['Distance_To_Target_%'] = (report['Target_Price'] / prices - 1) * 100
+        return report
+
+    def history(self):
+        """
+        Daily mark-to-market history.
+
+        Returns:
+            tuple: (DataFrame of total Market_Value, Cost_Basis, Profit_Loss, Return_% and Drawdown_% per date,
+            DataFrame of Profit_Loss per date x ticker)
+        """
+        self._require_prices()
+        quantity = self.positions['Quantity'].to_numpy(dtype=float)
+        cost = self.positions['Cost_Basis'].to_numpy(dtype=float)
+        with profiler.span("portfolio mark-to-market"):
+            held = ~np.isnan(self.close)
+            values = np.where(held, self.close, 0.0) * quantity
+            # Positions only count towards the cost basis once they have a price
+            costs = held * cost
+            profit_loss = values - costs
+            total_value = values.sum(axis=1)
+            total_cost = costs.sum(axis=1)
+            curve = pd.DataFrame({'Market_Value': total_value, 'Cost_Basis': total_cost,
+                                  'Profit_Loss': total_value - total_cost}, index=self.dates)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                curve['Return_%'] = curve['Profit_Loss'] / curve['Cost_Basis'] * 100
+            curve['Drawdown_%'] = max_drawdown(returns_index(chained_returns(self.close, quantity))[:, None])[0][:, 0]
+        curve.index.name = 'Date'
+        per_position = pd.DataFrame(np.where(held, profit_loss, np.nan), index=self.dates, columns=self.tickers)
+        per_position.index.name = 'Date'
+        return curve, per_position
+
+    def target_alerts(self):
+        """
+        Lots whose desired_selling_price has been reached by the latest close, with the first date in the
+        stored history the close was at or above it.
+        """
+        self._require_prices()
+        lots = self.lots.dropna(subset=['desired_selling_price']).copy()
+        if lots.empty:
+            return lots.iloc[0:0]
+        column = {ticker: i for i, ticker in enumerate(self.tickers)}
+        cols = lots['ticker'].map(column).to_numpy()
+        targets = lots['desired_selling_price'].to_numpy(dtype=float)
+        with profiler.span("portfolio target alerts"):
+            # dates x lots comparison; the first True row is the first close at/above the target
+            reached = self.close[:, cols] >= targets
+            latest = self.close[-1, cols]
+            first = np.where(reached.any(axis=0), reached.argmax(axis=0), -1)
+        lots['Latest_Close'] = latest
+        lots['Profit_Loss_At_Target'] = (targets - lots['price'].to_numpy()) * lots['quantity'].to_numpy()
+        lots['First_Reached'] = pd.NaT
+        hit = first >= 0
+        lots.loc[hit, 'First_Reached'] = self.dates[first[hit]]
+        return lots[latest >= targets].reset_index(drop=True)
+
+    def risk_metrics(self):
+        """
+        Annualized volatility of daily returns, max drawdown and current drawdown for every position and
+        for the whole portfolio (last row, ticker 'PORTFOLIO', from chained_returns).
+        """
+        self._require_prices()
+        quantity = self.positions['Quantity'].to_numpy(dtype=float)
+        with profiler.span("portfolio risk metrics"):
+            portfolio_returns = chained_returns(self.close, quantity)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                returns = np.column_stack([self.close[1:] / self.close[:-1] - 1, portfolio_returns])
+            volatility = pd.DataFrame(returns).std().to_numpy() * np.sqrt(TRADING_DAYS) * 100
+            values = np.column_stack([self.close, returns_index(portfolio_returns)])
+            drawdown, worst = max_drawdown(values)
+            current = drawdown[-1]
+        return pd.DataFrame({'ticker': self.tickers + ['PORTFOLIO'],
+                             'Volatility_%': volatility,
+                             'Max_Drawdown_%': np.where(np.isinf(worst), np.nan, worst),
+                             'Current_Drawdown_%': current})
+
+
+# Example usage
+if __name__ == "__main__":
+    portfolio = Portfolio.from_csv("my_stocks.csv").load_prices()
+    print(portfolio.mark_to_market().to_string(index=False))
+    print(portfolio.risk_metrics().to_string(index=False))
+    print(portfolio.target_alerts().to_string(index=False))
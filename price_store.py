@@ -0,0 +1,123 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from profiling import profiler
+
+
+class PriceStore:
+    """
+    Price/indicator history split into symbol partitions, so large universes (all_us_tickers) can be
+    processed one partition at a time instead of loading one huge CSV.
+
+    Layout: <directory>/part-00000.csv, part-00001.csv, ... plus manifest.json mapping symbol -> partition.
+    """
+
+    def __init__(self, directory="price_store", partition_size=500):
+        self.directory = directory
+        self.partition_size = partition_size
+        self.manifest_file = os.path.join(directory, "manifest.json")
+
+    def write(self, stock_prices_df):
+        """
+        Adds or replaces the history of every symbol in `stock_prices_df`. Symbols already in the store
+        keep their partition and have their rows replaced; new symbols fill the last partition and then new
+        ones. Only partitions holding one of the symbols are rewritten, the rest of the store is untouched.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        manifest = self.manifest()
+        symbols = list(pd.unique(stock_prices_df['Symbol']))
+
+        sizes = {}
+        for filename in manifest.values():
+            sizes[filename] = sizes.get(filename, 0) + 1
+        last = max(sizes, default=None)
+        next_part = int(last[5:10]) + 1 if last else 0
+        for symbol in symbols:
+            if symbol in manifest:
+                continue
+            if last is None or sizes[last] >= self.partition_size:
+                last = f"part-{next_part:05d}.csv"
+                next_part += 1
+                sizes[last] = 0
+            manifest[symbol] = last
+            sizes[last] += 1
+
+        by_partition = {}
+        for symbol in symbols:
+            by_partition.setdefault(manifest[symbol], []).append(symbol)
+        with profiler.span("price store write"):
+            for filename, partition_symbols in sorted(by_partition.items()):
+                path = os.path.join(self.directory, filename)
+                df = stock_prices_df[stock_prices_df['Symbol'].isin(partition_symbols)]
+                if os.path.exists(path):
+                    kept = self._read(path)
+                    kept = kept[~kept['Symbol'].isin(partition_symbols)]
+                    if not kept.empty:
+                        df = pd.concat([kept, df], ignore_index=True)
+                df.to_csv(path, index=False)
+
+        with open(self.manifest_file, "w", encoding="utf-8") as file:
+            json.dump(manifest, file)
+        print(f"Price store saved to '{self.directory}' ({len(by_partition)} of "
+              f"{len(set(manifest.values()))} partitions updated)")
+
+    def manifest(self):
+        try:
+            with open(self.manifest_file, encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def symbols(self):
+        return list(self.manifest())
+
+    def partitions(self):
+        files = sorted(set(self.manifest().values()))
+        return [os.path.join(self.directory, filename) for filename in files]
+
+    def _read(self, filename, columns=None):
+        usecols = None if columns is None else list(dict.fromkeys(['Date', 'Symbol'] + list(columns)))
+        with profiler.span("price store read"):
+            return pd.read_csv(filename, usecols=usecols, parse_dates=['Date'])
+
+    def iter_partitions(self, columns=None):
+        for filename in self.partitions():
+            yield self._read(filename, columns)
+
+    def load(self, symbols=None, columns=None):
+        if symbols is None:
+            files = self.partitions()
+        else:
+            manifest = self.manifest()
+            files = [os.path.join(self.directory, f) for f in sorted({manifest[s] for s in symbols if s in manifest})]
+        if not files:
+            return pd.DataFrame(columns=['Date', 'Symbol'] + list(columns or []))
+        df = pd.concat([self._read(filename, columns) for filename in files], ignore_index=True)
+        if symbols is not None:
+            df = df[df['Symbol'].isin(symbols)].reset_index(drop=True)
+        return df
+
+
+def frame_to_panels(stock_prices_df, columns, symbols=None):
+    """
+    Pivots a long (Date, Symbol, ...) frame into wide dates x symbols panels.
+
+    Returns:
+        tuple: (sorted dates array, list of symbols, dict column -> 2-D float array)
+    """
+    if symbols is None:
+        symbols = list(pd.unique(stock_prices_df['Symbol']))
+    present = [column for column in columns if column in stock_prices_df.columns]
+    wide = stock_prices_df.drop_duplicates(subset=['Date', 'Symbol'], keep='last') \
+                          .set_index(['Date', 'Symbol'])[present].unstack('Symbol').sort_index()
+    dates = wide.index.to_numpy()
+    panels = {}
+    for column in columns:
+        if column in present:
+            panels[column] = wide[column].reindex(columns=symbols).to_numpy(dtype=float)
+        else:
+            panels[column] = np.full((len(dates), len(symbols)), np.nan)
+    return dates, symbols, panels
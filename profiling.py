@@ -0,0 +1,166 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+import pandas as pd
+
+
+class _NullSpan:
+    # Shared do-nothing context manager handed out while profiling is off
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    """
+    Lightweight timing spans and counters for the network calls and compute stages.
+
+    Profiling is off by default. Turn it on with the STOCKS_PROFILE environment variable
+    ("1" for the summary table, "trace" to also keep events for a Chrome trace export)
+    or at runtime with enable()/disable().
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace = False
+        self._lock = threading.Lock()
+        self.reset()
+
+        mode = os.environ.get("STOCKS_PROFILE", "").strip().lower()
+        if mode in ("1", "true", "on", "yes"):
+            self.enable()
+        elif mode == "trace":
+            self.enable(trace=True)
+
+    def enable(self, trace=False):
+        self.enabled = True
+        self.trace = trace
+
+    def disable(self):
+        self.enabled = False
+        self.trace = False
+
+    def reset(self):
+        self._origin = time.perf_counter()
+        # name -> [calls, total, min, max] in seconds
+        self.spans = {}
+        self.counters = {}
+        self.events = []
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name)
+
+    @contextmanager
+    def _span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self._record(name, start, end)
+
+    def _record(self, name, start, end):
+        elapsed = end - start
+        with self._lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                self.spans[name] = [1, elapsed, elapsed, elapsed]
+            else:
+                stats[0] += 1
+                stats[1] += elapsed
+                if elapsed < stats[2]:
+                    stats[2] = elapsed
+                if elapsed > stats[3]:
+                    stats[3] = elapsed
+            if self.trace:
+                self.events.append({
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start - self._origin) * 1e6,
+                    "dur": elapsed * 1e6,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                })
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def timed(self, name=None):
+        # Decorator form of span(); the check happens per call so toggling at runtime works
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self._span(span_name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def summary(self):
+        rows = [
+            {
+                "Stage": name,
+                "Calls": calls,
+                "Total_s": total,
+                "Mean_ms": total / calls * 1000,
+                "Min_ms": low * 1000,
+                "Max_ms": high * 1000,
+            }
+            for name, (calls, total, low, high) in self.spans.items()
+        ]
+        df = pd.DataFrame(rows, columns=["Stage", "Calls", "Total_s", "Mean_ms", "Min_ms", "Max_ms"])
+        return df.sort_values(by="Total_s", ascending=False, ignore_index=True)
+
+    def print_report(self):
+        if not self.spans and not self.counters:
+            print("No profiling data collected.")
+            return
+        print("\n⏱️ Timing report:")
+        print(self.summary().to_string(index=False, float_format=lambda x: f"{x:,.3f}"))
+        if self.counters:
+            print("\nCounters:")
+            for name, value in sorted(self.counters.items()):
+                print(f" {name}: {value:,}")
+
+    def export_chrome_trace(self, filename="profile_trace.json"):
+        # Loadable in chrome://tracing or https://ui.perfetto.dev
+        counter_events = [
+            {"name": name, "ph": "C", "ts": (time.perf_counter() - self._origin) * 1e6,
+             "pid": os.getpid(), "args": {name: value}}
+            for name, value in self.counters.items()
+        ]
+        with open(filename, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": self.events + counter_events, "displayTimeUnit": "ms"}, file)
+        print(f"Chrome trace saved to '{filename}'")
+
+    def export_json(self, filename="profile_summary.json"):
+        data = {
+            "spans": self.summary().to_dict(orient="records"),
+            "counters": dict(self.counters),
+        }
+        with open(filename, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=2)
+        print(f"Profiling summary saved to '{filename}'")
+
+
+# Module-level profiler shared by every script
+profiler = Profiler()
@@ -0,0 +1,168 @@
+import bisect
+
+import numpy as np
+
+
+def _block_scan(values, window, kind):
+    # Prefix and suffix extremes (with the position of the latest occurrence) inside blocks of `window` rows
+    reduce = np.fmin if kind == 'min' else np.fmax
+    n_rows, n_cols = values.shape
+    n_blocks = -(-n_rows // window)
+    padded = np.full((n_blocks * window, n_cols), np.nan)
+    padded[:n_rows] = values
+    blocks = padded.reshape(n_blocks, window, n_cols)
+    position = np.arange(n_blocks * window).reshape(n_blocks, window, 1)
+
+    prefix = reduce.accumulate(blocks, axis=1)
+    # The running extreme changes (or is matched again) exactly where the value equals it
+    prefix_index = np.maximum.accumulate(np.where(blocks == prefix, position, -1), axis=1)
+
+    reversed_blocks = blocks[:, ::-1]
+    reversed_position = position[:, ::-1]
+    suffix = reduce.accumulate(reversed_blocks, axis=1)
+    previous = np.concatenate([np.full((n_blocks, 1, n_cols), np.nan), suffix[:, :-1]], axis=1)
+    # Scanning backwards, keep the first hit of each new extreme so ties resolve to the latest bar
+    is_new = (reversed_blocks == suffix) & (suffix != previous)
+    suffix_index = np.maximum.accumulate(np.where(is_new, np.arange(window).reshape(1, window, 1), -1), axis=1)
+    suffix_index = np.where(
+        suffix_index >= 0,
+        np.take_along_axis(np.broadcast_to(reversed_position, reversed_blocks.shape), np.maximum(suffix_index, 0),
+                           axis=1),
+        -1,
+    )
+
+    shape = (n_blocks * window, n_cols)
+    return (prefix.reshape(shape), prefix_index.reshape(shape),
+            suffix[:, ::-1].reshape(shape), suffix_index[:, ::-1].reshape(shape))
+
+
+def rolling_extreme(values, window, kind='min'):
+    """
+    Rolling min or max over the rows of a dates x symbols panel, like
+    DataFrame.rolling(window, min_periods=1).min()/.max(), in O(n) per window (van Herk/Gil-Werman).
+
+    NaNs are skipped; a window with no observations gives NaN.
+
+    Returns:
+        tuple of 2-D arrays: the extreme values and the row index of the bar that set each extreme
+        (the latest bar on ties, -1 where undefined).
+    """
+    if kind not in ('min', 'max'):
+        raise ValueError(f"Invalid kind: '{kind}'. Choose 'min' or 'max'.")
+    values = np.asarray(values, dtype=float)
+    n_rows = values.shape[0]
+    if n_rows == 0:
+        return values.copy(), np.full(values.shape, -1, dtype=np.int64)
+
+    prefix, prefix_index, suffix, suffix_index = _block_scan(values, window, kind)
+    rows = np.arange(n_rows)
+    starts = rows - window + 1
+    partial = starts <= 0
+
+    extreme = prefix[:n_rows].copy()
+    index = prefix_index[:n_rows].copy()
+
+    # Full windows span the suffix of the start block and the prefix of the end block
+    full_rows = rows[~partial]
+    left, left_index = suffix[starts[~partial]], suffix_index[starts[~partial]]
+    right, right_index = prefix[full_rows], prefix_index[full_rows]
+    if kind == 'min':
+        take_left = (left < right) | np.isnan(right)
+    else:
+        take_left = (left > right) | np.isnan(right)
+    extreme[full_rows] = np.where(take_left, left, right)
+    index[full_rows] = np.where(take_left, left_index, right_index)
+    index[np.isnan(extreme)] = -1
+    return extreme, index
+
+
+def rolling_extremes(values, windows, kind='min'):
+    # Convenience wrapper: {window: (extreme, index)} for several windows over the same panel
+    return {window: rolling_extreme(values, window, kind) for window in windows}
+
+
+def bars_since(index):
+    # Number of bars since each extreme was set, NaN where it is undefined
+    rows = np.arange(index.shape[0]).reshape(-1, *([1] * (index.ndim - 1)))
+    return np.where(index >= 0, rows - index, np.nan)
+
+
+class RollingExtremesTracker:
+    """
+    Streaming rolling min/max for the incremental update path (e.g. intraday highs/lows over the bars
+    of streaming_quotes.BarBuffer).
+
+    One monotonic deque per symbol covers the longest window; every shorter window is answered from
+    the same deque by a binary search on bar positions, so all windows advance in a single pass.
+    Symbols may advance together (update) or one at a time as their bars close (push).
+    """
+
+    def __init__(self, symbols, windows, kind='min'):
+        if kind not in ('min', 'max'):
+            raise ValueError(f"Invalid kind: '{kind}'. Choose 'min' or 'max'.")
+        self.symbols = list(symbols)
+        self.windows = sorted(windows)
+        self.kind = kind
+        self.longest = self.windows[-1]
+        # Position of the latest bar of every symbol
+        self.bars = np.full(len(self.symbols), -1, dtype=np.int64)
+        # Per symbol: [positions, values, head]; entries before head have already expired
+        self.deques = [[[], [], 0] for _ in self.symbols]
+
+    @classmethod
+    def from_history(cls, symbols, windows, values, kind='min'):
+        # Seeds the tracker with the last `max(windows)` rows of a dates x symbols panel
+        tracker = cls(symbols, windows, kind)
+        values = np.asarray(values, dtype=float)
+        skipped = max(len(values) - tracker.longest, 0)
+        tracker.bars[:] = skipped - 1
+        for row in values[skipped:]:
+            tracker.update(row)
+        return tracker
+
+    def push(self, i, value):
+        # Adds the next bar of the symbol at position i (NaN for no data)
+        bar = self.bars[i] + 1
+        self.bars[i] = bar
+        entry = self.deques[i]
+        positions, values, head = entry
+        if value == value:
+            # Drop dominated entries; equal values go too, so ties resolve to the latest bar
+            is_min = self.kind == 'min'
+            while len(positions) > head and (values[-1] >= value if is_min else values[-1] <= value):
+                positions.pop()
+                values.pop()
+            positions.append(bar)
+            values.append(value)
+        while head < len(positions) and positions[head] <= bar - self.longest:
+            head += 1
+        if head > 64 and head * 2 > len(positions):
+            del positions[:head]
+            del values[:head]
+            head = 0
+        entry[2] = head
+
+    def update(self, row):
+        """
+        Adds one bar for every symbol (one value per symbol, NaN for no data) and returns the current extremes.
+
+        Returns:
+            dict: window -> (array of extremes, array of bar positions where they were set)
+        """
+        for i, value in enumerate(row):
+            self.push(i, value)
+        return self.current()
+
+    def current(self):
+        result = {}
+        for window in self.windows:
+            extremes = np.full(len(self.symbols), np.nan)
+            positions_out = np.full(len(self.symbols), -1, dtype=np.int64)
+            first_bars = self.bars - window + 1
+            for i, (positions, values, head) in enumerate(self.deques):
+                k = bisect.bisect_left(positions, first_bars[i], lo=head)
+                if k < len(positions):
+                    extremes[i] = values[k]
+                    positions_out[i] = positions[k]
+            result[window] = (extremes, positions_out)
+        return result
@@ -0,0 +1,125 @@
+import re
+
+import pandas as pd
+
+from profiling import profiler
+
+
+# Ready-made screens: name -> (filter expression, sort column, ascending)
+PRESET_SCREENS = {
+    'top_risers': (None, 'Percent_Change', False),
+    'top_fallers': (None, 'Percent_Change', True),
+    'closest_to_52_week_low': (None, 'Percent_Diff_From_52_Week_Low', True),
+    'closest_to_52_week_high': (None, 'Percent_Diff_From_52_Week_High', False),
+    'hit_52_week_low': ('Hit_52_Week_Low == 1', 'Percent_Change', True),
+    'hit_52_week_high': ('Hit_52_Week_High == 1', 'Percent_Change', False),
+    'golden_cross_near_low': ('Percent_Diff_From_52_Week_Low < 5 and 50_Day_MA > 250_Day_MA',
+                              'Percent_Diff_From_52_Week_Low', True),
+    'macd_bullish': ('MACD_Line > MACD_Signal and MACD_Histogram > 0', 'MACD_Histogram', False),
+}
+
+DEFAULT_COLUMNS = ['Symbol', 'Short Name', 'Sector', 'Industry', 'Percent_Change', 'Close', '52_Week_Low',
+                   '52_Week_High']
+
+
+class Screener:
+    """
+    Cross-sectional screens over the latest per-symbol indicator snapshot.
+
+    Filters are pandas expressions evaluated in one vectorized pass with DataFrame.eval (numexpr is used
+    when installed). Column names that are not valid identifiers, such as 50_Day_MA, can be written as is.
+    """
+
+    def __init__(self, snapshot_df=None, company_info_df=None, snapshot_file="latest_stock_prices_data.csv",
+                 company_info_file="company_info.csv"):
+        if snapshot_df is None:
+            snapshot_df = pd.read_csv(snapshot_file)
+        if company_info_df is None:
+            try:
+                company_info_df = pd.read_csv(company_info_file)
+            except FileNotFoundError:
+                company_info_df = pd.DataFrame(columns=["Ticker", "Short Name", "Industry", "Sector", "Country"])
+
+        # Join the metadata once so every screen can filter or group on it
+        info_columns = [c for c in ["Ticker", "Short Name", "Industry", "Sector", "Country"]
+                        if c in company_info_df.columns]
+        info = company_info_df[info_columns].drop_duplicates(subset="Ticker")
+        snapshot_df = snapshot_df.drop(columns=[c for c in info_columns if c in snapshot_df.columns and c != "Ticker"])
+        self.snapshot_df = snapshot_df.merge(info, left_on="Symbol", right_on="Ticker", how="left") \
+                                      .drop(columns=["Ticker"]).reset_index(drop=True)
+        self._quoting_pattern = self._build_quoting_pattern(self.snapshot_df.columns)
+
+    @classmethod
+    def from_prices(cls, stock_prices_df, company_info_df=None):
+        # Latest available row per symbol from the full price history
+        latest = stock_prices_df.sort_values('Date').groupby('Symbol', as_index=False).last()
+        return cls(snapshot_df=latest, company_info_df=company_info_df)
+
+    @staticmethod
+    def _build_quoting_pattern(columns):
+        # Matches column names that DataFrame.eval can only read inside backticks
+        names = sorted((str(c) for c in columns if not str(c).isidentifier()), key=len, reverse=True)
+        if not names:
+            return None
+        return re.compile(r"(?<![\w`])(" + "|".join(re.escape(name) for name in names) + r")(?![\w`])")
+
+    def quote_expression(self, expression):
+        if self._quoting_pattern is None:
+            return expression
+        return self._quoting_pattern.sub(lambda match: f"`{match.group(1)}`", expression)
+
+    def filter(self, expression):
+        """
+        Returns the boolean mask of rows matching a filter expression, e.g.
+        "Percent_Diff_From_52_Week_Low < 5 and 50_Day_MA > 250_Day_MA and Sector == 'Technology'".
+        """
+        if not expression:
+            return pd.Series(True, index=self.snapshot_df.index)
+        with profiler.span("screen eval"):
+            mask = self.snapshot_df.eval(self.quote_expression(expression))
+        if not isinstance(mask, pd.Series) or mask.dtype != bool:
+            raise ValueError(f"Screen expression must evaluate to True/False per row: '{expression}'")
+        return mask
+
+    def screen(self, expression=None, sort_by=None, ascending=False, top_k=None, group_by=None, columns=None):
+        """
+        Runs a screen: filter, rank by `sort_by` and keep the top `top_k` rows (per group when `group_by`
+        is a column such as 'Sector' or 'Industry').
+
+        Returns:
+            DataFrame: Matching rows, ranked, with a 'Rank' column (within group when grouped).
+        """
+        result = self.snapshot_df[self.filter(expression)]
+
+        if sort_by:
+            result = result.sort_values(by=sort_by, ascending=ascending, na_position='last', kind='stable')
+        if group_by:
+            result = result.sort_values(by=group_by, kind='stable')
+            grouped = result.groupby(group_by, sort=False, dropna=False)
+            result = result.assign(Rank=grouped.cumcount() + 1)
+            if top_k:
+                result = result[result['Rank'] <= top_k]
+        else:
+            result = result.assign(Rank=range(1, len(result) + 1))
+            if top_k:
+                result = result.head(top_k)
+
+        if columns:
+            keep = ([group_by] if group_by and group_by not in columns else []) + list(columns)
+            result = result[[c for c in keep if c in result.columns] + ['Rank']]
+        return result.reset_index(drop=True)
+
+    def run_preset(self, name, top_k=10, group_by=None, columns=None):
+        if name not in PRESET_SCREENS:
+            raise ValueError(f"Invalid screen name: '{name}'. Choose one of: {', '.join(PRESET_SCREENS)}")
+        expression, sort_by, ascending = PRESET_SCREENS[name]
+        return self.screen(expression, sort_by=sort_by, ascending=ascending, top_k=top_k, group_by=group_by,
+                           columns=columns or DEFAULT_COLUMNS)
+
+
+# Example usage
+if __name__ == "__main__":
+    screener = Screener()
+    print(screener.screen("Percent_Diff_From_52_Week_Low < 5 and 50_Day_MA > 250_Day_MA",
+                          sort_by="Percent_Diff_From_52_Week_Low", ascending=True, top_k=3, group_by="Sector",
+                          columns=DEFAULT_COLUMNS))
@@ -0,0 +1,130 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from profiling import profiler
+from price_store import PriceStore, frame_to_panels
+
+ROLLUP_LEVELS = ('Sector', 'Industry')
+
+
+class GroupIndex:
+    """
+    Integer group codes for a list of symbols, precomputed once per level (Sector, Industry, Country).
+
+    Symbols are reordered so every group is a contiguous block of panel columns; a grouped sum is then a
+    single np.add.reduceat call over the whole dates x symbols panel.
+    """
+
+    def __init__(self, symbols, company_info_df, level='Sector'):
+        self.level = level
+        if level in company_info_df.columns:
+            mapping = company_info_df.drop_duplicates(subset='Ticker').set_index('Ticker')[level]
+            groups = pd.Series(symbols, dtype=object).map(mapping).fillna('Unknown')
+        else:
+            groups = pd.Series(['Unknown'] * len(symbols), dtype=object)
+
+        codes, labels = pd.factorize(groups, sort=True)
+        self.codes = codes
+        self.labels = list(labels)
+        self.order = np.argsort(codes, kind='stable')
+        sizes = np.bincount(codes, minlength=len(self.labels))
+        self.starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        self.ends = np.cumsum(sizes)
+
+    def sum(self, panel):
+        # dates x groups sums, NaNs counted as 0
+        return np.add.reduceat(np.nan_to_num(panel[:, self.order]), self.starts, axis=1)
+
+    def count(self, mask):
+        return np.add.reduceat(mask[:, self.order].astype(np.int64), self.starts, axis=1)
+
+    def median(self, panel):
+        # dates x groups medians ignoring NaNs (NaN for a group without data). Groups are padded with NaN
+        # to the next power of two of their size and every size class is sorted in one np.sort call
+        # (NaNs sort last), so the medians are read at the middle positions of all groups of a class at once
+        # while padding stays below 2x.
+        ordered = np.concatenate([panel[:, self.order], np.full((panel.shape[0], 1), np.nan)], axis=1)
+        padding_column = ordered.shape[1] - 1
+        counts = self.count(~np.isnan(panel))
+        sizes = self.ends - self.starts
+        widths = 1 << np.ceil(np.log2(np.maximum(sizes, 1))).astype(np.int64)
+        out = np.full(counts.shape, np.nan)
+        for width in np.unique(widths):
+            groups = np.flatnonzero(widths == width)
+            offsets = np.arange(width)
+            columns = np.where(offsets < sizes[groups, None], self.starts[groups, None] + offsets, padding_column)
+            ranked = np.sort(ordered[:, columns], axis=2)
+            n = counts[:, groups]
+            lower = np.maximum(n - 1, 0)[..., None] // 2
+            upper = (n // 2)[..., None]
+            median = (np.take_along_axis(ranked, lower, axis=2) + np.take_along_axis(ranked, upper, axis=2))[..., 0] / 2
+            out[:, groups] = np.where(n > 0, median, np.nan)
+        return out
+
+
+def compute_rollups(stock_prices_df, company_info_df, levels=ROLLUP_LEVELS):
+    """
+    Daily rollups per Sector/Industry for every date in the price history.
+
+    Returns:
+        dict: level -> DataFrame with one row per (Date, group) and the columns Symbols,
+        Median_Percent_Change, Breadth_Above_50_Day_MA (share of symbols), New_52_Week_Highs,
+        New_52_Week_Lows and Volume_vs_50_Day_Volume_MA (group volume / group 50-day volume MA).
+    """
+    with profiler.span("rollups panels"):
+        dates, symbols, panels = frame_to_panels(stock_prices_df, ['Close', '50_Day_MA', 'Percent_Change',
+                                                                   'Hit_52_Week_High', 'Hit_52_Week_Low', 'Volume',
+                                                                   '50_Day_Volume_MA'])
+    close, ma_50 = panels['Close'], panels['50_Day_MA']
+    percent_change = panels['Percent_Change']
+    hit_high, hit_low = panels['Hit_52_Week_High'], panels['Hit_52_Week_Low']
+    volume, volume_ma_50 = panels['Volume'], panels['50_Day_Volume_MA']
+
+    has_close = ~np.isnan(close)
+    has_ma = has_close & ~np.isnan(ma_50)
+    above_ma = has_ma & (close > ma_50)
+    has_volume = ~np.isnan(volume) & ~np.isnan(volume_ma_50)
+
+    rollups = {}
+    for level in levels:
+        with profiler.span(f"rollups {level}"):
+            index = GroupIndex(symbols, company_info_df, level)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                breadth = index.count(above_ma) / index.count(has_ma)
+                volume_ratio = index.sum(np.where(has_volume, volume, np.nan)) / \
+                               index.sum(np.where(has_volume, volume_ma_50, np.nan))
+            metrics = {
+                'Symbols': index.count(has_close),
+                'Median_Percent_Change': index.median(percent_change),
+                'Breadth_Above_50_Day_MA': breadth,
+                'New_52_Week_Highs': index.count(hit_high == 1),
+                'New_52_Week_Lows': index.count(hit_low == 1),
+                'Volume_vs_50_Day_Volume_MA': volume_ratio,
+            }
+            n_groups = len(index.labels)
+            frame = {'Date': np.repeat(dates, n_groups),
+                     level: np.tile(np.asarray(index.labels, dtype=object), len(dates))}
+            for name, values in metrics.items():
+                frame[name] = values.ravel()
+            df = pd.DataFrame(frame)
+            rollups[level] = df[df['Symbols'] > 0].reset_index(drop=True)
+    return rollups
+
+
+def save_rollups(rollups, store=None):
+    # Next to the price partitions they were computed from, whatever the working directory
+    directory = (store or PriceStore()).directory
+    os.makedirs(directory, exist_ok=True)
+    for level, df in rollups.items():
+        filename = os.path.join(directory, f"{level.lower()}_rollups.csv")
+        df.to_csv(filename, index=False)
+        print(f"{level} rollups saved to '{filename}'")
+
+
+# Example usage
+if __name__ == "__main__":
+    prices = pd.read_csv("stock_prices_data.csv")
+    info = pd.read_csv("company_info.csv")
+    save_rollups(compute_rollups(prices, info))
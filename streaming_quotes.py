@@ -0,0 +1,305 @@
+import csv
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+
+from profiling import profiler
+from portfolio import aggregate_lots, clean_lots
+from rolling_extremes import RollingExtremesTracker
+
+
+class BarBuffer:
+    """
+    Fixed-size NumPy ring buffers of OHLCV bars for every symbol at one bar size (e.g. 60s or 300s).
+
+    Memory is bounded by `capacity` bars per symbol. Intraday MA and MACD are updated incrementally
+    each time a bar closes, with the same EMA recursion as ewm(adjust=False), and so are the lowest low
+    and highest high over the last `range_windows` bars.
+    """
+
+    def __init__(self, symbols, bar_seconds=60, capacity=390, ma_window=20, range_windows=(30, 120)):
+        if ma_window > capacity:
+            raise ValueError("ma_window cannot be larger than the ring buffer capacity")
+        n = len(symbols)
+        self.symbols = list(symbols)
+        self.bar_seconds = bar_seconds
+        self.capacity = capacity
+        self.ma_window = ma_window
+
+        # Closed bars; slot for bar k of a symbol is k % capacity
+        self.time = np.zeros((n, capacity), dtype=np.int64)
+        self.open = np.full((n, capacity), np.nan)
+        self.high = np.full((n, capacity), np.nan)
+        self.low = np.full((n, capacity), np.nan)
+        self.close = np.full((n, capacity), np.nan)
+        self.volume = np.zeros((n, capacity))
+        self.count = np.zeros(n, dtype=np.int64)
+
+        # Bar currently being built from ticks
+        self.bucket = np.full(n, -1, dtype=np.int64)
+        self.cur_open = np.full(n, np.nan)
+        self.cur_high = np.full(n, np.nan)
+        self.cur_low = np.full(n, np.nan)
+        self.cur_close = np.full(n, np.nan)
+        self.cur_volume = np.zeros(n)
+
+        # Incremental indicators over closed bars
+        self.ma_sum = np.zeros(n)
+        self.ema_12 = np.full(n, np.nan)
+        self.ema_26 = np.full(n, np.nan)
+        self.macd_signal = np.full(n, np.nan)
+        self.range_windows = sorted(range_windows)
+        self.lows = RollingExtremesTracker(self.symbols, self.range_windows, 'min')
+        self.highs = RollingExtremesTracker(self.symbols, self.range_windows, 'max')
+
+    def add_tick(self, i, timestamp, price, size=0.0):
+        # Returns True when the tick closed the previous bar of symbol i
+        bucket = int(timestamp // self.bar_seconds)
+        closed = False
+        if self.bucket[i] >= 0 and bucket > self.bucket[i]:
+            self._close_bar(i)
+            closed = True
+        if self.bucket[i] < 0 or closed:
+            self.bucket[i] = bucket
+            self.cur_open[i] = self.cur_high[i] = self.cur_low[i] = price
+            self.cur_volume[i] = 0.0
+        else:
+            # Late ticks for an older bucket are folded into the open bar
+            self.cur_high[i] = max(self.cur_high[i], price)
+            self.cur_low[i] = min(self.cur_low[i], price)
+        self.cur_close[i] = price
+        self.cur_volume[i] += size
+        return closed
+
+    def _close_bar(self, i):
+        k = self.count[i]
+        close = self.cur_close[i]
+        if k >= self.ma_window:
+            # Read the bar leaving the MA window before its slot can be overwritten
+            self.ma_sum[i] -= self.close[i, (k - self.ma_window) % self.capacity]
+        self.ma_sum[i] += close
+
+        slot = k % self.capacity
+        self.time[i, slot] = self.bucket[i] * self.bar_seconds
+        self.open[i, slot] = self.cur_open[i]
+        self.high[i, slot] = self.cur_high[i]
+        self.low[i, slot] = self.cur_low[i]
+        self.close[i, slot] = close
+        self.volume[i, slot] = self.cur_volume[i]
+        self.count[i] = k + 1
+        self.lows.push(i, self.cur_low[i])
+        self.highs.push(i, self.cur_high[i])
+
+        if np.isnan(self.ema_12[i]):
+            self.ema_12[i] = self.ema_26[i] = close
+            self.macd_signal[i] = 0.0
+        else:
+            self.ema_12[i] += 2 / 13 * (close - self.ema_12[i])
+            self.ema_26[i] += 2 / 27 * (close - self.ema_26[i])
+            self.macd_signal[i] += 2 / 10 * ((self.ema_12[i] - self.ema_26[i]) - self.macd_signal[i])
+        self.bucket[i] = -1
+
+    def flush(self):
+        # Closes every open bar, e.g. at the end of a replayed feed
+        for i in np.flatnonzero(self.bucket >= 0):
+            self._close_bar(i)
+
+    def moving_average(self):
+        with np.errstate(invalid='ignore'):
+            return np.where(self.count >= self.ma_window, self.ma_sum / self.ma_window, np.nan)
+
+    def macd(self):
+        line = self.ema_12 - self.ema_26
+        return line, self.macd_signal, line - self.macd_signal
+
+    def ranges(self):
+        # {window: (lowest low, highest high)} over the last `window` closed bars of every symbol
+        lows, highs = self.lows.current(), self.highs.current()
+        return {window: (lows[window][0], highs[window][0]) for window in self.range_windows}
+
+    def bars(self, symbol):
+        # Closed bars still in the ring for one symbol, oldest first
+        i = self.symbols.index(symbol)
+        k = int(self.count[i])
+        n = min(k, self.capacity)
+        slots = np.arange(k - n, k) % self.capacity
+        return pd.DataFrame({
+            'Datetime': pd.to_datetime(self.time[i, slots], unit='s'),
+            'Open': self.open[i, slots],
+            'High': self.high[i, slots],
+            'Low': self.low[i, slots],
+            'Close': self.close[i, slots],
+            'Volume': self.volume[i, slots],
+        })
+
+
+class StreamingSession:
+    """
+    Aggregates a stream of ticks (timestamp, symbol, price, size) into 1m/5m bars and keeps intraday
+    MA/MACD and the profit/loss of the positions from my_stocks.csv up to date.
+    """
+
+    def __init__(self, symbols, bar_sizes=(60, 300), capacity=390, ma_window=20, positions=None):
+        self.symbols = list(dict.fromkeys(symbols))
+        self.position = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.buffers = {seconds: BarBuffer(self.symbols, seconds, capacity, ma_window) for seconds in bar_sizes}
+        self.last_price = np.full(len(self.symbols), np.nan)
+        self.last_time = np.zeros(len(self.symbols))
+        self.quantity = np.zeros(len(self.symbols))
+        self.cost = np.zeros(len(self.symbols))
+        if positions is not None:
+            self.set_positions(positions)
+
+    def set_positions(self, positions):
+        # positions: DataFrame with ticker, price and quantity columns (several lots per ticker allowed)
+        for _, position in aggregate_lots(clean_lots(positions)).iterrows():
+            i = self.position.get(position['ticker'])
+            if i is not None:
+                self.quantity[i] = position['Quantity']
+                self.cost[i] = position['Cost_Basis']
+
+    def on_tick(self, timestamp, symbol, price, size=0.0):
+        i = self.position.get(symbol)
+        if i is None or price != price:
+            return False
+        self.last_price[i] = price
+        self.last_time[i] = timestamp
+        closed = False
+        for buffer in self.buffers.values():
+            closed |= buffer.add_tick(i, timestamp, price, size)
+        return closed
+
+    def flush(self):
+        for buffer in self.buffers.values():
+            buffer.flush()
+
+    def profit_loss(self):
+        return self.last_price * self.quantity - self.cost
+
+    def snapshot(self, bar_seconds=60):
+        buffer = self.buffers[bar_seconds]
+        line, signal, histogram = buffer.macd()
+        ranges = {}
+        for window, (low, high) in buffer.ranges().items():
+            ranges[f'{window}_Bar_Low'] = low
+            ranges[f'{window}_Bar_High'] = high
+        return pd.DataFrame({
+            'Symbol': self.symbols,
+            'Last': self.last_price,
+            'Time': pd.to_datetime(self.last_time, unit='s'),
+            'Bars': buffer.count,
+            f'{buffer.ma_window}_Bar_MA': buffer.moving_average(),
+            'MACD_Line': line,
+            'MACD_Signal': signal,
+            'MACD_Histogram': histogram,
+            **ranges,
+            'Quantity': self.quantity,
+            'Profit_Loss': np.where(self.quantity != 0, self.profit_loss(), np.nan),
+        })
+
+    def run(self, source, on_bar=None, max_ticks=None):
+        # Consumes ticks from any iterable source; on_bar(session) is called whenever a bar closes
+        n = 0
+        with profiler.span("streaming run"):
+            for timestamp, symbol, price, size in source:
+                n += 1
+                if self.on_tick(timestamp, symbol, price, size) and on_bar is not None:
+                    on_bar(self)
+                if max_ticks is not None and n >= max_ticks:
+                    break
+        profiler.count("streaming_ticks", n)
+
+
+def _to_epoch(values):
+    # Independent of the datetime unit pandas parses into (ns in pandas 2, may be us/s in pandas 3)
+    timestamps = pd.DatetimeIndex(pd.to_datetime(values, utc=True, format='ISO8601'))
+    return ((timestamps - pd.Timestamp(0, tz='UTC')) / pd.Timedelta(seconds=1)).to_numpy(dtype=float)
+
+
+class ReplayFeed:
+    """
+    Replays ticks recorded in a CSV file (timestamp, symbol, price, size) in timestamp order.
+
+    With speed=None ticks are emitted as fast as possible; speed=60 plays one minute per second.
+    """
+
+    def __init__(self, filename, speed=None):
+        self.filename = filename
+        self.speed = speed
+
+    def __iter__(self):
+        df = pd.read_csv(self.filename)
+        timestamps = _to_epoch(df['timestamp'])
+        order = np.argsort(timestamps, kind='stable')
+        symbols = df['symbol'].astype(str).to_numpy()
+        prices = df['price'].to_numpy(dtype=float)
+        sizes = df['size'].fillna(0).to_numpy(dtype=float) if 'size' in df.columns else np.zeros(len(df))
+        previous = None
+        for k in order:
+            if self.speed and previous is not None and timestamps[k] > previous:
+                time.sleep((timestamps[k] - previous) / self.speed)
+            previous = timestamps[k]
+            yield timestamps[k], symbols[k], prices[k], sizes[k]
+
+
+class YahooQuotePoller:
+    """
+    Polls the latest 1-minute bars for the whole watchlist in one batched yf.download call per poll
+    and turns them into ticks. The size is the volume traded since the previous poll.
+    """
+
+    def __init__(self, symbols, interval=60, polls=None):
+        self.symbols = list(symbols)
+        self.interval = interval
+        self.polls = polls
+        self._seen = {}
+
+    def poll(self):
+        with profiler.span("yf.download (1m quotes)"):
+            data = yf.download(self.symbols, period='1d', interval='1m', group_by='ticker', progress=False)
+        ticks = []
+        for symbol in self.symbols:
+            if symbol not in data.columns.get_level_values(0):
+                continue
+            bars = data[symbol].dropna(subset=['Close'])
+            if bars.empty:
+                continue
+            bar_time = bars.index[-1]
+            close = float(bars['Close'].iloc[-1])
+            volume = float(bars['Volume'].iloc[-1])
+            last_time, last_volume = self._seen.get(symbol, (None, 0.0))
+            size = volume - last_volume if bar_time == last_time else volume
+            self._seen[symbol] = (bar_time, volume)
+            ticks.append((_to_epoch([bar_time])[0], symbol, close, max(size, 0.0)))
+        return ticks
+
+    def __iter__(self):
+        n = 0
+        while self.polls is None or n < self.polls:
+            yield from self.poll()
+            n += 1
+            if self.polls is None or n < self.polls:
+                time.sleep(self.interval)
+
+
+def record_feed(source, filename, append=False):
+    # Passes ticks through while writing them to a CSV that ReplayFeed can play back later
+    write_header = not (append and os.path.isfile(filename) and os.path.getsize(filename) > 0)
+    with open(filename, mode="a" if append else "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        if write_header:
+            writer.writerow(["timestamp", "symbol", "price", "size"])
+        for timestamp, symbol, price, size in source:
+            writer.writerow([pd.to_datetime(timestamp, unit='s', utc=True).isoformat(), symbol, price, size])
+            file.flush()
+            yield timestamp, symbol, price, size
+
+
+# Example usage
+if __name__ == "__main__":
+    session = StreamingSession(["AAPL", "MSFT", "NVDA"])
+    session.run(record_feed(YahooQuotePoller(session.symbols, interval=60, polls=3), "recorded_ticks.csv"))
+    print(session.snapshot().to_string(index=False))
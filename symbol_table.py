@@ -0,0 +1,184 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+
+class SymbolTable:
+    """
+    Interns ticker symbols as small integer ids (0, 1, 2, ... in first-seen order) and keeps the SEC
+    metadata (CIK, company name, exchange) next to them in id order.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.symbols = []
+        self.cik = []
+        self.name = []
+        self.exchange = []
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def __contains__(self, symbol):
+        return symbol in self.ids
+
+    def intern(self, symbol, cik=None, name=None, exchange=None):
+        symbol = symbol.strip().upper()
+        symbol_id = self.ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = len(self.symbols)
+            self.ids[symbol] = symbol_id
+            self.symbols.append(symbol)
+            self.cik.append(cik)
+            self.name.append(name)
+            self.exchange.append(exchange)
+        else:
+            # Fill in metadata for symbols first seen without it (e.g. from a watchlist)
+            if cik is not None and self.cik[symbol_id] is None:
+                self.cik[symbol_id] = cik
+            if name is not None and self.name[symbol_id] is None:
+                self.name[symbol_id] = name
+            if exchange is not None and self.exchange[symbol_id] is None:
+                self.exchange[symbol_id] = exchange
+        return symbol_id
+
+    def universe(self, symbols):
+        # Interns the symbols and returns them as a Universe bitset
+        bits = 0
+        for symbol in symbols:
+            if isinstance(symbol, str) and symbol.strip():
+                bits |= 1 << self.intern(symbol)
+        return Universe(self, bits)
+
+    def everything(self):
+        return Universe(self, (1 << len(self.symbols)) - 1)
+
+    def to_frame(self):
+        return pd.DataFrame({'Id': np.arange(len(self.symbols)), 'Symbol': self.symbols, 'CIK': self.cik,
+                             'Name': self.name, 'Exchange': self.exchange})
+
+    def by_exchange(self, exchange):
+        return Universe(self, sum(1 << i for i, e in enumerate(self.exchange)
+                                  if e is not None and e.lower() == exchange.lower()))
+
+
+class Universe:
+    """
+    A set of symbols as a bitset over SymbolTable ids (a Python int, so |, & and - run in C over
+    machine words). Iteration and tolist() follow id order, i.e. the order symbols were interned in;
+    ordered(symbols) lists the members in a caller-given order instead.
+    """
+
+    def __init__(self, table, bits=0):
+        self.table = table
+        self.bits = bits
+
+    def _check(self, other):
+        if not isinstance(other, Universe) or other.table is not self.table:
+            raise ValueError("Universes must come from the same SymbolTable")
+
+    def __or__(self, other):
+        self._check(other)
+        return Universe(self.table, self.bits | other.bits)
+
+    def __and__(self, other):
+        self._check(other)
+        return Universe(self.table, self.bits & other.bits)
+
+    def __sub__(self, other):
+        self._check(other)
+        return Universe(self.table, self.bits & ~other.bits)
+
+    def __xor__(self, other):
+        self._check(other)
+        return Universe(self.table, self.bits ^ other.bits)
+
+    def __contains__(self, symbol):
+        symbol_id = self.table.ids.get(symbol.strip().upper()) if isinstance(symbol, str) else None
+        return symbol_id is not None and (self.bits >> symbol_id) & 1 == 1
+
+    def __len__(self):
+        return bin(self.bits).count("1")
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __eq__(self, other):
+        return isinstance(other, Universe) and other.table is self.table and other.bits == self.bits
+
+    def __repr__(self):
+        return f"Universe({len(self)} symbols)"
+
+    def id_array(self):
+        if self.bits == 0:
+            return np.zeros(0, dtype=np.int64)
+        raw = np.frombuffer(self.bits.to_bytes((self.bits.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(raw, bitorder="little"))
+
+    def tolist(self):
+        symbols = self.table.symbols
+        return [symbols[i] for i in self.id_array()]
+
+    def ordered(self, symbols):
+        # Members in the order they first appear in `symbols` (e.g. the lists a universe was built from)
+        members = set(self.tolist())
+        cleaned = (s.strip().upper() for s in symbols if isinstance(s, str) and s.strip())
+        return [s for s in dict.fromkeys(cleaned) if s in members]
+
+
+_TOKEN = re.compile(r"\s*(\(|\)|\||&|-|∪|∩|−|[A-Za-z0-9_.^]+)")
+_OPERATORS = {'|': '|', '∪': '|', '&': '&', '∩': '&', '-': '-', '−': '-'}
+
+
+def expression_names(expression):
+    # List names in an expression, left to right
+    return [token for token in _TOKEN.findall(expression) if token not in _OPERATORS and token not in '()']
+
+
+def compose(expression, resolve):
+    """
+    Evaluates set algebra over named universes, left to right with parentheses, e.g.
+    "sp_1500 | my_stocks - bitcoin" or "sp_1500 ∪ my_stocks − bitcoin".
+
+    `resolve(name)` must return the Universe for a name.
+    """
+    tokens = []
+    position = 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if not match:
+            raise ValueError(f"Invalid universe expression near: '{expression[position:]}'")
+        tokens.append(match.group(1))
+        position = match.end()
+
+    def operand(k):
+        if k >= len(tokens):
+            raise ValueError(f"Incomplete universe expression: '{expression}'")
+        if tokens[k] == '(':
+            value, k = chain(k + 1)
+            if k >= len(tokens) or tokens[k] != ')':
+                raise ValueError(f"Missing ')' in universe expression: '{expression}'")
+            return value, k + 1
+        if tokens[k] in _OPERATORS or tokens[k] == ')':
+            raise ValueError(f"Unexpected '{tokens[k]}' in universe expression: '{expression}'")
+        return resolve(tokens[k]), k + 1
+
+    def chain(k):
+        value, k = operand(k)
+        while k < len(tokens) and tokens[k] in _OPERATORS:
+            operator = _OPERATORS[tokens[k]]
+            right, k = operand(k + 1)
+            if operator == '|':
+                value = value | right
+            elif operator == '&':
+                value = value & right
+            else:
+                value = value - right
+        return value, k
+
+    value, k = chain(0)
+    if k != len(tokens):
+        raise ValueError(f"Unexpected '{tokens[k]}' in universe expression: '{expression}'")
+    return value
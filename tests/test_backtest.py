@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import Backtester, forward_returns
+from price_store import PriceStore
+
+
+def test_forward_returns():
+    close = np.array([[100.0], [110.0], [99.0]])
+    np.testing.assert_allclose(forward_returns(close, 1)[:, 0], [10.0, -10.0, np.nan], equal_nan=True)
+    assert np.isnan(forward_returns(close, 5)).all()
+
+
+@pytest.mark.parametrize("horizon", [0, -1])
+def test_horizons_must_be_at_least_one_bar(horizon):
+    with pytest.raises(ValueError):
+        forward_returns(np.ones((3, 1)), horizon)
+    with pytest.raises(ValueError):
+        Backtester(horizons=(1, horizon))
+
+
+def price_frame(n_dates=120, n_symbols=7, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2023-01-02", periods=n_dates)
+    frames = []
+    for k in range(n_symbols):
+        close = 50 + np.cumsum(rng.normal(size=n_dates))
+        line = rng.normal(size=n_dates)
+        frames.append(pd.DataFrame({'Date': dates, 'Symbol': f"S{k}", 'Close': close, 'MACD_Line': line,
+                                    'MACD_Signal': rng.normal(size=n_dates) * 0.5,
+                                    '50_Day_MA': close + rng.normal(size=n_dates),
+                                    '250_Day_MA': close + rng.normal(size=n_dates),
+                                    '52_Week_High': close + np.abs(rng.normal(size=n_dates))}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_store_partitions_merge_to_the_in_memory_result(tmp_path):
+    df = price_frame()
+    store = PriceStore(str(tmp_path), partition_size=3)
+    store.write(df)
+    backtester = Backtester(horizons=(1, 5), holding_period=5)
+    summary, equity = backtester.run(df)
+    store_summary, store_equity = backtester.run_store(store)
+    pd.testing.assert_frame_equal(summary, store_summary, check_exact=False, rtol=1e-9)
+    pd.testing.assert_frame_equal(equity, store_equity, check_exact=False, rtol=1e-9, check_freq=False,
+                                  check_index_type=False)
+
+
+def test_signal_statistics_by_hand():
+    dates = pd.bdate_range("2024-01-01", periods=4)
+    df = pd.DataFrame({'Date': dates, 'Symbol': "AAA", 'Close': [100.0, 100.0, 110.0, 121.0],
+                       'MACD_Line': [-1.0, 1.0, 2.0, 3.0], 'MACD_Signal': [0.0, 0.0, 0.0, 0.0]})
+    summary, _ = Backtester(rules=['macd_bullish_cross'], horizons=(1, 2)).run(df)
+    one, two = summary.iloc[0], summary.iloc[1]
+    assert one['Signals'] == 1 and one['Mean_Return_%'] == pytest.approx(10.0)
+    assert two['Signals'] == 1 and two['Mean_Return_%'] == pytest.approx(21.0)
+    assert one['Baseline_Mean_Return_%'] == pytest.approx((0 + 10 + 10) / 3)
@@ -0,0 +1,125 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from charts import CHART_COLUMNS, ChartRenderer, lttb, render_charts
+from price_store import PriceStore
+
+
+def reference_lttb(x, y, threshold):
+    # Textbook LTTB (one bucket at a time in plain Python)
+    n = len(x)
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        next_start = int(np.floor((i + 1) * every)) + 1
+        next_end = min(int(np.floor((i + 2) * every)) + 1, n)
+        avg_x = sum(x[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(y[next_start:next_end]) / (next_end - next_start)
+        start, end = int(np.floor(i * every)) + 1, int(np.floor((i + 1) * every)) + 1
+        best, best_area = start, -1.0
+        for k in range(start, end):
+            area = abs((x[a] - avg_x) * (y[k] - y[a]) - (x[a] - x[k]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = k, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return np.array(selected)
+
+
+def random_walk(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.arange(n, dtype=float), 100 + np.cumsum(rng.normal(size=n))
+
+
+@pytest.mark.parametrize("n, threshold", [(1000, 100), (257, 50), (50, 3), (10, 9)])
+def test_lttb_matches_reference(n, threshold):
+    x, y = random_walk(n, seed=n)
+    keep = lttb(x, y, threshold)
+    assert len(keep) == threshold and keep[0] == 0 and keep[-1] == n - 1
+    assert (np.diff(keep) > 0).all()
+    np.testing.assert_array_equal(keep, reference_lttb(x, y, threshold))
+
+
+def test_lttb_keeps_everything_when_nothing_to_drop():
+    x, y = random_walk(20)
+    np.testing.assert_array_equal(lttb(x, y, 20), np.arange(20))
+    np.testing.assert_array_equal(lttb(x, y, 50), np.arange(20))
+    np.testing.assert_array_equal(lttb(x, y, 2), np.arange(20))
+
+
+def test_lttb_keeps_spikes():
+    x = np.arange(500, dtype=float)
+    y = np.zeros(500)
+    y[123], y[377] = 50.0, -40.0
+    keep = lttb(x, y, 20)
+    assert 123 in keep and 377 in keep
+    # Plain striding would miss both
+    assert 123 not in np.linspace(0, 499, 20).astype(int) and 377 not in np.linspace(0, 499, 20).astype(int)
+
+
+def chart_frame(symbol, n_dates=300, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(size=n_dates))
+    df = pd.DataFrame({'Date': pd.bdate_range("2023-01-02", periods=n_dates), 'Symbol': symbol, 'Close': close})
+    df['50_Day_MA'] = df['Close'].rolling(50).mean()
+    df['250_Day_MA'] = df['Close'].rolling(250).mean()
+    df['52_Week_Low'] = df['Close'].rolling(252, min_periods=1).min()
+    df['52_Week_High'] = df['Close'].rolling(252, min_periods=1).max()
+    ema_12 = df['Close'].ewm(span=12, adjust=False).mean()
+    ema_26 = df['Close'].ewm(span=26, adjust=False).mean()
+    df['MACD_Line'] = ema_12 - ema_26
+    df['MACD_Signal'] = df['MACD_Line'].ewm(span=9, adjust=False).mean()
+    df['MACD_Histogram'] = df['MACD_Line'] - df['MACD_Signal']
+    return df[['Date', 'Symbol'] + CHART_COLUMNS]
+
+
+def is_png(filename):
+    with open(filename, "rb") as file:
+        return file.read(8) == b"\x89PNG\r\n\x1a\n"
+
+
+def test_renderer_writes_png_and_reuses_figure(tmp_path):
+    renderer = ChartRenderer(width=4, height=3, dpi=50, max_points=100)
+    figure = renderer.figure
+    for k, symbol in enumerate(["AAA", "BBB"]):
+        filename = str(tmp_path / f"{symbol}.png")
+        assert renderer.render(symbol, chart_frame(symbol, seed=k), filename)
+        assert is_png(filename)
+        assert len(renderer.close_line.get_xdata()) == 100
+    assert renderer.figure is figure
+
+
+def test_renderer_skips_symbols_without_prices(tmp_path):
+    renderer = ChartRenderer(width=4, height=3, dpi=50)
+    df = chart_frame("AAA", n_dates=5)
+    df['Close'] = np.nan
+    filename = str(tmp_path / "AAA.png")
+    assert not renderer.render("AAA", df, filename)
+    assert not os.path.exists(filename)
+
+
+def test_render_charts_reads_each_partition_once(tmp_path, monkeypatch):
+    store = PriceStore(str(tmp_path / "store"), partition_size=2)
+    symbols = ["AAA", "BBB", "CCC", "DDD", "EEE"]
+    store.write(pd.concat([chart_frame(symbol, n_dates=60, seed=k) for k, symbol in enumerate(symbols)]))
+
+    reads = []
+    read = PriceStore._read
+
+    def counting_read(self, filename, columns=None):
+        reads.append(os.path.basename(filename))
+        return read(self, filename, columns)
+
+    monkeypatch.setattr(PriceStore, "_read", counting_read)
+    output_dir = str(tmp_path / "charts")
+    rendered = render_charts(symbols + ["ZZZ"], store=store, output_dir=output_dir, processes=1, batch_size=1,
+                             width=4, height=3, dpi=50)
+    assert sorted(os.path.basename(f) for f in rendered) == [f"{symbol}.png" for symbol in symbols]
+    assert all(is_png(f) for f in rendered)
+    assert sorted(reads) == ["part-00000.csv", "part-00001.csv", "part-00002.csv"]
+    assert render_charts(["ZZZ"], store=store, output_dir=output_dir, processes=1) == []
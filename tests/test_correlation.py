@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from correlation import (CorrelationIndex, RollingCorrelation, correlated_with, load_returns, pairwise_covariance,
+                         rolling_matrices)
+
+
+@pytest.fixture
+def returns():
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=(300, 1)) * 0.01
+    values = base + rng.normal(size=(300, 9)) * 0.01 * np.linspace(0.2, 2, 9)
+    values[rng.random(values.shape) < 0.1] = np.nan
+    values[:200, 3] = np.nan
+    values[:, 8] = np.nan
+    values[:290, 7] = np.nan
+    return values
+
+
+def test_pairwise_matches_pandas_cov_and_corr(returns):
+    covariance, correlation, counts = pairwise_covariance(returns, min_periods=20, block_size=4)
+    frame = pd.DataFrame(returns)
+    np.testing.assert_allclose(covariance, frame.cov(min_periods=20).to_numpy(), rtol=1e-8, atol=1e-14,
+                               equal_nan=True)
+    np.testing.assert_allclose(correlation, frame.corr(min_periods=20).to_numpy(), rtol=1e-8, atol=1e-12,
+                               equal_nan=True)
+    present = (~np.isnan(returns)).astype(int)
+    np.testing.assert_array_equal(counts, present.T @ present)
+
+
+def test_rolling_matrices_use_the_last_window(returns):
+    covariance, correlation = rolling_matrices(returns, window=60, end=249)
+    expected = pd.DataFrame(returns[190:250]).corr(min_periods=30).to_numpy()
+    np.testing.assert_allclose(correlation, expected, rtol=1e-8, atol=1e-12, equal_nan=True)
+
+
+def test_incremental_rolling_correlation_matches_batch(returns):
+    rolling = RollingCorrelation(range(returns.shape[1]), window=60)
+    for row in range(len(returns)):
+        rolling.update(returns[row])
+        if row in (59, 150, 299):
+            covariance, correlation = rolling_matrices(returns, window=60, end=row)
+            np.testing.assert_allclose(rolling.covariance(), covariance, rtol=1e-6, atol=1e-12, equal_nan=True)
+            np.testing.assert_allclose(rolling.correlation(), correlation, rtol=1e-6, atol=1e-9, equal_nan=True)
+
+
+def test_correlated_with_matches_a_matrix_row(returns):
+    symbols = [f"S{k}" for k in range(returns.shape[1])]
+    _, correlation = rolling_matrices(returns, window=252)
+    result = correlated_with(returns, symbols, "S0", window=252, k=20)
+    expected = pd.Series(correlation[0], index=symbols).drop("S0").dropna().sort_values(ascending=False)
+    assert result['Symbol'].tolist() == expected.index.tolist()
+    np.testing.assert_allclose(result['Correlation'], expected.to_numpy(), rtol=1e-9)
+
+
+def test_index_top_k_round_trip(returns, tmp_path):
+    symbols = [f"S{k}" for k in range(returns.shape[1])]
+    _, correlation = rolling_matrices(returns, window=252)
+    index = CorrelationIndex.build(correlation, symbols, k=3)
+    top = index.most_correlated("S0", 3)
+    expected = pd.Series(correlation[0], index=symbols).drop("S0").dropna().sort_values(ascending=False).head(3)
+    assert top['Symbol'].tolist() == expected.index.tolist()
+    assert "S8" not in top['Symbol'].tolist()
+
+    filename = str(tmp_path / "top_k.csv")
+    index.save(filename)
+    loaded = CorrelationIndex.load(filename)
+    pd.testing.assert_frame_equal(loaded.most_correlated("S0", 3), top)
+
+
+def test_load_returns_from_a_price_frame():
+    prices = pd.DataFrame({'Date': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03'] * 2),
+                           'Symbol': ['AAA'] * 3 + ['BBB'] * 3, 'Close': [100.0, 110.0, 99.0, 50.0, 50.0, 55.0]})
+    dates, symbols, returns = load_returns(stock_prices_df=prices)
+    assert symbols == ['AAA', 'BBB']
+    np.testing.assert_allclose(returns, [[np.nan, np.nan], [0.1, 0.0], [-0.1, 0.1]], equal_nan=True)
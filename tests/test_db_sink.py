@@ -0,0 +1,81 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import db_sink
+from db_sink import MySQLSink, SQLiteSink, write_output
+
+
+@pytest.fixture
+def sink(tmp_path):
+    sink = SQLiteSink(str(tmp_path / "stocks.db"), pool_size=1)
+    yield sink
+    sink.close()
+
+
+def test_upsert_on_natural_key(sink):
+    first = pd.DataFrame({'Date': pd.to_datetime(['2024-01-01', '2024-01-02']), 'Symbol': ['AAA', 'AAA'],
+                          'Close': [1.0, 2.0]})
+    second = pd.DataFrame({'Date': pd.to_datetime(['2024-01-02', '2024-01-03', '2024-01-03', None]),
+                           'Symbol': ['AAA', 'AAA', 'AAA', 'AAA'], 'Close': [20.0, 3.0, 30.0, 4.0],
+                           'Volume': [5, 6, 7, 8]})
+    assert sink.write('stock_prices', first) == 2
+    # The in-batch repeat keeps its last row and the row without a Date is dropped
+    assert sink.write('stock_prices', second) == 2
+    result = sink.read('SELECT "Date", "Close", "Volume" FROM stock_prices ORDER BY "Date"')
+    assert result['Date'].tolist() == ['2024-01-01', '2024-01-02', '2024-01-03']
+    assert result['Close'].tolist() == [1.0, 20.0, 30.0]
+    assert result['Volume'].isna().tolist() == [True, False, False]
+
+
+def test_schema_keys_and_indexes(sink):
+    sink.write('news', pd.DataFrame({'Article_Id': ['a'], 'Published At': ['2024-01-01 10:00:00'],
+                                     'Publisher': ['Reuters'], 'Title': ['t']}))
+    with sqlite3.connect(sink.filename) as connection:
+        ddl = connection.execute("SELECT sql FROM sqlite_master WHERE name = 'news'").fetchone()[0]
+        indexes = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert 'PRIMARY KEY ("Article_Id")' in ddl and ddl.endswith('WITHOUT ROWID')
+    assert {'idx_news_Published_At', 'idx_news_Publisher_Published_At'} <= indexes
+
+
+def test_prepare_formats_datetimes_and_nulls():
+    df = pd.DataFrame({'day': pd.to_datetime(['2024-01-01', None]), 'at': pd.to_datetime(['2024-01-01 09:30', None]),
+                       'value': [np.nan, 1.5]})
+    prepared = db_sink.DatabaseSink.prepare(df)
+    assert prepared.values.tolist() == [['2024-01-01', '2024-01-01 09:30:00', None], [None, None, 1.5]]
+
+
+def test_mysql_statements():
+    sink = MySQLSink.__new__(MySQLSink)
+    assert sink.upsert_sql('t', ['k', 'v'], ['k']) == \
+           "INSERT INTO `t` (`k`, `v`) VALUES (%s, %s) ON DUPLICATE KEY UPDATE `v` = VALUES(`v`)"
+    assert sink.column_type(np.dtype(object), True) == "VARCHAR(255)"
+
+    class Cursor:
+        def __init__(self):
+            self.statements = []
+
+        def execute(self, sql):
+            self.statements.append(sql)
+
+    cursor = Cursor()
+    df = pd.DataFrame({'Publisher': ['x'], 'Published At': pd.to_datetime(['2024-01-01'])})
+    sink.create_index(cursor, 'news', 'idx', ['Publisher', 'Published At'], df)
+    # Only TEXT columns get a prefix length
+    assert cursor.statements == ["CREATE INDEX `idx` ON `news` (`Publisher`(191), `Published At`)"]
+
+
+def test_write_output_follows_the_environment(tmp_path, monkeypatch):
+    monkeypatch.setattr(db_sink, "_sink", None)
+    monkeypatch.delenv("STOCKS_DB", raising=False)
+    df = pd.DataFrame({'Symbol': ['AAA'], 'Date': ['2024-01-01']})
+    assert write_output('latest_stock_prices', df) == 0
+
+    filename = str(tmp_path / "out.db")
+    monkeypatch.setenv("STOCKS_DB", f"sqlite:{filename}")
+    assert write_output('latest_stock_prices', df) == 1
+    db_sink._sink.close()
+    with sqlite3.connect(filename) as connection:
+        assert connection.execute("SELECT Symbol FROM latest_stock_prices").fetchall() == [('AAA',)]
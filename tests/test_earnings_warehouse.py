@@ -0,0 +1,50 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from earnings_warehouse import EarningsWarehouse, earnings_reactions
+
+
+def test_add_deduplicates_and_partitions_by_month(tmp_path):
+    warehouse = EarningsWarehouse(str(tmp_path))
+    warehouse.add([{'symbol': 'aaa', 'earnings_date': '2024-01-30', 'eps': 1.0},
+                   {'symbol': 'BBB', 'earnings_date': '2024-02-01', 'eps': 2.0}])
+    warehouse.add([{'symbol': 'AAA', 'earnings_date': '2024-01-30', 'eps': 1.5}])
+    assert sorted(os.listdir(str(tmp_path))) == ['earnings_2024-01.csv', 'earnings_2024-02.csv', 'index.csv']
+    rows = warehouse.load()
+    assert len(rows) == 2 and rows.set_index('symbol').loc['AAA', 'eps'] == 1.5
+
+    # Tuesday and Thursday of the same week
+    week = warehouse.lookup(week_of='2024-02-02')
+    assert sorted(week['symbol']) == ['AAA', 'BBB'] and (week['week_of'] == '2024-01-29').all()
+    assert warehouse.lookup(symbol='bbb')['earnings_date'].tolist() == ['2024-02-01']
+    assert warehouse.lookup(symbol='ZZZ').empty
+
+
+@pytest.fixture
+def prices():
+    dates = pd.bdate_range('2024-01-01', periods=15)
+    close = 100.0 + np.arange(15)
+    return pd.DataFrame({'Date': dates, 'Symbol': 'AAA', 'Open': close - 0.5, 'Close': close,
+                         'Volume': 1000.0 + np.arange(15) * 100, '50_Day_Volume_MA': 1000.0})
+
+
+def test_reaction_day_after_hours_and_weekends(prices):
+    events = pd.DataFrame({'symbol': ['aaa', 'AAA', 'AAA', 'AAA', 'ZZZ', 'AAA'],
+                           'earnings_date': ['2024-01-09', '2024-01-09', '2024-01-13', '2024-01-12',
+                                             '2024-01-09', '2024-01-19'],
+                           'time': ['time-pre-market', 'time-after-hours', None, 'time-after-hours',
+                                    'time-pre-market', 'time-after-hours']})
+    result = earnings_reactions(events, prices, pre_days=2, post_days=3)
+    assert result['Reaction_Date'].dt.strftime('%Y-%m-%d').fillna('').tolist() == \
+           ['2024-01-09', '2024-01-10', '2024-01-15', '2024-01-15', '', '']
+    # 2024-01-09 is the 7th bar: close 106, previous close 105, close 2 bars before that 103
+    first = result.iloc[0]
+    assert first['Reaction_%'] == pytest.approx((106 / 105 - 1) * 100)
+    assert first['Gap_%'] == pytest.approx((105.5 / 105 - 1) * 100)
+    assert first['Pre_Move_%'] == pytest.approx((105 / 103 - 1) * 100)
+    assert first['Post_Drift_%'] == pytest.approx((109 / 106 - 1) * 100)
+    assert first['Volume_Spike'] == pytest.approx(1.6)
+    assert result.iloc[4][['Reaction_%', 'Volume_Spike']].isna().all()
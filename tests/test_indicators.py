@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import linregress
+
+from indicators import compute_indicator_frame, rolling_regression
+
+
+def reference_frame(data, tickers):
+    # The per-ticker pandas/linregress code getting_the_data used before the indicator engine
+    all_data = []
+    for ticker in tickers:
+        ticker_data = data[ticker].reset_index()
+        ticker_data['Symbol'] = ticker
+        close, low, high, volume = (ticker_data[c] for c in ('Close', 'Low', 'High', 'Volume'))
+        ticker_data['EMA_12'] = close.ewm(span=12, adjust=False).mean()
+        ticker_data['EMA_26'] = close.ewm(span=26, adjust=False).mean()
+        ticker_data['MACD_Line'] = ticker_data['EMA_12'] - ticker_data['EMA_26']
+        ticker_data['MACD_Signal'] = ticker_data['MACD_Line'].ewm(span=9, adjust=False).mean()
+        ticker_data['MACD_Histogram'] = ticker_data['MACD_Line'] - ticker_data['MACD_Signal']
+        for window in (5, 50, 250):
+            ticker_data[f'{window}_Day_MA'] = close.rolling(window=window).mean()
+            ticker_data[f'{window}_Day_Volume_MA'] = volume.rolling(window=window).mean()
+        ticker_data['Daily_Volume_%_Change'] = volume.pct_change() * 100
+        for name, window in (('3_Month', 63), ('1_Month', 21), ('5_Years', 1250), ('52_Week', 252)):
+            ticker_data[f'{name}_Low'] = low.rolling(window=window, min_periods=1).min()
+            ticker_data[f'{name}_High'] = high.rolling(window=window, min_periods=1).max()
+        ticker_data['Hit_52_Week_Low'] = (low == ticker_data['52_Week_Low']).astype(int)
+        ticker_data['Hit_52_Week_High'] = (high == ticker_data['52_Week_High']).astype(int)
+        ticker_data['Percent_Change'] = close.pct_change() * 100
+        slopes, r_squareds, p_values = [], [], []
+        for i in range(len(ticker_data)):
+            if i >= 4:
+                result = linregress(range(5), close.iloc[i - 4:i + 1].values)
+                slopes.append(result.slope)
+                r_squareds.append(result.rvalue ** 2)
+                p_values.append(result.pvalue)
+            else:
+                slopes.append(np.nan)
+                r_squareds.append(np.nan)
+                p_values.append(np.nan)
+        ticker_data['5_Day_Slope'] = slopes
+        ticker_data['5_Day_R_Squared'] = r_squareds
+        ticker_data['5_Day_P_Value'] = p_values
+        all_data.append(ticker_data)
+    return pd.concat(all_data, ignore_index=True)
+
+
+def download_like(n_days=300, tickers=("AAA", "BBB", "CCC"), seed=0):
+    # A yf.download(..., group_by='ticker') shaped frame; BBB lists late, CCC has a flat stretch
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2020-01-01", periods=n_days, name="Date")
+    frames = {}
+    for k, ticker in enumerate(tickers):
+        close = 100 + np.cumsum(rng.normal(size=n_days)).round(2)
+        if ticker == "BBB":
+            close[:40] = np.nan
+        if ticker == "CCC":
+            close[100:110] = close[100]
+        frames[ticker] = pd.DataFrame({
+            'Open': close, 'High': close + rng.random(n_days), 'Low': close - rng.random(n_days),
+            'Close': close, 'Volume': rng.integers(1_000, 10_000, n_days).astype(float),
+        }, index=dates)
+    return pd.concat(frames, axis=1)
+
+
+def test_default_indicators_match_per_ticker_code():
+    data = download_like()
+    tickers = ["AAA", "BBB", "CCC"]
+    result = compute_indicator_frame(data, tickers)
+    expected = reference_frame(data, tickers)
+    for column in expected.columns:
+        if column in ('Date', 'Symbol'):
+            continue
+        actual, wanted = result[column].to_numpy(dtype=float), expected[column].to_numpy(dtype=float)
+        if column in ('5_Day_R_Squared', '5_Day_P_Value'):
+            # Flat windows: 0 and 1 here, NaN from newer linregress releases
+            flat = np.isnan(wanted) & ~np.isnan(actual)
+            assert (actual[flat] == (0.0 if column == '5_Day_R_Squared' else 1.0)).all()
+            actual, wanted = actual[~flat], wanted[~flat]
+        np.testing.assert_allclose(actual, wanted, rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=column)
+    assert result['Symbol'].tolist() == expected['Symbol'].tolist()
+
+
+def test_regression_matches_linregress_including_flat_windows():
+    rng = np.random.default_rng(1)
+    values = (100 + np.cumsum(rng.normal(size=(60, 3)), axis=0)).round(2)
+    values[20:30, 1] = values[20, 1]
+    slope, r_squared, p_value = rolling_regression(values, 5)
+    assert np.isnan(slope[:4]).all() and np.isnan(r_squared[:4]).all()
+    flat = 0
+    for row in range(4, len(values)):
+        for col in range(values.shape[1]):
+            window = values[row - 4:row + 1, col]
+            result = linregress(range(5), window)
+            assert slope[row, col] == pytest.approx(result.slope, abs=1e-12)
+            if np.ptp(window) == 0:
+                # Older linregress reported r 0 for a flat window (newer releases give NaN); keep 0 and 1
+                flat += 1
+                assert r_squared[row, col] == 0.0 and p_value[row, col] == 1.0
+                if not np.isnan(result.rvalue):
+                    assert result.rvalue == 0.0 and result.pvalue == pytest.approx(1.0)
+            else:
+                assert r_squared[row, col] == pytest.approx(result.rvalue ** 2, abs=1e-12)
+                assert p_value[row, col] == pytest.approx(result.pvalue, rel=1e-9, abs=1e-12)
+    assert flat == 6
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from get_news import GetNews
+from news_store import NearDuplicateIndex, NewsStore, article_key, hamming_distance, simhash
+
+
+def article(uid, title, summary="", publisher="Reuters", tickers=("AAA",), published=None, link=None):
+    published = published or datetime(2024, 5, 1, 14, 30)
+    content = {"id": uid, "title": title, "summary": summary, "provider": {"displayName": publisher},
+               "pubDate": published.strftime('%Y-%m-%dT%H:%M:%SZ')}
+    if link:
+        content["clickThroughUrl"] = {"url": link}
+    return {"content": content, "datetime_obj": published, "tickers": list(tickers)}
+
+
+STORY = ("Chipmaker raises full-year revenue guidance after record data center sales, "
+         "shares jump in extended trading as analysts lift price targets")
+
+
+def test_simhash():
+    assert simhash(STORY) == simhash(STORY.upper() + "!")
+    assert simhash("") is None and simhash(" -- ... ") is None
+    assert hamming_distance(simhash(STORY), simhash("A completely unrelated story about rail freight volumes")) > 3
+
+
+def test_near_duplicate_index_finds_fingerprints_within_distance():
+    index = NearDuplicateIndex(max_distance=3)
+    fingerprint = 0x0123456789ABCDEF
+    index.add(fingerprint, "first")
+    assert index.find(fingerprint ^ 0b1011) == "first"
+    assert index.find(fingerprint ^ (1 << 63) ^ (1 << 40) ^ (1 << 20)) == "first"
+    assert index.find(fingerprint ^ 0b1111) is None
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = NewsStore(str(tmp_path / "news.db"))
+    yield store
+    store.close()
+
+
+def test_ingest_merges_repeats_and_near_duplicates(store):
+    stats = store.ingest([
+        article("1", "Chipmaker raises guidance", STORY, tickers=["NVDA"]),
+        article("1", "Chipmaker raises guidance", STORY, tickers=["AMD"]),
+        article("2", "Chipmaker raises guidance!", STORY + ".", publisher="Bloomberg", tickers=["TSM"]),
+        article("3", "Rail freight volumes fall", "Weekly carloads dropped across the network", tickers=["UNP"]),
+    ])
+    assert stats["inserted"] == 2 and stats["duplicates"] == 2
+    result = store.query(tickers=["tsm"])
+    assert len(result) == 1 and result.loc[0, "Tickers"].split(", ") == ["AMD", "NVDA", "TSM"]
+
+
+def test_wordless_articles_are_not_near_duplicates(store):
+    stats = store.ingest([article("a", "", tickers=["TSLA"]), article("b", "", tickers=["F"])])
+    assert stats["inserted"] == 2
+    assert store.query(tickers=["F"])["Tickers"].tolist() == ["F"]
+
+
+def test_query_filters(store):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    store.ingest([
+        article("1", "Chipmaker raises guidance", STORY, tickers=["NVDA"], published=now - timedelta(days=1)),
+        article("2", "Rail freight volumes fall", "Weekly carloads dropped", publisher="Bloomberg",
+                tickers=["UNP"], published=now - timedelta(days=20)),
+        article("3", "Bank beats estimates", "Net interest income rose", tickers=["JPM"],
+                published=now - timedelta(days=2)),
+    ])
+    assert store.query(text="guidance")["Title"].tolist() == ["Chipmaker raises guidance"]
+    assert store.query(text="freight OR bank")["Title"].tolist() == ["Bank beats estimates",
+                                                                      "Rail freight volumes fall"]
+    assert store.query(publisher="bloomberg")["Title"].tolist() == ["Rail freight volumes fall"]
+    assert store.query(days=7)["Title"].tolist() == ["Chipmaker raises guidance", "Bank beats estimates"]
+    assert store.query(tickers=["UNP"], days=7).empty
+
+
+def test_reopened_store_still_detects_duplicates(tmp_path):
+    filename = str(tmp_path / "news.db")
+    first = NewsStore(filename)
+    first.ingest([article("1", "Chipmaker raises guidance", STORY)])
+    first.close()
+    second = NewsStore(filename)
+    assert second.ingest([article("9", "Chipmaker raises guidance", STORY)])["duplicates"] == 1
+    second.close()
+
+
+def test_article_key_is_a_fixed_length_hash_of_the_uid():
+    key = article_key(article("x" * 500, "Title"))
+    assert len(key) == 40 and key == article_key(article("x" * 500, "Other title"))
+    assert article_key(article(None, "T", link="https://example.com/a")) != article_key(article(None, "T"))
+
+
+def test_get_news_deduplicate_articles():
+    news = GetNews(tickers=["NVDA", "AMD"])
+    news.articles = [
+        article("1", "Chipmaker raises guidance", STORY, tickers=["NVDA"]),
+        article("2", "Chipmaker raises guidance!", STORY + ".", tickers=["AMD"]),
+        article("3", "", tickers=["TSLA"]),
+        article("4", "", tickers=["F"]),
+        article("3", "", tickers=["GM"]),
+    ]
+    news.deduplicate_articles()
+    assert [a["tickers"] for a in news.articles] == [["NVDA", "AMD"], ["TSLA", "GM"], ["F"]]
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from portfolio import Portfolio, aggregate_lots, chained_returns, clean_lots, max_drawdown, returns_index
+
+
+@pytest.fixture
+def lots():
+    return pd.DataFrame({'ticker': [' aaa', 'AAA', 'BBB', 'CCC', 'DDD'],
+                         'price': [10.0, 20.0, 50.0, 'n/a', 5.0],
+                         'quantity': [1, 3, 2, 1, 10],
+                         'desired_selling_price': [30.0, 25.0, np.nan, 1.0, 100.0]})
+
+
+@pytest.fixture
+def prices():
+    dates = pd.bdate_range('2024-01-01', periods=4)
+    rows = [('AAA', [20.0, 22.0, 26.0, 27.0]), ('BBB', [np.nan, np.nan, 50.0, 55.0])]
+    return pd.DataFrame([{'Date': date, 'Symbol': symbol, 'Close': close}
+                         for symbol, closes in rows for date, close in zip(dates, closes)])
+
+
+def test_clean_and_aggregate_lots(lots):
+    cleaned = clean_lots(lots)
+    assert cleaned['ticker'].tolist() == ['AAA', 'AAA', 'BBB', 'DDD']
+    positions = aggregate_lots(cleaned).set_index('ticker')
+    assert positions.loc['AAA', ['Lots', 'Quantity', 'Cost_Basis', 'Average_Cost', 'Target_Price']].tolist() == \
+           [2, 4, 70.0, 17.5, 25.0]
+    assert np.isnan(positions.loc['BBB', 'Target_Price'])
+
+
+def test_mark_to_market_and_history(lots, prices):
+    portfolio = Portfolio(lots).load_prices(prices)
+    report = portfolio.mark_to_market().set_index('ticker')
+    assert report.loc['AAA', 'Profit_Loss'] == pytest.approx(4 * 27 - 70)
+    assert report.loc['BBB', 'Return_%'] == pytest.approx(10.0)
+    assert np.isnan(report.loc['DDD', 'Price'])
+    live = portfolio.mark_to_market({'AAA': 30.0}).set_index('ticker')
+    assert live.loc['AAA', 'Market_Value'] == 120.0 and np.isnan(live.loc['BBB', 'Price'])
+
+    curve, per_position = portfolio.history()
+    # BBB only counts towards value and cost once it has a price
+    assert curve['Market_Value'].tolist() == [80.0, 88.0, 204.0, 218.0]
+    assert curve['Cost_Basis'].tolist() == [70.0, 70.0, 170.0, 170.0]
+    assert per_position['BBB'].isna().tolist() == [True, True, False, False]
+
+
+def test_late_listing_is_not_a_return(lots, prices):
+    portfolio = Portfolio(lots).load_prices(prices)
+    quantity = portfolio.positions['Quantity'].to_numpy(dtype=float)
+    returns = chained_returns(portfolio.close, quantity)
+    # Day 3: only AAA was priced on day 2, so BBB's first price is not a gain
+    np.testing.assert_allclose(returns, [0.1, 16 / 88, (4 * 1 + 2 * 5) / 204])
+    np.testing.assert_allclose(returns_index(returns), np.cumprod([1.0, 1.1, 104 / 88, 218 / 204]))
+
+
+def test_target_alerts(lots, prices):
+    alerts = Portfolio(lots).load_prices(prices).target_alerts()
+    assert alerts['ticker'].tolist() == ['AAA']
+    alert = alerts.iloc[0]
+    assert alert['desired_selling_price'] == 25.0 and alert['First_Reached'] == pd.Timestamp('2024-01-03')
+    assert alert['Profit_Loss_At_Target'] == pytest.approx((25 - 20) * 3)
+
+
+def test_risk_metrics_and_drawdown(lots, prices):
+    drawdown, worst = max_drawdown(np.array([[1.0], [2.0], [1.5], [3.0]]))
+    np.testing.assert_allclose(drawdown[:, 0], [0, 0, -25, 0])
+    assert worst[0] == -25
+    metrics = Portfolio(lots).load_prices(prices).risk_metrics().set_index('ticker')
+    assert metrics.index.tolist() == ['AAA', 'BBB', 'DDD', 'PORTFOLIO']
+    assert metrics.loc['AAA', 'Max_Drawdown_%'] == pytest.approx(0.0)
+    assert metrics.loc['AAA', 'Volatility_%'] == pytest.approx(np.std([0.1, 4 / 22, 1 / 26], ddof=1) * np.sqrt(252) * 100)
+    assert np.isnan(metrics.loc['DDD', 'Max_Drawdown_%'])
+    assert metrics.loc['PORTFOLIO', 'Current_Drawdown_%'] == pytest.approx(0.0)
+
+
+def test_no_prices_raises(lots, prices):
+    with pytest.raises(ValueError):
+        Portfolio(lots).load_prices(prices[prices['Symbol'] == 'ZZZ'])
@@ -0,0 +1,53 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from price_store import PriceStore, frame_to_panels
+
+
+def history(symbols, n_dates=5, start="2024-01-01", offset=0.0):
+    dates = pd.bdate_range(start, periods=n_dates)
+    rows = [{'Date': date, 'Symbol': symbol, 'Close': 100.0 + k + i + offset}
+            for k, symbol in enumerate(symbols) for i, date in enumerate(dates)]
+    return pd.DataFrame(rows)
+
+
+def test_round_trip_and_partitions(tmp_path):
+    store = PriceStore(str(tmp_path), partition_size=2)
+    df = history(["AAA", "BBB", "CCC"])
+    store.write(df)
+    assert store.manifest() == {"AAA": "part-00000.csv", "BBB": "part-00000.csv", "CCC": "part-00001.csv"}
+    loaded = store.load(symbols=["CCC", "AAA"], columns=["Close"])
+    assert sorted(loaded['Symbol'].unique()) == ["AAA", "CCC"]
+    pd.testing.assert_frame_equal(store.load().sort_values(['Symbol', 'Date']).reset_index(drop=True),
+                                  df.sort_values(['Symbol', 'Date']).reset_index(drop=True), check_dtype=False)
+
+
+def test_write_only_rewrites_touched_partitions(tmp_path):
+    store = PriceStore(str(tmp_path), partition_size=2)
+    store.write(history(["AAA", "BBB", "CCC"]))
+    untouched = os.path.join(str(tmp_path), "part-00000.csv")
+    os.utime(untouched, ns=(0, 0))
+
+    store.write(history(["CCC", "DDD", "EEE"], n_dates=3, start="2024-02-01", offset=50.0))
+    assert os.stat(untouched).st_mtime_ns == 0
+    with open(store.manifest_file, encoding="utf-8") as file:
+        assert json.load(file) == {"AAA": "part-00000.csv", "BBB": "part-00000.csv", "CCC": "part-00001.csv",
+                                   "DDD": "part-00001.csv", "EEE": "part-00002.csv"}
+    df = store.load()
+    assert sorted(df['Symbol'].unique()) == ["AAA", "BBB", "CCC", "DDD", "EEE"]
+    ccc = df[df['Symbol'] == "CCC"]
+    # Replaced, not appended to
+    assert len(ccc) == 3 and ccc['Date'].min() == pd.Timestamp("2024-02-01") and (ccc['Close'] >= 150).all()
+    assert len(df[df['Symbol'] == "AAA"]) == 5
+
+
+def test_frame_to_panels_aligns_dates_and_symbols():
+    df = pd.concat([history(["AAA"], n_dates=3), history(["BBB"], n_dates=2, start="2024-01-02")])
+    dates, symbols, panels = frame_to_panels(df, ['Close', 'Missing'], symbols=["BBB", "AAA", "ZZZ"])
+    assert len(dates) == 3 and symbols == ["BBB", "AAA", "ZZZ"]
+    np.testing.assert_array_equal(panels['Close'], [[np.nan, 100, np.nan], [100, 101, np.nan],
+                                                    [101, 102, np.nan]])
+    assert np.isnan(panels['Missing']).all()
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from profiling import Profiler
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    monkeypatch.delenv("STOCKS_PROFILE", raising=False)
+    return Profiler()
+
+
+def test_disabled_profiler_records_nothing(profiler):
+    with profiler.span("work"):
+        pass
+    profiler.count("rows", 5)
+    assert profiler.spans == {} and profiler.counters == {}
+
+
+def test_spans_counters_and_decorator(profiler):
+    profiler.enable()
+
+    @profiler.timed("decorated")
+    def work(x):
+        return x * 2
+
+    assert work(2) == 4 and work(3) == 6
+    with profiler.span("block"):
+        pass
+    profiler.count("rows", 5)
+    profiler.count("rows", 2)
+    assert profiler.spans["decorated"][0] == 2 and profiler.spans["block"][0] == 1
+    assert profiler.counters == {"rows": 7}
+    summary = profiler.summary()
+    assert set(summary["Stage"]) == {"decorated", "block"}
+    assert (summary["Min_ms"] <= summary["Max_ms"]).all()
+
+
+def test_environment_variable_turns_tracing_on(monkeypatch):
+    monkeypatch.setenv("STOCKS_PROFILE", "trace")
+    profiler = Profiler()
+    assert profiler.enabled and profiler.trace
+
+
+def test_exports(profiler, tmp_path):
+    profiler.enable(trace=True)
+    with profiler.span("block"):
+        pass
+    profiler.count("rows", 3)
+    summary_file, trace_file = tmp_path / "summary.json", tmp_path / "trace.json"
+    profiler.export_json(str(summary_file))
+    profiler.export_chrome_trace(str(trace_file))
+    summary = json.loads(summary_file.read_text())
+    assert summary["counters"] == {"rows": 3} and summary["spans"][0]["Stage"] == "block"
+    trace = json.loads(trace_file.read_text())
+    assert [event["ph"] for event in trace["traceEvents"]] == ["X", "C"]
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from rolling_extremes import RollingExtremesTracker, bars_since, rolling_extreme
+
+
+def brute_force(values, window, kind):
+    # Extreme of the last `window` rows and the latest row holding it, one window at a time
+    n_rows, n_cols = values.shape
+    extreme = np.full(values.shape, np.nan)
+    index = np.full(values.shape, -1)
+    for row in range(n_rows):
+        for col in range(n_cols):
+            start = max(0, row - window + 1)
+            block = values[start:row + 1, col]
+            if np.isnan(block).all():
+                continue
+            best = np.nanmin(block) if kind == 'min' else np.nanmax(block)
+            extreme[row, col] = best
+            index[row, col] = start + np.flatnonzero(block == best)[-1]
+    return extreme, index
+
+
+@pytest.fixture
+def panel():
+    rng = np.random.default_rng(0)
+    # Rounded values give plenty of ties; leading NaNs mimic late listings
+    values = rng.normal(size=(130, 6)).round(1)
+    values[rng.random(values.shape) < 0.15] = np.nan
+    values[:40, 2] = np.nan
+    values[:, 5] = np.nan
+    return values
+
+
+@pytest.mark.parametrize("kind", ["min", "max"])
+@pytest.mark.parametrize("window", [1, 2, 7, 21, 63, 200])
+def test_matches_brute_force_and_pandas(panel, window, kind):
+    extreme, index = rolling_extreme(panel, window, kind)
+    expected_extreme, expected_index = brute_force(panel, window, kind)
+    np.testing.assert_array_equal(extreme, expected_extreme)
+    np.testing.assert_array_equal(index, expected_index)
+    rolling = pd.DataFrame(panel).rolling(window, min_periods=1)
+    np.testing.assert_array_equal(extreme, (rolling.min() if kind == 'min' else rolling.max()).to_numpy())
+
+
+def test_bars_since():
+    index = np.array([[0, -1], [0, 1], [2, 1]])
+    np.testing.assert_array_equal(bars_since(index), [[0, np.nan], [1, 0], [0, 1]])
+
+
+def test_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        rolling_extreme(np.zeros((3, 1)), 2, 'median')
+    with pytest.raises(ValueError):
+        RollingExtremesTracker(["A"], [2], 'median')
+
+
+@pytest.mark.parametrize("kind", ["min", "max"])
+def test_tracker_matches_batch_scan(panel, kind):
+    windows = [5, 21, 63]
+    tracker = RollingExtremesTracker(range(panel.shape[1]), windows, kind)
+    for row in range(len(panel)):
+        current = tracker.update(panel[row])
+        for window in windows:
+            extreme, index = rolling_extreme(panel[:row + 1], window, kind)
+            np.testing.assert_array_equal(current[window][0], extreme[-1])
+            np.testing.assert_array_equal(current[window][1], index[-1])
+
+    seeded = RollingExtremesTracker.from_history(range(panel.shape[1]), windows, panel, kind).current()
+    for window in windows:
+        np.testing.assert_array_equal(seeded[window][0], rolling_extreme(panel, window, kind)[0][-1])
+
+
+def test_tracker_symbols_advance_independently():
+    tracker = RollingExtremesTracker(["A", "B"], [2], 'max')
+    for value in (5.0, 1.0, 2.0):
+        tracker.push(0, value)
+    tracker.push(1, 7.0)
+    extremes, positions = tracker.current()[2]
+    np.testing.assert_array_equal(extremes, [2.0, 7.0])
+    np.testing.assert_array_equal(positions, [2, 0])
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from screener import Screener
+
+
+@pytest.fixture
+def screener():
+    snapshot = pd.DataFrame({
+        'Symbol': ['AAA', 'BBB', 'CCC', 'DDD', 'EEE'],
+        'Close': [10.0, 20.0, 30.0, 40.0, 50.0],
+        'Percent_Change': [1.0, -2.0, 3.0, np.nan, 0.5],
+        '5_Day_MA': [9.0, 21.0, 29.0, 41.0, 49.0],
+        '50_Day_MA': [9.0, 21.0, 29.0, 41.0, 49.0],
+        '250_Day_MA': [8.0, 22.0, 28.0, 42.0, 48.0],
+        'Daily_Volume_%_Change': [10.0, -5.0, 0.0, 2.0, 1.0],
+        'Sector': ['stale', 'stale', 'stale', 'stale', 'stale'],
+    })
+    info = pd.DataFrame({'Ticker': ['AAA', 'BBB', 'CCC', 'DDD', 'DDD'],
+                         'Short Name': ['A Inc', 'B Inc', 'C Inc', 'D Inc', 'D dup'],
+                         'Sector': ['Tech', 'Energy', 'Tech', 'Energy', 'Energy']})
+    return Screener(snapshot_df=snapshot, company_info_df=info)
+
+
+def test_company_info_replaces_stale_columns(screener):
+    df = screener.snapshot_df
+    assert df['Sector'].tolist()[:4] == ['Tech', 'Energy', 'Tech', 'Energy'] and pd.isna(df['Sector'][4])
+    assert df['Short Name'][3] == 'D Inc' and len(df) == 5
+
+
+def test_non_identifier_columns_are_quoted(screener):
+    assert screener.quote_expression("50_Day_MA > 250_Day_MA and 5_Day_MA > 1") == \
+           "`50_Day_MA` > `250_Day_MA` and `5_Day_MA` > 1"
+    assert screener.quote_expression("`50_Day_MA` > 0") == "`50_Day_MA` > 0"
+    assert screener.quote_expression("Daily_Volume_%_Change > 1") == "`Daily_Volume_%_Change` > 1"
+
+
+def test_filter_and_rank(screener):
+    result = screener.screen("50_Day_MA > 250_Day_MA and Daily_Volume_%_Change >= 0", sort_by='Percent_Change')
+    assert result['Symbol'].tolist() == ['CCC', 'AAA', 'EEE'] and result['Rank'].tolist() == [1, 2, 3]
+    assert screener.screen(sort_by='Percent_Change', ascending=True, top_k=2)['Symbol'].tolist() == ['BBB', 'EEE']
+
+
+def test_top_k_per_group(screener):
+    result = screener.screen(sort_by='Close', top_k=1, group_by='Sector', columns=['Symbol', 'Close'])
+    assert result.columns.tolist() == ['Sector', 'Symbol', 'Close', 'Rank']
+    assert result['Symbol'].tolist() == ['DDD', 'CCC', 'EEE']
+
+
+def test_non_boolean_expression_raises(screener):
+    with pytest.raises(ValueError):
+        screener.filter("Close * 2")
+
+
+def test_empty_expression_keeps_every_row(screener):
+    assert screener.filter("").all() and screener.filter(None).all()
+
+
+def test_presets(screener):
+    assert screener.run_preset('top_fallers', top_k=1)['Symbol'].tolist() == ['BBB']
+    with pytest.raises(ValueError):
+        screener.run_preset('nope')
+
+
+def test_from_prices_uses_latest_row():
+    prices = pd.DataFrame({'Date': ['2024-01-02', '2024-01-01', '2024-01-01'], 'Symbol': ['AAA', 'AAA', 'BBB'],
+                           'Close': [2.0, 1.0, 5.0]})
+    screener = Screener.from_prices(prices, company_info_df=pd.DataFrame(columns=['Ticker', 'Sector']))
+    assert screener.snapshot_df.set_index('Symbol')['Close'].to_dict() == {'AAA': 2.0, 'BBB': 5.0}
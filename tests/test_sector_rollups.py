@@ -0,0 +1,81 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from price_store import PriceStore
+from sector_rollups import GroupIndex, compute_rollups, save_rollups
+
+
+def prices_and_info(n_dates=40, n_symbols=30, seed=0):
+    rng = np.random.default_rng(seed)
+    symbols = [f"S{k:02d}" for k in range(n_symbols)]
+    dates = pd.bdate_range("2024-01-01", periods=n_dates)
+    df = pd.DataFrame({'Date': np.tile(dates, n_symbols), 'Symbol': np.repeat(symbols, n_dates)})
+    n = len(df)
+    df['Close'] = 100 + rng.normal(size=n)
+    df['50_Day_MA'] = np.where(rng.random(n) < 0.2, np.nan, 100.0)
+    df['Percent_Change'] = np.where(rng.random(n) < 0.15, np.nan, rng.normal(size=n).round(1))
+    df['Hit_52_Week_High'] = (rng.random(n) < 0.1).astype(int)
+    df['Hit_52_Week_Low'] = (rng.random(n) < 0.1).astype(int)
+    df['Volume'] = rng.integers(100, 1000, n).astype(float)
+    df['50_Day_Volume_MA'] = rng.integers(100, 1000, n).astype(float)
+    sectors = ['Energy', 'Tech', 'Utilities']
+    info = pd.DataFrame({'Ticker': symbols[:-2], 'Sector': [sectors[k % 3] for k in range(n_symbols - 2)],
+                         'Industry': [f"I{k % 7}" for k in range(n_symbols - 2)]})
+    return df, info
+
+
+def test_median_matches_nanmedian_per_group():
+    rng = np.random.default_rng(3)
+    panel = rng.normal(size=(25, 12)).round(1)
+    panel[rng.random(panel.shape) < 0.3] = np.nan
+    panel[:, [2, 7]] = np.nan
+    symbols = [f"S{k}" for k in range(12)]
+    info = pd.DataFrame({'Ticker': symbols, 'Sector': list("BACABCCAB") + ['A', 'D', 'D']})
+    index = GroupIndex(symbols, info)
+    result = index.median(panel)
+    for g, label in enumerate(index.labels):
+        columns = [k for k in range(12) if info['Sector'][k] == label]
+        for row in range(len(panel)):
+            values = panel[row, columns]
+            if np.isnan(values).all():
+                assert np.isnan(result[row, g])
+            else:
+                assert result[row, g] == pytest.approx(np.nanmedian(values))
+
+
+def test_rollups_match_pandas_groupby():
+    df, info = prices_and_info()
+    rollups = compute_rollups(df, info)
+    merged = df.merge(info.rename(columns={'Ticker': 'Symbol'}), on='Symbol', how='left')
+    merged[['Sector', 'Industry']] = merged[['Sector', 'Industry']].fillna('Unknown')
+    has_ma = merged['50_Day_MA'].notna()
+    merged['above'] = has_ma & (merged['Close'] > merged['50_Day_MA'])
+    merged['has_ma'] = has_ma
+    for level in ('Sector', 'Industry'):
+        grouped = merged.groupby(['Date', level])
+        expected = pd.DataFrame({
+            'Symbols': grouped['Close'].count(),
+            'Median_Percent_Change': grouped['Percent_Change'].median(),
+            'Breadth_Above_50_Day_MA': grouped['above'].sum() / grouped['has_ma'].sum(),
+            'New_52_Week_Highs': grouped['Hit_52_Week_High'].sum(),
+            'New_52_Week_Lows': grouped['Hit_52_Week_Low'].sum(),
+            'Volume_vs_50_Day_Volume_MA': grouped['Volume'].sum() / grouped['50_Day_Volume_MA'].sum(),
+        }).reset_index()
+        result = rollups[level]
+        assert result[['Date', level]].astype(str).values.tolist() == \
+               expected[['Date', level]].astype(str).values.tolist()
+        for column in expected.columns[2:]:
+            np.testing.assert_allclose(result[column].to_numpy(dtype=float), expected[column].to_numpy(dtype=float),
+                                       equal_nan=True, err_msg=f"{level} {column}")
+
+
+def test_rollups_are_saved_in_the_store_directory(tmp_path, monkeypatch):
+    df, info = prices_and_info(n_dates=5, n_symbols=4)
+    store = PriceStore(str(tmp_path / "store"))
+    monkeypatch.chdir(tmp_path)
+    save_rollups(compute_rollups(df, info), store)
+    assert sorted(os.listdir(store.directory)) == ['industry_rollups.csv', 'sector_rollups.csv']
+    assert not os.path.exists(tmp_path / "sector_rollups.csv")
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from streaming_quotes import ReplayFeed, StreamingSession, _to_epoch, record_feed
+
+
+def random_ticks(n=3000, symbols=("AAA", "BBB"), seed=0):
+    rng = np.random.default_rng(seed)
+    timestamps = 1_700_000_000 + np.cumsum(rng.exponential(3.0, n))
+    return [(t, symbols[rng.integers(len(symbols))], round(100 + rng.normal(), 2), float(rng.integers(1, 100)))
+            for t in timestamps]
+
+
+def test_to_epoch_is_unit_independent():
+    values = ["2024-01-02T14:30:00+00:00", "2024-01-02T09:30:01-05:00", "2024-01-02T14:30:02.5Z"]
+    expected = pd.Timestamp("2024-01-02T14:30:00Z").timestamp()
+    np.testing.assert_allclose(_to_epoch(values), [expected, expected + 1, expected + 2.5])
+
+
+def test_bars_and_indicators_match_pandas():
+    ticks = random_ticks()
+    session = StreamingSession(["AAA", "BBB"], bar_sizes=(60, 300), capacity=1000, ma_window=20)
+    session.run(iter(ticks))
+    session.flush()
+    frame = pd.DataFrame(ticks, columns=["timestamp", "symbol", "price", "size"])
+    for bar_seconds in (60, 300):
+        buffer = session.buffers[bar_seconds]
+        for symbol, group in frame.groupby("symbol"):
+            bucket = (group["timestamp"] // bar_seconds).astype(np.int64)
+            expected = group.groupby(bucket).agg(Open=("price", "first"), High=("price", "max"),
+                                                 Low=("price", "min"), Close=("price", "last"),
+                                                 Volume=("size", "sum"))
+            bars = buffer.bars(symbol)
+            starts = (bars["Datetime"] - pd.Timestamp(0)) // pd.Timedelta(seconds=bar_seconds)
+            assert starts.tolist() == expected.index.tolist()
+            for column in ("Open", "High", "Low", "Close", "Volume"):
+                np.testing.assert_allclose(bars[column], expected[column].to_numpy())
+
+            i = session.position[symbol]
+            close = expected["Close"]
+            assert buffer.moving_average()[i] == pytest.approx(close.tail(20).mean())
+            line, signal, _ = buffer.macd()
+            macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+            assert line[i] == pytest.approx(macd.iloc[-1])
+            assert signal[i] == pytest.approx(macd.ewm(span=9, adjust=False).mean().iloc[-1])
+
+
+def test_ring_buffer_keeps_only_capacity_bars():
+    session = StreamingSession(["AAA"], bar_sizes=(60,), capacity=30, ma_window=5)
+    for minute in range(100):
+        session.on_tick(minute * 60.0, "AAA", float(minute))
+    session.flush()
+    bars = session.buffers[60].bars("AAA")
+    assert len(bars) == 30 and bars["Close"].tolist() == [float(m) for m in range(70, 100)]
+    assert session.buffers[60].moving_average()[0] == pytest.approx(97.0)
+
+
+def test_profit_loss_uses_all_lots():
+    positions = pd.DataFrame({"ticker": ["aaa", "AAA", "BBB"], "price": [10, 20, 5], "quantity": [1, 1, 2]})
+    session = StreamingSession(["AAA", "BBB"], positions=positions)
+    session.on_tick(0.0, "AAA", 25.0)
+    snapshot = session.snapshot()
+    assert snapshot.loc[0, "Quantity"] == 2 and snapshot.loc[0, "Profit_Loss"] == pytest.approx(20.0)
+    assert np.isnan(snapshot.loc[1, "Profit_Loss"])
+
+
+def test_recorded_feed_replays_in_order(tmp_path):
+    ticks = random_ticks(200)
+    filename = str(tmp_path / "ticks.csv")
+    assert list(record_feed(iter(ticks[::-1]), filename)) == ticks[::-1]
+    replayed = list(ReplayFeed(filename))
+    assert [symbol for _, symbol, _, _ in replayed] == [symbol for _, symbol, _, _ in ticks]
+    np.testing.assert_allclose([t for t, _, _, _ in replayed], [t for t, _, _, _ in ticks], atol=1e-5)
+
+
+def test_bar_ranges_follow_closed_bars():
+    ticks = random_ticks()
+    session = StreamingSession(["AAA", "BBB"], bar_sizes=(60,), capacity=1000)
+    session.run(iter(ticks))
+    session.flush()
+    snapshot = session.snapshot().set_index("Symbol")
+    for symbol in ("AAA", "BBB"):
+        bars = session.buffers[60].bars(symbol)
+        for window in (30, 120):
+            assert snapshot.loc[symbol, f"{window}_Bar_Low"] == bars["Low"].tail(window).min()
+            assert snapshot.loc[symbol, f"{window}_Bar_High"] == bars["High"].tail(window).max()
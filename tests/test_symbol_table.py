@@ -0,0 +1,85 @@
+import pytest
+
+from symbol_table import SymbolTable, compose, expression_names
+from tickers import Tickers
+
+
+def make_table():
+    table = SymbolTable()
+    for symbol in ["ZZZ", "AAA", "MSFT", "AAPL", "QQQ"]:
+        table.intern(symbol)
+    return table
+
+
+def test_intern_is_idempotent_and_fills_missing_metadata():
+    table = SymbolTable()
+    first = table.intern(" msft ")
+    assert table.intern("MSFT", cik=789019, exchange="Nasdaq") == first
+    assert table.cik[first] == 789019 and table.exchange[first] == "Nasdaq"
+    table.intern("MSFT", cik=1)
+    assert table.cik[first] == 789019
+    assert table.by_exchange("nasdaq").tolist() == ["MSFT"]
+
+
+def test_set_algebra():
+    table = make_table()
+    a = table.universe(["AAA", "MSFT", "AAPL"])
+    b = table.universe(["msft", "QQQ"])
+    assert (a | b).tolist() == ["AAA", "MSFT", "AAPL", "QQQ"]
+    assert (a & b).tolist() == ["MSFT"]
+    assert (a - b).tolist() == ["AAA", "AAPL"]
+    assert len(a) == 3 and "aapl" in a and "QQQ" not in a and "NEW" not in a
+    with pytest.raises(ValueError):
+        a | make_table().universe(["AAA"])
+
+
+def test_ordered_keeps_first_seen_order_of_members():
+    table = make_table()
+    universe = table.universe(["QQQ", "AAA", "MSFT"])
+    assert universe.ordered(["msft", "ZZZ", "QQQ", "MSFT", "AAA"]) == ["MSFT", "QQQ", "AAA"]
+
+
+def test_compose_left_to_right_with_parentheses_and_unicode_operators():
+    table = make_table()
+    lists = {"x": table.universe(["AAA", "MSFT"]), "y": table.universe(["MSFT", "QQQ"]),
+             "z": table.universe(["QQQ"])}
+    assert compose("x | y - z", lists.__getitem__).tolist() == ["AAA", "MSFT"]
+    assert compose("x | (y - z)", lists.__getitem__).tolist() == ["AAA", "MSFT"]
+    assert compose("x ∪ y ∩ z", lists.__getitem__).tolist() == ["QQQ"]
+    assert compose("x − y", lists.__getitem__).tolist() == ["AAA"]
+    assert expression_names("(x | y) - z") == ["x", "y", "z"]
+
+
+@pytest.mark.parametrize("expression", ["x |", "(x | y", "x y", "| x", "x + y"])
+def test_compose_rejects_malformed_expressions(expression):
+    table = make_table()
+    with pytest.raises(ValueError):
+        compose(expression, lambda name: table.universe([]))
+
+
+@pytest.fixture
+def offline_tickers(monkeypatch):
+    # A Tickers instance with canned lists instead of the SEC/Wikipedia downloads
+    monkeypatch.setattr(Tickers, "stocks_interest", property(lambda self: ["QQQ"]))
+    monkeypatch.setattr(Tickers, "my_stocks", property(lambda self: ["IBIT", "NEW"]))
+    tickers = Tickers.__new__(Tickers)
+    tickers.symbol_table = make_table()
+    tickers.all_us_tickers = list(tickers.symbol_table.symbols)
+    tickers.sp500url, tickers.sp400url, tickers.sp600url = "sp500", "sp400", "sp600"
+    tickers.tickers_cache = {"sp500": ["MSFT", "ZZZ"], "sp400": ["BBB", "MSFT"], "sp600": ["AAA"]}
+    tickers.magnificent_seven = ["AAPL", "MSFT"]
+    tickers.bitcoin = ["COIN", "IBIT"]
+    return tickers
+
+
+def test_composite_lists_keep_definition_order(offline_tickers):
+    assert offline_tickers.get_tickers_list("sp_1500") == ["MSFT", "ZZZ", "BBB", "AAA"]
+    assert offline_tickers.get_tickers_list("big_list") == ["MSFT", "ZZZ", "BBB", "AAA", "AAPL", "COIN", "IBIT",
+                                                           "QQQ", "NEW"]
+    assert offline_tickers.get_tickers_list("big_list - bitcoin") == ["MSFT", "ZZZ", "BBB", "AAA", "AAPL", "QQQ",
+                                                                     "NEW"]
+
+
+def test_unknown_list_name_in_expression_raises(offline_tickers):
+    with pytest.raises(ValueError):
+        offline_tickers.get_tickers_list("sp_1500 | mystocks")
@@ -0,0 +1,67 @@
+import multiprocessing
+import os
+
+import pytest
+
+from watchlist import Watchlist
+
+
+def write(path, text):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        file.write(text)
+
+
+def test_add_and_remove_keep_lot_columns(tmp_path):
+    path = str(tmp_path / "my_stocks.csv")
+    write(path, "ticker,price,quantity,desired_selling_price\nmsft,300,2,400\nAAPL,150,1,\nMSFT,310,1,\n")
+    watchlist = Watchlist(path)
+    assert watchlist.tickers() == ["MSFT", "AAPL"]
+    assert watchlist.add("tsla, aapl,") == ["TSLA"]
+    rows = watchlist.rows()
+    assert [row["ticker"] for row in rows] == ["AAPL", "MSFT", "MSFT", "TSLA"]
+    assert rows[1]["desired_selling_price"] == "400"
+    assert watchlist.remove(["msft", "NOPE"]) == ["MSFT"]
+    with open(path, encoding="utf-8") as file:
+        assert file.read().splitlines() == ["ticker,price,quantity,desired_selling_price", "AAPL,150,1,",
+                                            "TSLA,,,"]
+    watchlist.clear()
+    assert watchlist.tickers() == [] and Watchlist(path).rows() == []
+
+
+def test_picks_up_edits_made_elsewhere(tmp_path):
+    path = str(tmp_path / "stocks_interest.csv")
+    write(path, "ticker\nAAA\n")
+    watchlist = Watchlist(path)
+    assert "AAA" in watchlist
+    write(path, "ticker\nAAA\nBBB\nCCC\n")
+    assert watchlist.tickers() == ["AAA", "BBB", "CCC"]
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permission bits")
+def test_writes_keep_file_mode_and_leave_no_lock_file(tmp_path):
+    path = str(tmp_path / "stocks_interest.csv")
+    write(path, "ticker\nAAA\n")
+    os.chmod(path, 0o644)
+    Watchlist(path).add(["BBB"])
+    assert os.stat(path).st_mode & 0o777 == 0o644
+    assert sorted(os.listdir(tmp_path)) == ["stocks_interest.csv"]
+
+
+def _add_many(path, worker):
+    watchlist = Watchlist(path)
+    for k in range(20):
+        watchlist.add([f"T{worker}X{k}"])
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_concurrent_adds_from_several_processes_are_not_lost(tmp_path):
+    path = str(tmp_path / "stocks_interest.csv")
+    write(path, "ticker\n")
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=_add_many, args=(path, worker)) for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+    assert len(Watchlist(path).tickers()) == 80
@@ -5,10 +5,19 @@ import os
 import requests
 import yfinance as yf
 from datetime import datetime, timedelta
+from profiling import profiler
+from symbol_table import SymbolTable, compose, expression_names
+from watchlist import get_watchlist
 
 
 
 class Tickers:
+    # Lists built from other lists, in the order their members are listed
+    composite_lists = {
+        'sp_1500': ['sp500_tickers', 'sp400_tickers', 'sp600_tickers'],
+        'big_list': ['sp_1500', 'magnificent_seven', 'bitcoin', 'stocks_interest', 'my_stocks'],
+    }
+
     def __init__(self):
         self.sp500url = 'https://en.wikipedia.org/wiki/List_of_S%26P_500_companies'
         self.sp400url = 'https://en.wikipedia.org/wiki/List_of_S%26P_400_companies'
@@ -18,6 +27,8 @@ class Tickers:
         self.bitcoin = ["GBTC", "IBIT", "FBTC", "ARKB", "BITB", "BTCO", "HODL", "BRRR", "MARA", "COIN", "MSTR"]
 
         self.tickers_cache = {}
+        # Every symbol seen (SEC universe first) gets a small integer id; lists become bitsets over the ids
+        self.symbol_table = SymbolTable()
 
         # Get the directory where the currently running script is located
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -28,10 +39,6 @@ class Tickers:
         self.stocks_interest_file = 'real_stocks_interest.csv' if os.path.isfile(csv_file_path2) else 'stocks_interest.csv'
         self.my_stocks_file = 'real_my_stocks.csv' if os.path.isfile(csv_file_path1) else 'my_stocks.csv'
 
-        # Load from CSVs
-        self.stocks_interest = self.load_tickers_from_csv(self.stocks_interest_file)
-        self.my_stocks = self.load_tickers_from_csv(self.my_stocks_file)
-
         self.headers = {
             "User-Agent": (
                 f"Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -49,40 +56,72 @@ class Tickers:
 
     def fetch_tickers(self, url, force_refresh=False):
         if force_refresh or url not in self.tickers_cache:
-            data = pd.read_html(url)[0]['Symbol'].tolist()
+            with profiler.span("read_html index constituents"):
+                data = pd.read_html(url)[0]['Symbol'].tolist()
             self.tickers_cache[url] = [ticker.replace(".", "-") for ticker in data]
         return self.tickers_cache[url]
 
+    # The CSV lists are read through the shared watchlist cache, so edits made from the menu (or by
+    # another process) show up without re-parsing the files on every access
+    @property
+    def stocks_interest(self):
+        return self.load_tickers_from_csv(self.stocks_interest_file)
+
+    @property
+    def my_stocks(self):
+        return self.load_tickers_from_csv(self.my_stocks_file)
+
     def load_tickers_from_csv(self, filename):
-        try:
-            df = pd.read_csv(filename)
-            if "ticker" in df.columns:
-                return df["ticker"].dropna().astype(str).str.strip().tolist()
-            else:
-                return []
-        except FileNotFoundError:
-            return []
+        return get_watchlist(filename).tickers()
 
     def get_sec_tickers(self):
         """
-        Downloads a list of tickers from the SEC's public company dataset.
+        Downloads a list of tickers from the SEC's public company dataset and interns them, with their
+        CIK, company name and exchange, into the symbol table.
 
         Returns:
             list of str: Ticker symbols.
         """
-        url = "https://www.sec.gov/files/company_tickers.json"
+        url = "https://www.sec.gov/files/company_tickers_exchange.json"
 
         try:
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
-            tickers = [entry['ticker'] for entry in data.values()]
+            with profiler.span("requests.get SEC tickers"):
+                response = requests.get(url, headers=self.headers)
+                response.raise_for_status()
+                data = response.json()
+            fields = data['fields']
+            cik_at, name_at, ticker_at, exchange_at = (fields.index(f) for f in ('cik', 'name', 'ticker', 'exchange'))
+            tickers = []
+            for row in data['data']:
+                ticker = str(row[ticker_at]).strip().upper()
+                self.symbol_table.intern(ticker, cik=row[cik_at], name=row[name_at], exchange=row[exchange_at])
+                tickers.append(ticker)
             return tickers
 
         except Exception as e:
             print(f"Error fetching tickers: {e}")
             return []
 
+    def get_universe(self, type: str):
+        """
+        Returns a list (or a set expression over lists, e.g. "sp_1500 | my_stocks - bitcoin") as a Universe
+        bitset over the symbol table ids.
+        """
+        if type in self.composite_lists:
+            universe = None
+            for name in self.composite_lists[type]:
+                universe = self.get_universe(name) if universe is None else universe | self.get_universe(name)
+            return universe
+        elif type == 'all_us_tickers':
+            return self.symbol_table.universe(self.all_us_tickers)
+        elif type in ('sp500_tickers', 'sp400_tickers', 'sp600_tickers', 'magnificent_seven', 'bitcoin',
+                      'stocks_interest', 'my_stocks'):
+            return self.symbol_table.universe(self.get_tickers_list(type))
+        elif any(operator in type for operator in '|&-()∪∩−'):
+            return compose(type, self.get_universe)
+        else:
+            raise ValueError(f"Invalid list name: '{type}'. {self}")
+
     def get_tickers_list(self, type: str):
         if type == 'sp500_tickers':
             return self.fetch_tickers(self.sp500url)
@@ -90,19 +129,21 @@ class Tickers:
             return self.fetch_tickers(self.sp400url)
         elif type == 'sp600_tickers':
             return self.fetch_tickers(self.sp600url)
-        elif type == 'sp_1500':
-            return self.get_tickers_list('sp500_tickers') + \
-                   self.get_tickers_list('sp400_tickers') + \
-                   self.get_tickers_list('sp600_tickers')
-        elif type == 'big_list':
-            return list(set(
-                self.get_tickers_list('sp_1500') +
-                self.magnificent_seven +
-                self.bitcoin +
-                self.stocks_interest +
-                self.my_stocks
-            ))
+        elif type in self.composite_lists or any(operator in type for operator in '|&-()∪∩−'):
+            # Composite lists are deduplicated and keep the order of the lists they are built from
+            # (e.g. sp_1500 is S&P 500, then 400, then 600), not the SEC order of the symbol ids
+            return self.get_universe(type).ordered(self.definition_order(type))
         elif type == 'all_us_tickers':
             return self.all_us_tickers
         else:
-            return getattr(self, type, [])
\ No newline at end of file
+            return getattr(self, type, [])
+
+    def definition_order(self, type: str):
+        # Members of every list a composite list or expression names, left to right (may repeat)
+        if type in self.composite_lists:
+            names = self.composite_lists[type]
+        elif any(operator in type for operator in '|&-()∪∩−'):
+            names = expression_names(type)
+        else:
+            return self.get_tickers_list(type)
+        return [ticker for name in names for ticker in self.definition_order(name)]
\ No newline at end of file
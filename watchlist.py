@@ -0,0 +1,233 @@
+import csv
+import hashlib
+import os
+import stat
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from profiling import profiler
+
+
+class FileLock:
+    """
+    Exclusive inter-process lock for a file (flock on POSIX, msvcrt.locking on Windows), also
+    serializing threads of this process. The lock file lives in the temp directory, named after the
+    file's absolute path, so locking never litters the directory of the file itself.
+    """
+
+    def __init__(self, filename, timeout=10.0):
+        digest = hashlib.sha1(os.path.abspath(filename).encode("utf-8")).hexdigest()[:16]
+        self.lock_file = os.path.join(tempfile.gettempdir(), f"watchlist-{digest}.lock")
+        self.timeout = timeout
+        self._thread_lock = threading.RLock()
+        self._file = None
+        self._depth = 0
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        self._depth += 1
+        if self._depth > 1:
+            return self
+        self._file = open(self.lock_file, "a+")
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    self._file.seek(0)
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+                return self
+            except OSError:
+                if time.monotonic() > deadline:
+                    self._file.close()
+                    self._file = None
+                    self._depth -= 1
+                    self._thread_lock.release()
+                    raise TimeoutError(f"Could not lock '{self.lock_file}' within {self.timeout} seconds")
+                time.sleep(0.05)
+
+    def __exit__(self, *exc):
+        self._depth -= 1
+        if self._depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+
+
+def _file_mode(filename):
+    try:
+        return stat.S_IMODE(os.stat(filename).st_mode)
+    except FileNotFoundError:
+        # What open() would have created: 0666 minus the umask (which can only be read by setting it)
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+class Watchlist:
+    """
+    A ticker list CSV (stocks_interest.csv, my_stocks.csv) with a cached in-memory copy.
+
+    Rows are kept whole, so extra columns (price, quantity, desired_selling_price of my_stocks.csv lots)
+    survive adds and removes. The cache is invalidated when the file's inode/mtime/size change, so other
+    processes' edits are picked up without re-parsing on every read. Changes are made under a file lock
+    and written to a temporary file that replaces the original atomically.
+    """
+
+    def __init__(self, filename, columns=("ticker",)):
+        self.filename = filename
+        self.default_columns = list(columns)
+        self.lock = FileLock(filename)
+        self._loaded = False
+        self._signature = None
+        self._columns = list(columns)
+        self._rows = []
+        self._tickers = {}
+
+    def _file_signature(self):
+        try:
+            stat = os.stat(self.filename)
+            # A replace-rename gives the file a new inode, so atomic writes always change the signature
+            return stat.st_ino, stat.st_mtime_ns, stat.st_size
+        except FileNotFoundError:
+            return None
+
+    def _load(self):
+        signature = self._file_signature()
+        if self._loaded and signature == self._signature:
+            return
+        with profiler.span("watchlist read"):
+            columns, rows = list(self.default_columns), []
+            if signature is not None:
+                with open(self.filename, newline="", encoding="utf-8") as file:
+                    reader = csv.DictReader(file)
+                    columns = reader.fieldnames or columns
+                    for row in reader:
+                        ticker = (row.get("ticker") or "").strip().upper()
+                        if ticker:
+                            row["ticker"] = ticker
+                            rows.append(row)
+        self._set(columns, rows, signature)
+
+    def _set(self, columns, rows, signature):
+        self._columns = columns
+        self._rows = rows
+        # Ordered unique tickers; dict keeps file order
+        self._tickers = dict.fromkeys(row["ticker"] for row in rows)
+        self._signature = signature
+        self._loaded = True
+
+    def _write(self, columns, rows):
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        with profiler.span("watchlist write"):
+            file_descriptor, temporary = tempfile.mkstemp(prefix=".watchlist-", suffix=".csv", dir=directory)
+            try:
+                with os.fdopen(file_descriptor, "w", newline="", encoding="utf-8") as file:
+                    writer = csv.DictWriter(file, fieldnames=columns, extrasaction="ignore")
+                    writer.writeheader()
+                    writer.writerows(rows)
+                    file.flush()
+                    os.fsync(file.fileno())
+                # mkstemp creates the file as 0600; keep the permissions the list had (or would get)
+                os.chmod(temporary, _file_mode(self.filename))
+                os.replace(temporary, self.filename)
+            except BaseException:
+                if os.path.exists(temporary):
+                    os.remove(temporary)
+                raise
+        self._set(columns, rows, self._file_signature())
+
+    def tickers(self):
+        self._load()
+        return list(self._tickers)
+
+    def rows(self):
+        self._load()
+        return [dict(row) for row in self._rows]
+
+    def __contains__(self, ticker):
+        self._load()
+        return ticker.strip().upper() in self._tickers
+
+    def __len__(self):
+        self._load()
+        return len(self._tickers)
+
+    def __iter__(self):
+        return iter(self.tickers())
+
+    @staticmethod
+    def _clean(tickers):
+        if isinstance(tickers, str):
+            tickers = tickers.split(",")
+        return list(dict.fromkeys(t.strip().upper() for t in tickers if t and t.strip()))
+
+    def add(self, tickers):
+        """
+        Adds tickers (a list or a comma-separated string) that are not on the list yet and keeps the file
+        sorted by ticker.
+
+        Returns:
+            list: The tickers that were added.
+        """
+        new = self._clean(tickers)
+        with self.lock:
+            self._load()
+            new = [t for t in new if t not in self._tickers]
+            if new:
+                rows = self._rows + [{"ticker": t} for t in new]
+                self._write(self._columns, sorted(rows, key=lambda row: row["ticker"]))
+        return new
+
+    def remove(self, tickers):
+        """
+        Removes every row (all lots) of the given tickers.
+
+        Returns:
+            list: The tickers that were removed.
+        """
+        removing = set(self._clean(tickers))
+        with self.lock:
+            self._load()
+            removed = [t for t in self._tickers if t in removing]
+            if removed:
+                self._write(self._columns, [row for row in self._rows if row["ticker"] not in removing])
+        return removed
+
+    def clear(self):
+        # Keeps the header so the file still has all its columns
+        with self.lock:
+            self._load()
+            self._write(self._columns, [])
+
+
+_watchlists = {}
+_watchlists_lock = threading.Lock()
+
+
+def get_watchlist(filename):
+    # One shared Watchlist (and cache) per file in this process
+    key = os.path.abspath(filename)
+    with _watchlists_lock:
+        if key not in _watchlists:
+            _watchlists[key] = Watchlist(filename)
+        return _watchlists[key]
+
+
+# Example usage
+if __name__ == "__main__":
+    watchlist = get_watchlist("stocks_interest.csv")
+    print(watchlist.tickers())